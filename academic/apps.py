@@ -4,3 +4,25 @@ from django.apps import AppConfig
 class AcademicConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'academic'
+
+    def ready(self):
+        from administration.cache import reference_cache, track_model_versions
+        from .models import (
+            ClassLevel,
+            Stream,
+            GradeLevel,
+            Department,
+            Subject,
+            ClassRoom,
+            ClassYear,
+            ReasonLeft,
+            Teacher,
+        )
+
+        reference_cache.register(ClassLevel)
+        reference_cache.register(Stream)
+        reference_cache.register(GradeLevel)
+        reference_cache.register(Department)
+        reference_cache.register(Subject)
+        # Catalogue tables served with ETags (see api.http_cache)
+        track_model_versions(ClassRoom, ClassYear, ReasonLeft, Teacher)
@@ -0,0 +1,265 @@
+"""
+Boarding intake: assign beds to many students at once.
+
+``plan_allocation`` reads the intake, its sibling links, the dormitories and
+who already lives where in a fixed handful of queries, then assigns beds in
+memory:
+
+* a student only goes to a dormitory of their gender, or to one open to
+  every gender (``Dormitory.gender`` empty), preferring the former;
+* siblings of the same gender taking part in the intake are placed in the
+  same dormitory when one has room for all of them, and split otherwise;
+* with ``group_by_class_level`` students of a class level fill the
+  dormitories that already house that level before opening another one.
+
+Free beds are counted from current allocations rather than read from
+``Dormitory.occupied_beds``, so a bed is free again once its allocation's
+``date_till`` has passed.
+
+``AllocationPlan.apply()`` then bulk-inserts the ``DormitoryAllocation``
+rows and refreshes ``occupied_beds`` once per dormitory, in one transaction,
+instead of locking and saving the dormitory for every student.
+"""
+
+from collections import defaultdict
+
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.db.models import Count
+
+from .models import Dormitory, DormitoryAllocation, Student
+
+
+def current_allocations():
+    """Allocations that still hold a bed."""
+    return DormitoryAllocation.current()
+
+
+def beds_in_use(dormitory_ids):
+    """Beds held by current allocations, per dormitory id."""
+    return dict(
+        current_allocations()
+        .filter(dormitory_id__in=dormitory_ids)
+        .values_list("dormitory_id")
+        .annotate(beds=Count("id"))
+        .order_by()
+    )
+
+
+def sibling_groups(students):
+    """
+    Split ``students`` (dicts with ``id`` and ``gender``) into groups of
+    siblings of the same gender, using one query for the sibling links.
+    """
+    by_id = {student["id"]: student for student in students}
+    parent = {student_id: student_id for student_id in by_id}
+
+    def root(student_id):
+        while parent[student_id] != student_id:
+            parent[student_id] = parent[parent[student_id]]
+            student_id = parent[student_id]
+        return student_id
+
+    links = Student.siblings.through.objects.filter(
+        from_student_id__in=by_id, to_student_id__in=by_id
+    ).values_list("from_student_id", "to_student_id")
+    for first, second in links:
+        if by_id[first]["gender"] == by_id[second]["gender"]:
+            parent[root(first)] = root(second)
+
+    groups = defaultdict(list)
+    for student_id in by_id:
+        groups[root(student_id)].append(by_id[student_id])
+    return list(groups.values())
+
+
+class AllocationPlan:
+    """What ``plan_allocation`` decided; ``apply()`` writes it."""
+
+    def __init__(self, dormitories):
+        self.dormitories = {dormitory["id"]: dormitory for dormitory in dormitories}
+        self.assignments = []
+        self.unallocated = []
+        self.split_siblings = []
+
+    @property
+    def changed(self):
+        return bool(self.assignments)
+
+    def beds_taken(self):
+        taken = defaultdict(int)
+        for _, dormitory_id in self.assignments:
+            taken[dormitory_id] += 1
+        return taken
+
+    def summary(self):
+        taken = self.beds_taken()
+        return {
+            "allocated": len(self.assignments),
+            "unallocated": len(self.unallocated),
+            "dormitories": [
+                {
+                    "id": dormitory["id"],
+                    "name": dormitory["name"],
+                    "gender": dormitory["gender"],
+                    "allocated": taken[dormitory["id"]],
+                    "available_beds": dormitory["free"],
+                }
+                for dormitory in self.dormitories.values()
+            ],
+            "assignments": [
+                {"student": student["id"], "dormitory": dormitory_id}
+                for student, dormitory_id in self.assignments
+            ],
+            "unallocated_students": [
+                {"student": student["id"], "reason": reason}
+                for student, reason in self.unallocated
+            ],
+            "split_siblings": [
+                [student["id"] for student in group] for group in self.split_siblings
+            ],
+        }
+
+    @transaction.atomic
+    def apply(self):
+        """
+        Save the plan. The students and dormitories are locked first; if a
+        student was given a bed or another intake took beds since the plan
+        was made, nothing is saved.
+        """
+        taken = self.beds_taken()
+        student_ids = [student["id"] for student, _ in self.assignments]
+        # Another intake of the same students waits here until this one commits.
+        list(
+            Student.objects.select_for_update()
+            .filter(id__in=student_ids)
+            .values_list("id")
+        )
+        if current_allocations().filter(student_id__in=student_ids).exists():
+            raise ValidationError(
+                "Some of these students were given a bed since the plan was "
+                "made. Plan the allocation again."
+            )
+        locked = list(Dormitory.objects.select_for_update().filter(id__in=taken))
+        in_use = beds_in_use(taken)
+        for dormitory in locked:
+            free = (dormitory.capacity or 0) - in_use.get(dormitory.pk, 0)
+            if free < taken[dormitory.pk]:
+                raise ValidationError(
+                    f"{dormitory.name} no longer has {taken[dormitory.pk]} free "
+                    "beds. Plan the allocation again."
+                )
+        DormitoryAllocation.objects.bulk_create(
+            [
+                DormitoryAllocation(student_id=student["id"], dormitory_id=dormitory_id)
+                for student, dormitory_id in self.assignments
+            ],
+            batch_size=500,
+        )
+        for dormitory_id, beds in taken.items():
+            Dormitory.objects.filter(pk=dormitory_id).update(
+                occupied_beds=in_use.get(dormitory_id, 0) + beds
+            )
+
+
+def plan_allocation(students, dormitories=None, group_by_class_level=True):
+    """
+    Assign a bed to each of ``students`` (a queryset or ids) in
+    ``dormitories`` (default: all of them). Students who already hold a bed
+    are left where they are.
+    """
+    students = Student.objects.filter(
+        pk__in=students.values("pk") if hasattr(students, "values") else students
+    )
+    intake = list(
+        students.order_by("class_level_id", "admission_number").values(
+            "id", "gender", "class_level_id"
+        )
+    )
+    housed = set(
+        current_allocations()
+        .filter(student__in=students)
+        .values_list("student_id", flat=True)
+    )
+
+    if dormitories is None:
+        dormitories = Dormitory.objects.all()
+    elif not hasattr(dormitories, "values"):
+        dormitories = Dormitory.objects.filter(pk__in=dormitories)
+    rows = list(
+        dormitories.order_by("name", "id").values("id", "name", "gender", "capacity")
+    )
+    in_use = beds_in_use([dormitory["id"] for dormitory in rows])
+    for dormitory in rows:
+        dormitory["free"] = max(
+            0, (dormitory["capacity"] or 0) - in_use.get(dormitory["id"], 0)
+        )
+    plan = AllocationPlan(rows)
+
+    # Class levels already living in each dormitory.
+    levels = defaultdict(set)
+    for dormitory_id, class_level_id in (
+        current_allocations()
+        .filter(dormitory_id__in=plan.dormitories)
+        .values_list("dormitory_id", "student__class_level_id")
+        .distinct()
+    ):
+        levels[dormitory_id].add(class_level_id or 0)
+
+    def choose(gender, class_level_id, beds):
+        best = None
+        for dormitory in rows:
+            if dormitory["free"] < beds:
+                continue
+            if dormitory["gender"] and dormitory["gender"] != gender:
+                continue
+            same_level = class_level_id in levels[dormitory["id"]]
+            key = (
+                # Keep open dormitories for students no other one takes.
+                not (gender and dormitory["gender"] == gender),
+                group_by_class_level and not same_level,
+                # Fill a dormitory the level already uses; else open the
+                # emptiest so the rest of the level can follow.
+                (
+                    dormitory["free"]
+                    if group_by_class_level and same_level
+                    else -dormitory["free"]
+                ),
+            )
+            if best is None or key < best[0]:
+                best = (key, dormitory)
+        return best[1] if best else None
+
+    def place(group, dormitory):
+        for student in group:
+            plan.assignments.append((student, dormitory["id"]))
+            levels[dormitory["id"]].add(student["class_level_id"] or 0)
+        dormitory["free"] -= len(group)
+
+    def level(group):
+        return min(student["class_level_id"] or 0 for student in group)
+
+    plan.unallocated.extend(
+        (student, "already allocated") for student in intake if student["id"] in housed
+    )
+    groups = sibling_groups(
+        [student for student in intake if student["id"] not in housed]
+    )
+    # Larger sibling groups first, while there is the most room to keep them
+    # together; within that, one class level after another.
+    groups.sort(key=lambda group: (-len(group), level(group)))
+    for group in groups:
+        gender = group[0]["gender"]
+        dormitory = choose(gender, level(group), len(group))
+        if dormitory is not None:
+            place(group, dormitory)
+            continue
+        if len(group) > 1:
+            plan.split_siblings.append(group)
+        for student in group:
+            dormitory = choose(gender, level([student]), 1)
+            if dormitory is None:
+                plan.unallocated.append((student, "no free bed"))
+            else:
+                place([student], dormitory)
+    return plan
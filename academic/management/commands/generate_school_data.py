@@ -0,0 +1,573 @@
+import random
+from datetime import date, timedelta
+from decimal import Decimal
+
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+
+from academic.models import (
+    AllocatedSubject,
+    ClassLevel,
+    ClassRoom,
+    ClassYear,
+    Department,
+    GradeLevel,
+    Parent,
+    Stream,
+    Student,
+    StudentClass,
+    Subject,
+    Teacher,
+)
+from administration.cache import bump_model_version
+from administration.models import AcademicYear, Term
+from attendance.models import AttendanceStatus, StudentAttendance
+from examination.models import (
+    ExaminationListHandler,
+    GradeScale,
+    GradeScaleRule,
+    MarksManagement,
+)
+from finance.models import (
+    Payment,
+    PaymentAllocation,
+    PaymentStatus,
+    Receipt,
+    ReceiptAllocation,
+)
+from users.models import Accountant, CustomUser
+
+FIRST_NAMES = (
+    "amina juma neema baraka rehema hamisi zawadi salim grace john fatuma peter "
+    "halima musa mary ali esther omari joyce yusuf agnes said lucy hassan"
+).split()
+LAST_NAMES = (
+    "mushi mollel kimaro mrema lyimo massawe swai temba mbwambo shirima urassa "
+    "minja kessy lema makundi njau"
+).split()
+CLASS_LEVELS = [
+    (1, "Form One", 1),
+    (2, "Form Two", 1),
+    (3, "Form Three", 1),
+    (4, "Form Four", 1),
+    (5, "Form Five", 2),
+    (6, "Form Six", 2),
+]
+SUBJECTS = [
+    ("mathematics", "MATH", "sciences"),
+    ("physics", "PHY", "sciences"),
+    ("chemistry", "CHEM", "sciences"),
+    ("biology", "BIO", "sciences"),
+    ("english", "ENG", "languages"),
+    ("kiswahili", "KISW", "languages"),
+    ("history", "HIST", "humanities"),
+    ("geography", "GEO", "humanities"),
+    ("civics", "CIV", "humanities"),
+    ("commerce", "COMM", "business"),
+    ("book keeping", "BK", "business"),
+]
+GRADE_RULES = [
+    (0, 29.99, "F", 0),
+    (30, 44.99, "D", 1),
+    (45, 64.99, "C", 2),
+    (65, 79.99, "B", 3),
+    (80, 100, "A", 4),
+]
+
+
+class Command(BaseCommand):
+    help = (
+        "Fill an empty database with a synthetic school: students, parents, "
+        "teachers, classrooms, a year of attendance, marks, receipts and "
+        "payments. Used by the benchmark suite."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--students", type=int, default=1000)
+        parser.add_argument("--teachers", type=int, default=60)
+        parser.add_argument(
+            "--streams", type=int, default=3, help="Streams per class level."
+        )
+        parser.add_argument(
+            "--days",
+            type=int,
+            default=180,
+            help="School days of attendance to generate, ending today.",
+        )
+        parser.add_argument("--seed", type=int, default=42)
+        parser.add_argument("--batch-size", type=int, default=2000)
+
+    def handle(self, *args, **options):
+        if Student.objects.exists() or Teacher.objects.exists():
+            raise CommandError(
+                "The database already has students or teachers; "
+                "run this against an empty database."
+            )
+
+        self.random = random.Random(options["seed"])
+        self.batch_size = options["batch_size"]
+        self.today = timezone.localdate()
+        self.password = make_password("Complex.0000")
+
+        with transaction.atomic():
+            self.create_catalogue(options["streams"])
+            self.create_calendar()
+            self.create_teachers(options["teachers"])
+            self.create_classrooms()
+            self.create_students(options["students"])
+            self.create_allocations()
+            self.create_attendance(options["days"])
+            self.create_marks()
+            self.create_finance()
+
+        # bulk_create sends no signals, so mark every cached table stale.
+        for model in [
+            GradeLevel,
+            ClassLevel,
+            Stream,
+            Department,
+            Subject,
+            ClassYear,
+            AcademicYear,
+            Term,
+            Teacher,
+            ClassRoom,
+            AttendanceStatus,
+            ReceiptAllocation,
+            PaymentAllocation,
+        ]:
+            bump_model_version(model)
+
+        self.stdout.write(self.style.SUCCESS("Synthetic school generated."))
+
+    def bulk(self, model, objs):
+        created = model.objects.bulk_create(objs, batch_size=self.batch_size)
+        self.stdout.write(f"  {model.__name__}: {len(created)}")
+        return created
+
+    def name(self):
+        return self.random.choice(FIRST_NAMES), self.random.choice(LAST_NAMES)
+
+    def create_users(self, prefix, count, **flags):
+        users = [
+            CustomUser(
+                email=f"{prefix}{index}@school.test",
+                first_name=first,
+                last_name=last,
+                password=self.password,
+                **flags,
+            )
+            for index, (first, last) in enumerate(
+                (self.name() for _ in range(count)), start=1
+            )
+        ]
+        return self.bulk(CustomUser, users)
+
+    def create_catalogue(self, streams):
+        self.bulk(
+            GradeLevel,
+            [GradeLevel(id=1, name="O-Level"), GradeLevel(id=2, name="A-Level")],
+        )
+        self.class_levels = self.bulk(
+            ClassLevel,
+            [
+                ClassLevel(id=pk, name=name, grade_level_id=grade)
+                for pk, name, grade in CLASS_LEVELS
+            ],
+        )
+        self.streams = self.bulk(
+            Stream, [Stream(name=chr(ord("A") + index)) for index in range(streams)]
+        )
+        departments = {
+            name: Department(name=name, order_rank=rank)
+            for rank, name in enumerate(
+                dict.fromkeys(department for _, _, department in SUBJECTS), start=1
+            )
+        }
+        self.bulk(Department, list(departments.values()))
+        self.subjects = self.bulk(
+            Subject,
+            [
+                Subject(
+                    name=name,
+                    subject_code=code,
+                    description=f"{name} - {code}",
+                    department=departments[department],
+                )
+                for name, code, department in SUBJECTS
+            ],
+        )
+        self.class_years = {
+            level.id: ClassYear(
+                year=str(self.today.year + 7 - level.id),
+                full_name=f"Class of {self.today.year + 7 - level.id}",
+            )
+            for level in self.class_levels
+        }
+        self.bulk(ClassYear, list(self.class_years.values()))
+
+    def create_calendar(self):
+        year = self.today.year
+        self.academic_year = AcademicYear.objects.create(
+            name=str(year),
+            start_date=date(year, 1, 1),
+            end_date=date(year, 12, 31),
+            active_year=True,
+        )
+        bounds = [
+            (date(year, 1, 1), date(year, 4, 30)),
+            (date(year, 5, 1), date(year, 8, 31)),
+            (date(year, 9, 1), date(year, 12, 31)),
+        ]
+        self.terms = self.bulk(
+            Term,
+            [
+                Term(
+                    name=f"Term {index}",
+                    academic_year=self.academic_year,
+                    start_date=start,
+                    end_date=end,
+                )
+                for index, (start, end) in enumerate(bounds, start=1)
+            ],
+        )
+        self.current_term = next(
+            term
+            for term in self.terms
+            if term.start_date <= self.today <= term.end_date
+        )
+
+    def create_teachers(self, count):
+        users = self.create_users("teacher", count, is_teacher=True)
+        self.teachers = self.bulk(
+            Teacher,
+            [
+                Teacher(
+                    user=user,
+                    username=f"{user.first_name}{user.last_name}{index}",
+                    first_name=user.first_name,
+                    last_name=user.last_name,
+                    email=user.email,
+                    gender=self.random.choice(["Male", "Female"]),
+                    empId=f"EMP{index:05d}",
+                    short_name=f"T{index:02d}" if index < 100 else None,
+                    phone_number=f"0711{index:06d}",
+                    salary=self.random.randrange(600_000, 1_500_000, 50_000),
+                )
+                for index, user in enumerate(users, start=1)
+            ],
+        )
+
+        # Every teacher specialises in two subjects.
+        through = Teacher.subject_specialization.through
+        self.specialists = {subject.id: [] for subject in self.subjects}
+        links = []
+        for teacher in self.teachers:
+            for subject in self.random.sample(self.subjects, 2):
+                links.append(through(teacher_id=teacher.id, subject_id=subject.id))
+                self.specialists[subject.id].append(teacher)
+        self.bulk(through, links)
+
+        accountant_users = self.create_users("accountant", 2, is_accountant=True)
+        self.accountants = self.bulk(
+            Accountant,
+            [
+                Accountant(
+                    user=user,
+                    username=f"accountant{index}",
+                    first_name=user.first_name,
+                    last_name=user.last_name,
+                    email=user.email,
+                    empId=f"ACC{index:05d}",
+                )
+                for index, user in enumerate(accountant_users, start=1)
+            ],
+        )
+
+    def create_classrooms(self):
+        self.classrooms = self.bulk(
+            ClassRoom,
+            [
+                ClassRoom(
+                    name=level,
+                    stream=stream,
+                    class_teacher=self.random.choice(self.teachers),
+                    capacity=0,
+                )
+                for level in self.class_levels
+                for stream in self.streams
+            ],
+        )
+
+    def create_students(self, count):
+        # Families of one to three children share a parent contact.
+        family_sizes = []
+        while sum(family_sizes) < count:
+            family_sizes.append(self.random.choice([1, 1, 1, 2, 2, 3]))
+        family_sizes[-1] -= sum(family_sizes) - count
+
+        parent_users = self.create_users("parent", len(family_sizes), is_parent=True)
+        parents = self.bulk(
+            Parent,
+            [
+                Parent(
+                    user=user,
+                    first_name=user.first_name,
+                    last_name=user.last_name,
+                    email=user.email,
+                    parent_type=self.random.choice(["Father", "Mother", "Guardian"]),
+                    phone_number=f"0755{index:06d}",
+                )
+                for index, user in enumerate(parent_users, start=1)
+            ],
+        )
+
+        students = []
+        families = []
+        for parent, size in zip(parents, family_sizes):
+            family = []
+            for _ in range(size):
+                first, _ = self.name()
+                classroom = self.random.choice(self.classrooms)
+                level_id = classroom.name_id
+                student = Student(
+                    first_name=first,
+                    middle_name=parent.first_name,
+                    last_name=parent.last_name,
+                    gender=self.random.choice(["Male", "Female"]),
+                    parent_guardian=parent,
+                    parent_contact=parent.phone_number,
+                    class_level_id=level_id,
+                    class_of_year=self.class_years[level_id],
+                    date_of_birth=date(self.today.year - 12 - level_id, 1, 1)
+                    + timedelta(days=self.random.randrange(365)),
+                    admission_number=f"S{len(students) + 1:06d}",
+                )
+                student.classroom = classroom
+                students.append(student)
+                family.append(student)
+            families.append(family)
+        self.students = self.bulk(Student, students)
+
+        through = Student.siblings.through
+        self.bulk(
+            through,
+            [
+                through(from_student_id=a.id, to_student_id=b.id)
+                for family in families
+                for a in family
+                for b in family
+                if a is not b
+            ],
+        )
+
+        self.student_classes = self.bulk(
+            StudentClass,
+            [
+                StudentClass(
+                    classroom=student.classroom,
+                    academic_year=self.academic_year,
+                    student=student,
+                )
+                for student in self.students
+            ],
+        )
+        occupied = {classroom.id: 0 for classroom in self.classrooms}
+        for student in self.students:
+            occupied[student.classroom.id] += 1
+        for classroom in self.classrooms:
+            classroom.occupied_sits = occupied[classroom.id]
+            classroom.capacity = occupied[classroom.id] + 10
+        ClassRoom.objects.bulk_update(
+            self.classrooms, ["occupied_sits", "capacity"], batch_size=self.batch_size
+        )
+
+    def create_allocations(self):
+        self.classroom_subjects = {}
+        allocations = []
+        for classroom in self.classrooms:
+            subjects = self.random.sample(self.subjects, min(8, len(self.subjects)))
+            self.classroom_subjects[classroom.id] = subjects
+            for subject in subjects:
+                teacher = self.random.choice(
+                    self.specialists[subject.id] or self.teachers
+                )
+                allocations.append(
+                    AllocatedSubject(
+                        teacher_name=teacher,
+                        subject=subject,
+                        academic_year=self.academic_year,
+                        term=self.current_term,
+                        class_room=classroom,
+                        weekly_periods=self.random.choice([3, 4, 5]),
+                        max_daily_periods=2,
+                    )
+                )
+        self.bulk(AllocatedSubject, allocations)
+
+    def create_attendance(self, days):
+        statuses = self.bulk(
+            AttendanceStatus,
+            [
+                AttendanceStatus(name="Present", code="P"),
+                AttendanceStatus(name="Absent", code="A", absent=True),
+                AttendanceStatus(name="Late", code="L", late=True),
+                AttendanceStatus(name="Excused", code="E", excused=True, absent=True),
+            ],
+        )
+        not_present = statuses[1:]
+
+        school_days = []
+        day = self.today
+        while len(school_days) < days:
+            if day.weekday() < 5:
+                school_days.append(day)
+            day -= timedelta(days=1)
+
+        # Only exceptions are stored; "Present" rows are never saved.
+        records = []
+        for day in school_days:
+            for student in self.random.sample(
+                self.students, max(1, len(self.students) * 7 // 100)
+            ):
+                records.append(
+                    StudentAttendance(
+                        student=student,
+                        date=day,
+                        ClassRoom=student.classroom,
+                        status=self.random.choice(not_present),
+                    )
+                )
+        self.bulk(StudentAttendance, records)
+
+    def create_marks(self):
+        scale = GradeScale.objects.create(name="Default")
+        self.bulk(
+            GradeScaleRule,
+            [
+                GradeScaleRule(
+                    min_grade=Decimal(str(low)),
+                    max_grade=Decimal(str(high)),
+                    letter_grade=letter,
+                    numeric_scale=Decimal(points),
+                    grade_scale=scale,
+                )
+                for low, high, letter, points in GRADE_RULES
+            ],
+        )
+
+        exams = []
+        for term in self.terms:
+            if term.start_date > self.today:
+                continue
+            for name, offset in (("Midterm", 45), ("Terminal", 100)):
+                start = min(term.start_date + timedelta(days=offset), self.today)
+                exams.append(
+                    ExaminationListHandler(
+                        name=f"{term.name} {name}",
+                        start_date=start,
+                        ends_date=start + timedelta(days=5),
+                        out_of=100,
+                        created_by=self.random.choice(self.teachers),
+                    )
+                )
+        exams = self.bulk(ExaminationListHandler, exams)
+        through = ExaminationListHandler.classrooms.through
+        self.bulk(
+            through,
+            [
+                through(examinationlisthandler_id=exam.id, classroom_id=classroom.id)
+                for exam in exams
+                for classroom in self.classrooms
+            ],
+        )
+
+        marks = []
+        for student, student_class in zip(self.students, self.student_classes):
+            ability = self.random.gauss(58, 12)
+            for subject in self.classroom_subjects[student.classroom.id]:
+                for exam in exams:
+                    score = self.random.gauss(ability, 10)
+                    marks.append(
+                        MarksManagement(
+                            exam_name=exam,
+                            points_scored=round(min(100, max(0, score)), 1),
+                            subject=subject,
+                            student=student_class,
+                            created_by=self.teachers[0],
+                        )
+                    )
+        self.bulk(MarksManagement, marks)
+
+    def create_finance(self):
+        receipt_allocations = self.bulk(
+            ReceiptAllocation,
+            [
+                ReceiptAllocation(name="School Fees", abbr="SF"),
+                ReceiptAllocation(name="Uniform", abbr="UN"),
+                ReceiptAllocation(name="Transport", abbr="TR"),
+            ],
+        )
+        school_fees = receipt_allocations[0]
+        terms_started = [term for term in self.terms if term.start_date <= self.today]
+        fees_due = sum(term.default_term_fee for term in terms_started)
+
+        receipts = []
+        for student in self.students:
+            paid = Decimal("0.00")
+            for _ in range(self.random.randint(1, 4)):
+                allocation = self.random.choice(receipt_allocations)
+                amount = Decimal(self.random.randrange(20_000, 200_000, 5_000))
+                if allocation is school_fees:
+                    paid += amount
+                receipts.append(
+                    Receipt(
+                        receipt_no=len(receipts) + 1,
+                        payer=student.parent_guardian.first_name,
+                        paid_for=allocation,
+                        student=student,
+                        amount=amount,
+                        status=PaymentStatus.COMPLETED,
+                        received_by=self.random.choice(self.accountants),
+                    )
+                )
+            student.debt = max(fees_due - paid, Decimal("0.00"))
+        self.bulk(Receipt, receipts)
+        Student.objects.bulk_update(self.students, ["debt"], batch_size=self.batch_size)
+
+        payment_allocations = self.bulk(
+            PaymentAllocation,
+            [
+                PaymentAllocation(name="Salary", abbr="SAL"),
+                PaymentAllocation(name="Utilities", abbr="UT"),
+                PaymentAllocation(name="Supplies", abbr="SUP"),
+            ],
+        )
+        payments = []
+        for teacher in self.teachers:
+            for _ in terms_started:
+                payments.append(
+                    Payment(
+                        payment_no=len(payments) + 1,
+                        paid_to=str(teacher),
+                        user=teacher.user,
+                        paid_for=payment_allocations[0],
+                        amount=Decimal(teacher.salary),
+                        status=PaymentStatus.COMPLETED,
+                        paid_by=self.random.choice(self.accountants),
+                    )
+                )
+        for _ in range(len(self.students) // 10):
+            payments.append(
+                Payment(
+                    payment_no=len(payments) + 1,
+                    paid_to="Supplier",
+                    paid_for=self.random.choice(payment_allocations[1:]),
+                    amount=Decimal(self.random.randrange(10_000, 500_000, 10_000)),
+                    status=PaymentStatus.COMPLETED,
+                    paid_by=self.random.choice(self.accountants),
+                )
+            )
+        self.bulk(Payment, payments)
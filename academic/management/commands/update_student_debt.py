@@ -1,21 +1,16 @@
 from django.core.management.base import BaseCommand
 from academic.models import Student
-from administration.models import Term, AcademicYear
-from django.utils.timezone import now
+from administration.context import get_academic_context
 
 
 class Command(BaseCommand):
     help = "Update student debt at the start of each term and carry forward unpaid debt to the new academic year."
 
     def handle(self, *args, **kwargs):
-        # Get the current date
-        today = now().date()
-
         # Get the current academic year and term
-        current_term = Term.objects.filter(
-            start_date__lte=today, end_date__gte=today
-        ).first()
-        current_year = AcademicYear.objects.filter(current=True).first()
+        context = get_academic_context()
+        current_term = context.term
+        current_year = context.academic_year
 
         if not current_term:
             self.stdout.write("No active term found for today.")
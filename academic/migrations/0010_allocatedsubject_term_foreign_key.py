@@ -0,0 +1,20 @@
+# Generated by Django 5.1 on 2026-10-19 02:22
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('academic', '0009_remove_teacher_isteacher_alter_student_options'),
+        ('administration', '0003_alter_term_default_term_fee'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='allocatedsubject',
+            name='term',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, to='administration.term'),
+        ),
+    ]
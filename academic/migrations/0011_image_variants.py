@@ -0,0 +1,43 @@
+# Generated by Django 5.1 on 2026-10-19 03:01
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('academic', '0010_allocatedsubject_term_foreign_key'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='parent',
+            name='image_thumbnail',
+            field=models.ImageField(blank=True, editable=False, max_length=255, upload_to=''),
+        ),
+        migrations.AddField(
+            model_name='parent',
+            name='image_webp',
+            field=models.ImageField(blank=True, editable=False, max_length=255, upload_to=''),
+        ),
+        migrations.AddField(
+            model_name='student',
+            name='image_thumbnail',
+            field=models.ImageField(blank=True, editable=False, max_length=255, upload_to=''),
+        ),
+        migrations.AddField(
+            model_name='student',
+            name='image_webp',
+            field=models.ImageField(blank=True, editable=False, max_length=255, upload_to=''),
+        ),
+        migrations.AddField(
+            model_name='teacher',
+            name='image_thumbnail',
+            field=models.ImageField(blank=True, editable=False, max_length=255, upload_to=''),
+        ),
+        migrations.AddField(
+            model_name='teacher',
+            name='image_webp',
+            field=models.ImageField(blank=True, editable=False, max_length=255, upload_to=''),
+        ),
+    ]
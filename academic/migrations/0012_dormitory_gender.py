@@ -0,0 +1,18 @@
+# Generated by Django 5.1 on 2026-10-19 03:09
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('academic', '0011_image_variants'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='dormitory',
+            name='gender',
+            field=models.CharField(blank=True, choices=[('Male', 'Male'), ('Female', 'Female'), ('Other', 'Other')], help_text='Leave empty for a dormitory open to every gender', max_length=10, null=True),
+        ),
+    ]
@@ -9,6 +9,7 @@ from django.utils.crypto import get_random_string
 from django.utils import timezone
 from users.models import CustomUser
 from administration.models import AcademicYear, Term
+from administration.context import get_academic_context
 
 from .validators import *
 from administration.common_objs import *
@@ -88,6 +89,8 @@ class Teacher(models.Model):
     date_of_birth = models.DateField(blank=True, null=True)
     designation = models.CharField(max_length=255, blank=True, null=True)
     image = models.ImageField(upload_to="Employee_images", blank=True, null=True)
+    image_thumbnail = models.ImageField(max_length=255, blank=True, editable=False)
+    image_webp = models.ImageField(max_length=255, blank=True, editable=False)
     inactive = models.BooleanField(default=False)
 
     class Meta:
@@ -268,7 +271,7 @@ class AllocatedSubject(models.Model):
         Subject, on_delete=models.CASCADE, related_name="allocated_subjects"
     )
     academic_year = models.ForeignKey(AcademicYear, on_delete=models.CASCADE)
-    term = models.OneToOneField(Term, on_delete=models.SET_NULL, blank=True, null=True)
+    term = models.ForeignKey(Term, on_delete=models.SET_NULL, blank=True, null=True)
     class_room = models.ForeignKey(
         ClassRoom, on_delete=models.CASCADE, related_name="subjects"
     )
@@ -327,6 +330,8 @@ class Parent(models.Model):
     alt_email = models.EmailField(blank=True, null=True, help_text="Personal email")
     date = models.DateTimeField(auto_now_add=True)
     image = models.ImageField(upload_to="Parent_images", blank=True)
+    image_thumbnail = models.ImageField(max_length=255, blank=True, editable=False)
+    image_webp = models.ImageField(max_length=255, blank=True, editable=False)
     inactive = models.BooleanField(default=False)
 
     class Meta:
@@ -404,6 +409,8 @@ class Student(models.Model):
     prem_number = models.CharField(max_length=50, blank=True)
     siblings = models.ManyToManyField("self", blank=True)
     image = models.ImageField(upload_to="Student_images", blank=True)
+    image_thumbnail = models.ImageField(max_length=255, blank=True, editable=False)
+    image_webp = models.ImageField(max_length=255, blank=True, editable=False)
     cache_gpa = models.DecimalField(
         editable=False, max_digits=5, decimal_places=2, blank=True, null=True
     )
@@ -479,7 +486,7 @@ class Student(models.Model):
         Update student debt at the start of a new term.
         If moving to a new academic year, carry forward unpaid debt.
         """
-        if term.start_date <= timezone.now():
+        if term.start_date <= timezone.localdate():
             self.debt += term.default_term_fee  # Add the term fee to existing debt
             self.save()
 
@@ -488,7 +495,10 @@ class Student(models.Model):
         Carry forward debt to the first term of the new academic year.
         """
 
-        current_academic_year = AcademicYear.objects.get(current=True)
+        current_academic_year = get_academic_context().academic_year
+        if current_academic_year is None or current_academic_year.end_date is None:
+            return
+
         next_year = AcademicYear.objects.filter(
             start_date__gt=current_academic_year.end_date
         ).first()
@@ -523,7 +533,8 @@ class StudentClass(models.Model):
 
     @property
     def is_current_class(self):
-        return self.academic_year.is_current_session
+        current_year = get_academic_context().academic_year
+        return current_year is not None and self.academic_year_id == current_year.pk
 
     def __str__(self):
         return f"Student: {self.student}, Class: {self.classroom}"
@@ -655,6 +666,13 @@ class StudentsPreviousAcademicHistory(models.Model):
 
 class Dormitory(models.Model):
     name = models.CharField(max_length=150)
+    gender = models.CharField(
+        max_length=10,
+        choices=GENDER_CHOICE,
+        blank=True,
+        null=True,
+        help_text="Leave empty for a dormitory open to every gender",
+    )
     capacity = models.PositiveIntegerField(blank=True, null=True)
     occupied_beds = models.IntegerField(blank=True, null=True)
     captain = models.ForeignKey(Student, on_delete=models.CASCADE, blank=True)
@@ -662,24 +680,26 @@ class Dormitory(models.Model):
     def __str__(self):
         return self.name
 
+    def beds_in_use(self):
+        """Beds held by current allocations; ``occupied_beds`` may lag behind."""
+        return DormitoryAllocation.current().filter(dormitory=self).count()
+
     def available_beds(self):
-        total = self.capacity - self.occupied_beds
+        total = (self.capacity or 0) - self.beds_in_use()
         if total <= 0:
             return 0  # Return 0 to indicate no available beds
         return total
 
-    def save(
-        self, force_insert=False, force_update=False, using=None, update_fields=None
-    ):
+    def save(self, *args, **kwargs):
         if (
             self.capacity is not None
             and self.occupied_beds is not None
-            and self.capacity <= self.occupied_beds
+            and self.capacity < self.occupied_beds
         ):
             raise ValueError(
-                f"All beds in {self.name} are occupied. Please add more beds or allocate to another dormitory."
+                f"{self.name} has more occupied beds than its capacity. Please add more beds or allocate to another dormitory."
             )
-        super(Dormitory, self).save()
+        super(Dormitory, self).save(*args, **kwargs)
 
 
 class DormitoryAllocation(models.Model):
@@ -691,20 +711,31 @@ class DormitoryAllocation(models.Model):
     def __str__(self):
         return str(self.student.admission_number)
 
-    @transaction.atomic
+    @classmethod
+    def current(cls):
+        """Allocations that still hold a bed: open-ended or not yet ended."""
+        return cls.objects.filter(
+            models.Q(date_till__isnull=True)
+            | models.Q(date_till__gte=timezone.localdate())
+        )
+
     def update_dormitory(self):
-        """Update the capacity of the selected dormitory."""
-        selected_dorm = Dormitory.objects.select_for_update().get(pk=self.dormitory.pk)
-        if selected_dorm.available_beds() <= 0:
+        """Take one bed of the selected dormitory."""
+        selected_dorm = Dormitory.objects.select_for_update().get(pk=self.dormitory_id)
+        # Counted from current allocations, so beds whose allocation ended
+        # are free again.
+        in_use = selected_dorm.beds_in_use()
+        if (selected_dorm.capacity or 0) - in_use <= 0:
             raise ValidationError(f"{selected_dorm.name} has no available beds.")
-        selected_dorm.occupied_beds += 1
-        selected_dorm.save()
-
-    def save(
-        self, force_insert=False, force_update=False, using=None, update_fields=None
-    ):
-        self.update_dormitory()
-        super(DormitoryAllocation, self).save()
+        Dormitory.objects.filter(pk=selected_dorm.pk).update(occupied_beds=in_use + 1)
+
+    def save(self, *args, **kwargs):
+        # Only a new allocation takes a bed; editing one (e.g. setting
+        # ``date_till``) must not count it again.
+        with transaction.atomic():
+            if self._state.adding:
+                self.update_dormitory()
+            super(DormitoryAllocation, self).save(*args, **kwargs)
 
 
 class StudentFile(models.Model):
@@ -1,5 +1,6 @@
 from rest_framework import serializers
 
+from administration.cache import reference_cache
 
 from .models import (
     ClassYear,
@@ -72,10 +73,11 @@ class ClassRoomSerializer(serializers.ModelSerializer):
         fields = "__all__"
 
     def get_name(self, obj):
-        return obj.name.name  # Access the name field of the related ClassLevel object
+        # Resolved from the reference cache instead of a query per row
+        return reference_cache.name_of(ClassLevel, obj.name_id)
 
     def get_stream(self, obj):
-        return obj.stream.name  # Access the name field of the related Stream object
+        return reference_cache.name_of(Stream, obj.stream_id)
 
     def get_class_teacher(self, obj):
         return (
@@ -1,3 +1,77 @@
+from datetime import date, timedelta
+from unittest import mock
+
+from django.core.exceptions import ValidationError
 from django.test import TestCase
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from administration.access_log import AccessLogBuffer
+from users.models import CustomUser
+from .dormitories import plan_allocation
+from .models import Dormitory, DormitoryAllocation, Student
+
+ALLOCATE_URL = "/api/academic/dormitories/allocate/"
+
+
+class DormitoryAllocationTests(TestCase):
+    def setUp(self):
+        self.students = [
+            Student.objects.create(
+                first_name=f"student{number}",
+                middle_name="m",
+                last_name="test",
+                gender="Male",
+                date_of_birth=date(2010, 1, 1),
+                admission_number=f"T{number}",
+                parent_contact=f"07000000{number}",
+            )
+            for number in range(3)
+        ]
+        self.dormitory = Dormitory.objects.create(
+            name="Kilimanjaro", gender="Male", capacity=1, captain=self.students[0]
+        )
+
+    def test_bed_is_free_again_once_its_allocation_ended(self):
+        allocation = DormitoryAllocation.objects.create(
+            student=self.students[0], dormitory=self.dormitory
+        )
+        self.assertEqual(self.dormitory.available_beds(), 0)
+        allocation.date_till = timezone.localdate() - timedelta(days=1)
+        allocation.save()
+
+        plan = plan_allocation([self.students[1].pk], dormitories=[self.dormitory.pk])
+        self.assertEqual(len(plan.assignments), 1)
+        plan.apply()
+        self.dormitory.refresh_from_db()
+        self.assertEqual(self.dormitory.occupied_beds, 1)
+
+    def test_apply_rejects_students_housed_since_the_plan(self):
+        self.dormitory.capacity = 5
+        self.dormitory.save()
+        plan = plan_allocation([self.students[1].pk], dormitories=[self.dormitory.pk])
+        DormitoryAllocation.objects.create(
+            student=self.students[1], dormitory=self.dormitory
+        )
+        with self.assertRaises(ValidationError):
+            plan.apply()
+        self.assertEqual(
+            DormitoryAllocation.objects.filter(student=self.students[1]).count(), 1
+        )
 
-# Create your tests here.
+    def test_invalid_dormitory_ids_are_a_bad_request(self):
+        # Keep the requests' access logs out of the process-wide buffer.
+        patcher = mock.patch("administration.access_log.buffer", AccessLogBuffer())
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        client = APIClient()
+        client.force_authenticate(
+            CustomUser.objects.create_user("admin@school.test", "secret", is_staff=True)
+        )
+        for dormitories in ("abc", ["abc"]):
+            response = client.post(
+                ALLOCATE_URL,
+                {"students": [self.students[1].pk], "dormitories": dormitories},
+                format="json",
+            )
+            self.assertEqual(response.status_code, 400, dormitories)
@@ -1,12 +1,22 @@
+import time
+
 import openpyxl
 from django.db.models import F
 from django.core.exceptions import ValidationError
+from django.http import JsonResponse
+from django.utils import timezone
+from django.views.decorators.http import require_GET
 from rest_framework import generics
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
-from rest_framework.permissions import IsAuthenticated
+from rest_framework.permissions import IsAdminUser, IsAuthenticated
 from administration.models import AcademicYear
+from administration.cache import reference_cache
+from api.http_cache import CachedListMixin
+from api.rows import query_flag
+from users.authentication import async_jwt_required
+from .dormitories import plan_allocation
 from .models import (
     Subject,
     Department,
@@ -19,6 +29,7 @@ from .models import (
     ReasonLeft,
     StudentClass,
     Student,
+    MessageToParent,
 )
 from .serializers import (
     DepartmentSerializer,
@@ -34,7 +45,7 @@ from .serializers import (
 
 
 # Department Views
-class DepartmentListCreateView(generics.ListCreateAPIView):
+class DepartmentListCreateView(CachedListMixin, generics.ListCreateAPIView):
     queryset = Department.objects.all()
     serializer_class = DepartmentSerializer
     permission_classes = [IsAuthenticated]
@@ -47,7 +58,7 @@ class DepartmentDetailView(generics.RetrieveUpdateDestroyAPIView):
 
 
 # ClassLevel Views
-class ClassLevelListCreateView(generics.ListCreateAPIView):
+class ClassLevelListCreateView(CachedListMixin, generics.ListCreateAPIView):
     queryset = ClassLevel.objects.all()
     serializer_class = ClassLevelSerializer
     permission_classes = [IsAuthenticated]
@@ -60,7 +71,7 @@ class ClassLevelDetailView(generics.RetrieveUpdateDestroyAPIView):
 
 
 # GradeLevel Views
-class GradeLevelListCreateView(generics.ListCreateAPIView):
+class GradeLevelListCreateView(CachedListMixin, generics.ListCreateAPIView):
     queryset = GradeLevel.objects.all()
     serializer_class = GradeLevelSerializer
     permission_classes = [IsAuthenticated]
@@ -73,7 +84,7 @@ class GradeLevelDetailView(generics.RetrieveUpdateDestroyAPIView):
 
 
 # ClassYear Views
-class ClassYearListCreateView(generics.ListCreateAPIView):
+class ClassYearListCreateView(CachedListMixin, generics.ListCreateAPIView):
     queryset = ClassYear.objects.all()
     serializer_class = ClassYearSerializer
     permission_classes = [IsAuthenticated]
@@ -86,7 +97,7 @@ class ClassYearDetailView(generics.RetrieveUpdateDestroyAPIView):
 
 
 # ReasonLeft Views
-class ReasonLeftListCreateView(generics.ListCreateAPIView):
+class ReasonLeftListCreateView(CachedListMixin, generics.ListCreateAPIView):
     queryset = ReasonLeft.objects.all()
     serializer_class = ReasonLeftSerializer
     permission_classes = [IsAuthenticated]
@@ -99,7 +110,7 @@ class ReasonLeftDetailView(generics.RetrieveUpdateDestroyAPIView):
 
 
 # Stream Views
-class StreamListCreateView(generics.ListCreateAPIView):
+class StreamListCreateView(CachedListMixin, generics.ListCreateAPIView):
     queryset = Stream.objects.all()
     serializer_class = StreamSerializer
     permission_classes = [IsAuthenticated]
@@ -111,7 +122,7 @@ class StreamDetailView(generics.RetrieveUpdateDestroyAPIView):
     permission_classes = [IsAuthenticated]
 
 
-class SubjectListView(generics.ListCreateAPIView):
+class SubjectListView(CachedListMixin, generics.ListCreateAPIView):
     queryset = Subject.objects.all()
     serializer_class = SubjectSerializer
     permission_classes = [IsAuthenticated]
@@ -159,11 +170,10 @@ class BulkUploadSubjectsView(APIView):
 
                 try:
                     # Validate department
-                    try:
-                        department = Department.objects.get(
-                            name=subject_data["department"].strip().lower()
-                        )
-                    except Department.DoesNotExist:
+                    department = reference_cache.get_by_name(
+                        Department, subject_data["department"]
+                    )
+                    if department is None:
                         raise ValueError(
                             f"Department '{subject_data['department']}' does not exist."
                         )
@@ -175,7 +185,7 @@ class BulkUploadSubjectsView(APIView):
                         raise ValueError(
                             f"Subject code '{subject_data['subject_code']}' already exists."
                         )
-                    if Subject.objects.filter(name=subject_data["name"]).exists():
+                    if reference_cache.get_by_name(Subject, subject_data["name"]):
                         raise ValueError(
                             f"Subject name '{subject_data['name']}' already exists."
                         )
@@ -197,6 +207,8 @@ class BulkUploadSubjectsView(APIView):
             # Bulk create valid subjects
             if subjects_to_create:
                 Subject.objects.bulk_create(subjects_to_create)
+                # bulk_create skips post_save, so refresh the cache by hand
+                reference_cache.invalidate(Subject)
 
             return Response(
                 {
@@ -210,15 +222,19 @@ class BulkUploadSubjectsView(APIView):
             return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
 
 
-class ClassRoomView(APIView):
+class ClassRoomView(CachedListMixin, APIView):
     """
     API View to handle CRUD operations for ClassRoom model.
     """
 
+    cache_models = (ClassRoom, ClassLevel, Stream, Teacher)
+
     def get(self, request):
-        classrooms = ClassRoom.objects.all()
-        serializer = ClassRoomSerializer(classrooms, many=True)
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        def build_data():
+            classrooms = ClassRoom.objects.select_related("class_teacher")
+            return ClassRoomSerializer(classrooms, many=True).data
+
+        return self.cached_list_response(request, build_data)
 
     def post(self, request):
         serializer = ClassRoomSerializer(data=request.data)
@@ -260,8 +276,20 @@ class BulkUploadClassRoomsView(APIView):
 
                 try:
                     # Validate and fetch related objects
-                    name = ClassLevel.objects.get(name=classroom_data["name"].lower())
-                    stream = Stream.objects.get(name=classroom_data["stream"].upper())
+                    name = reference_cache.get_by_name(
+                        ClassLevel, classroom_data["name"]
+                    )
+                    if name is None:
+                        raise ValueError(
+                            f"Class level '{classroom_data['name']}' does not exist."
+                        )
+                    stream = reference_cache.get_by_name(
+                        Stream, classroom_data["stream"]
+                    )
+                    if stream is None:
+                        raise ValueError(
+                            f"Stream '{classroom_data['stream']}' does not exist."
+                        )
 
                     # Check if ClassRoom with the same name and stream already exists
                     if ClassRoom.objects.filter(name=name, stream=stream).exists():
@@ -385,11 +413,10 @@ class BulkUploadStudentClassView(APIView):
                         )
 
                     # Validate AcademicYear
-                    try:
-                        academic_year = AcademicYear.objects.get(
-                            name=row_data["academic_year"]
-                        )
-                    except AcademicYear.DoesNotExist:
+                    academic_year = reference_cache.get_by_name(
+                        AcademicYear, row_data["academic_year"]
+                    )
+                    if academic_year is None:
                         raise ValidationError(
                             f"Row {i}: Academic year '{row_data['academic_year']}' does not exist."
                         )
@@ -465,3 +492,95 @@ class BulkUploadStudentClassView(APIView):
 
         except Exception as e:
             return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+
+@require_GET
+@async_jwt_required
+async def active_parent_messages_async(request):
+    """
+    List the messages to parents that are active today, for the ASGI deployment.
+    """
+    today = timezone.localdate()
+    messages = [
+        message
+        async for message in MessageToParent.objects.filter(
+            start_date__lte=today, end_date__gte=today
+        )
+        .order_by("-start_date")
+        .values("id", "message", "start_date", "end_date")
+    ]
+    return JsonResponse(messages, safe=False)
+
+
+def _ids(value):
+    """``value`` as a list of ids, or ``None`` if it isn't one."""
+    if not isinstance(value, (list, tuple)):
+        return None
+    try:
+        return [int(item) for item in value]
+    except (TypeError, ValueError):
+        return None
+
+
+class AllocateDormitoriesView(APIView):
+    """
+    Assign beds to a boarding intake: ``students`` (ids) or everyone in a
+    ``class_level``, optionally only in ``dormitories`` (ids).
+    ``group_by_class_level`` (default true) keeps each class level together.
+    Send ``{"dry_run": true}`` to see the plan without saving it.
+    """
+
+    permission_classes = [IsAdminUser]
+
+    def post(self, request):
+        data = request.data
+        if data.get("students"):
+            students = _ids(data["students"])
+            if students is None:
+                return Response(
+                    {"error": "students must be a list of student ids."},
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
+        elif data.get("class_level"):
+            class_level = reference_cache.get_by_name(ClassLevel, data["class_level"])
+            if class_level is None:
+                return Response(
+                    {"error": f"Class level '{data['class_level']}' does not exist."},
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
+            students = Student.objects.filter(
+                class_level=class_level, date_dismissed__isnull=True
+            )
+        else:
+            return Response(
+                {"error": "Provide the students or the class_level to allocate."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        dormitories = None
+        if data.get("dormitories"):
+            dormitories = _ids(data["dormitories"])
+            if dormitories is None:
+                return Response(
+                    {"error": "dormitories must be a list of dormitory ids."},
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
+        dry_run = query_flag(request, "dry_run")
+
+        started = time.perf_counter()
+        plan = plan_allocation(
+            students,
+            dormitories=dormitories,
+            group_by_class_level=query_flag(request, "group_by_class_level", True),
+        )
+        if not dry_run and plan.changed:
+            try:
+                plan.apply()
+            except ValidationError as e:
+                return Response(
+                    {"error": e.messages[0]}, status=status.HTTP_409_CONFLICT
+                )
+        elapsed = (time.perf_counter() - started) * 1000
+
+        return Response(
+            {"dry_run": dry_run, **plan.summary(), "elapsed_ms": round(elapsed, 1)}
+        )
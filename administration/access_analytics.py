@@ -0,0 +1,171 @@
+"""
+Access analytics from daily rollups.
+
+``rollup_access_logs`` sums each day of ``AccessLog`` into ``AccessRollup``
+rows: the day's distinct users, requests and logins overall, per role, per
+operating system, per browser and per hour. Every dimension of a whole
+range of days comes from one grouped query (``TruncDate``/``TruncHour``),
+so a night's run, or a backfill of months, costs five queries.
+
+The dashboard functions only ever read rollups, a few dozen rows per day,
+and never the raw logs. Distinct users can't be added up across days, so
+multi-day figures for the client mix are user-days.
+"""
+
+from datetime import datetime, time, timedelta
+
+from django.db import transaction
+from django.db.models import Case, Count, F, Q, Sum, Value, When
+from django.db.models.functions import TruncDate, TruncHour
+from django.utils import timezone
+
+from .access_log import LOGIN_USAGE
+from .models import AccessLog, AccessRollup
+
+WEEKDAYS = ("Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun")
+ROLES = ("admin", "teacher", "accountant", "parent", "other")
+
+ROLE = Case(
+    When(login__isnull=True, then=Value("anonymous")),
+    When(login__is_staff=True, then=Value("admin")),
+    When(login__is_teacher=True, then=Value("teacher")),
+    When(login__is_accountant=True, then=Value("accountant")),
+    When(login__is_parent=True, then=Value("parent")),
+    default=Value("other"),
+)
+
+
+def _measures():
+    return {
+        "users": Count("login", distinct=True),
+        "requests": Count("id"),
+        "logins": Count("id", filter=Q(usage=LOGIN_USAGE)),
+    }
+
+
+def _day_start(day):
+    return timezone.make_aware(datetime.combine(day, time.min))
+
+
+def build_rollups(first_day, last_day):
+    """Return the ``AccessRollup`` rows of ``first_day`` to ``last_day``."""
+    logs = AccessLog.objects.filter(
+        date__gte=_day_start(first_day), date__lt=_day_start(last_day + timedelta(1))
+    ).annotate(day=TruncDate("date"))
+
+    rollups = []
+    for row in logs.values("day").annotate(**_measures()):
+        rollups.append(
+            AccessRollup(
+                date=row["day"],
+                dimension="all",
+                value="",
+                users=row["users"],
+                requests=row["requests"],
+                logins=row["logins"],
+            )
+        )
+    for dimension, expression in (
+        ("role", ROLE),
+        ("os", F("os")),
+        ("browser", F("browser")),
+    ):
+        rows = (
+            logs.annotate(key=expression).values("day", "key").annotate(**_measures())
+        )
+        for row in rows:
+            rollups.append(
+                AccessRollup(
+                    date=row["day"],
+                    dimension=dimension,
+                    value=row["key"] or "Unknown",
+                    users=row["users"],
+                    requests=row["requests"],
+                    logins=row["logins"],
+                )
+            )
+    for row in logs.values(hour=TruncHour("date")).annotate(**_measures()):
+        hour = timezone.localtime(row["hour"])
+        rollups.append(
+            AccessRollup(
+                date=hour.date(),
+                dimension="hour",
+                value=f"{hour.hour:02d}",
+                users=row["users"],
+                requests=row["requests"],
+                logins=row["logins"],
+            )
+        )
+    return rollups
+
+
+@transaction.atomic
+def rollup_days(first_day, last_day):
+    """Replace the rollups of ``first_day`` to ``last_day``; returns the rows."""
+    rollups = build_rollups(first_day, last_day)
+    AccessRollup.objects.filter(date__gte=first_day, date__lte=last_day).delete()
+    AccessRollup.objects.bulk_create(rollups)
+    return rollups
+
+
+def daily_active_users(rollups):
+    """
+    Distinct users, requests and logins per day, with users per role and
+    the requests made without logging in.
+    """
+    days = {}
+    for date, dimension, value, users, requests, logins in rollups.filter(
+        dimension__in=("all", "role")
+    ).values_list("date", "dimension", "value", "users", "requests", "logins"):
+        day = days.setdefault(
+            date,
+            {
+                "date": date,
+                "users": 0,
+                "requests": 0,
+                "logins": 0,
+                "roles": dict.fromkeys(ROLES, 0),
+                "anonymous_requests": 0,
+            },
+        )
+        if dimension == "all":
+            day.update(users=users, requests=requests, logins=logins)
+        elif value == "anonymous":
+            day["anonymous_requests"] = requests
+        else:
+            day["roles"][value] = users
+    return [days[date] for date in sorted(days)]
+
+
+def client_mix(rollups):
+    """Requests and user-days per operating system and per browser."""
+    mix = {}
+    for dimension in ("os", "browser"):
+        rows = list(
+            rollups.filter(dimension=dimension)
+            .values("value")
+            .annotate(requests=Sum("requests"), user_days=Sum("users"))
+            .order_by("-requests", "value")
+        )
+        total = sum(row["requests"] for row in rows)
+        mix[dimension] = [
+            {
+                "name": row["value"],
+                "requests": row["requests"],
+                "user_days": row["user_days"],
+                "share": round(row["requests"] / total, 4) if total else 0,
+            }
+            for row in rows
+        ]
+    return mix
+
+
+def login_heatmap(rollups):
+    """Logins per weekday (rows, Monday first) and hour of the day (columns)."""
+    logins = [[0] * 24 for _ in WEEKDAYS]
+    rows = rollups.filter(dimension="hour", logins__gt=0).values_list(
+        "date", "value", "logins"
+    )
+    for date, hour, count in rows:
+        logins[date.weekday()][int(hour)] += count
+    return {"days": list(WEEKDAYS), "hours": list(range(24)), "logins": logins}
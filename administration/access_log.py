@@ -0,0 +1,198 @@
+"""
+Buffered access logging.
+
+Authenticated requests and logins are recorded in ``AccessLog`` without an
+insert per request: entries are collected in a per-process buffer and written
+with one ``bulk_create`` once ``ACCESS_LOG_FLUSH_SIZE`` of them are waiting,
+or by the first request to finish ``ACCESS_LOG_FLUSH_INTERVAL`` seconds after
+the oldest one arrived. Batches are written by the request that completes
+them, on that request's database connection, so they never compete with it for
+locks. A batch that can't be written stays buffered and is retried an
+interval later; while the database is down, the buffer keeps at most
+``ACCESS_LOG_MAX_BUFFER`` entries and drops the oldest beyond that. What is
+still buffered is written when the process exits.
+
+User agents are parsed once per distinct string, through an LRU cache, and
+stored in the ``os`` and ``browser`` columns so reading them costs nothing.
+"""
+
+import atexit
+import ipaddress
+import logging
+import threading
+import time
+from functools import lru_cache
+
+from django.conf import settings
+from django.db import DatabaseError, close_old_connections, transaction
+from django.utils import timezone
+from user_agents import parse
+
+from .models import AccessLog
+
+logger = logging.getLogger(__name__)
+
+UNKNOWN = "Unknown"
+LOGIN_USAGE = "login"
+
+
+@lru_cache(maxsize=2048)
+def parse_user_agent(ua):
+    """Return the ``(os, browser)`` families of a user-agent string."""
+    if not ua:
+        return UNKNOWN, UNKNOWN
+    try:
+        user_agent = parse(ua)
+    except Exception:
+        return UNKNOWN, UNKNOWN
+    return (
+        user_agent.os.family[:100] or UNKNOWN,
+        user_agent.browser.family[:100] or UNKNOWN,
+    )
+
+
+def _valid_ip(value):
+    try:
+        return str(ipaddress.ip_address(value.strip()))
+    except (AttributeError, ValueError):
+        return None
+
+
+def client_ip(request):
+    """The client's address, from ``X-Forwarded-For`` when a proxy set it."""
+    forwarded = request.META.get("HTTP_X_FORWARDED_FOR", "")
+    return (
+        _valid_ip(forwarded.split(",")[0])
+        or _valid_ip(request.META.get("REMOTE_ADDR"))
+        or "0.0.0.0"
+    )
+
+
+class AccessLogBuffer:
+    """Collects ``AccessLog`` rows and writes them in batches."""
+
+    def __init__(self, size=None, interval=None, max_entries=None):
+        self.size = size or getattr(settings, "ACCESS_LOG_FLUSH_SIZE", 200)
+        self.interval = interval or getattr(settings, "ACCESS_LOG_FLUSH_INTERVAL", 5)
+        self.max_entries = max_entries or getattr(
+            settings, "ACCESS_LOG_MAX_BUFFER", 10000
+        )
+        self._entries = []
+        self._lock = threading.Lock()
+        self._started = None
+        # After a failed write, nothing is written again before this time.
+        self._retry_at = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _due(self):
+        now = time.monotonic()
+        return (
+            bool(self._entries)
+            and now >= self._retry_at
+            and (
+                len(self._entries) >= self.size or now - self._started >= self.interval
+            )
+        )
+
+    def _trim(self):
+        # Called with the lock held; returns how many entries were dropped.
+        dropped = len(self._entries) - self.max_entries
+        if dropped <= 0:
+            return 0
+        del self._entries[:dropped]
+        return dropped
+
+    def _log_dropped(self, dropped):
+        if dropped:
+            logger.warning(
+                "Access log buffer full; dropped the %s oldest entries", dropped
+            )
+
+    def add(self, entry):
+        with self._lock:
+            if not self._entries:
+                self._started = time.monotonic()
+            self._entries.append(entry)
+            dropped = self._trim()
+            due = self._due()
+        self._log_dropped(dropped)
+        if due:
+            self.flush()
+
+    def flush_if_due(self):
+        """Write the buffer if it is full or its oldest entry waited long enough."""
+        with self._lock:
+            due = self._due()
+        return self.flush() if due else 0
+
+    def _take(self):
+        with self._lock:
+            entries, self._entries = self._entries, []
+        return entries
+
+    def flush(self):
+        """
+        Write every buffered entry; returns how many were written. Entries
+        that can't be written are kept, ahead of newer ones, up to
+        ``max_entries``.
+        """
+        entries = self._take()
+        if not entries:
+            return 0
+        try:
+            # A savepoint, so a failure doesn't break the caller's transaction.
+            with transaction.atomic():
+                AccessLog.objects.bulk_create(entries)
+        except DatabaseError:
+            # Access logs are best effort: never fail a request over them.
+            logger.exception(
+                "Could not write %s access log entries; retrying in %ss",
+                len(entries),
+                self.interval,
+            )
+            with self._lock:
+                self._entries[:0] = entries
+                self._started = time.monotonic()
+                self._retry_at = self._started + self.interval
+                dropped = self._trim()
+            self._log_dropped(dropped)
+            return 0
+        return len(entries)
+
+
+buffer = AccessLogBuffer()
+atexit.register(buffer.flush)
+
+
+def _request_finished(sender, **kwargs):
+    if buffer.flush_if_due():
+        # Django closes expired connections before this runs; don't keep
+        # open the one the flush may have reconnected.
+        close_old_connections()
+
+
+def log_access(request, usage, user=None):
+    """
+    Record one access by ``user`` (default: the request's user) and mark the
+    request so ``AccessLogMiddleware`` doesn't record it again.
+    """
+    if user is None:
+        user = getattr(request, "user", None)
+    ua = request.META.get("HTTP_USER_AGENT", "")[:2000]
+    os_family, browser = parse_user_agent(ua)
+    buffer.add(
+        AccessLog(
+            # ``pk`` only, so a user built from token claims stays unloaded.
+            login_id=user.pk if user is not None and user.is_authenticated else None,
+            ua=ua,
+            date=timezone.now(),
+            ip=client_ip(request),
+            usage=usage[:255],
+            os=os_family,
+            browser=browser,
+        )
+    )
+    # DRF passes its own Request; the middleware sees the wrapped one.
+    getattr(request, "_request", request).access_logged = True
@@ -3,3 +3,57 @@ from django.apps import AppConfig
 
 class AdministrationConfig(AppConfig):
     name = 'administration'
+
+    def ready(self):
+        from django.core.signals import request_finished
+        from django.db.models.signals import post_delete, post_save, pre_save
+
+        from users.models import CustomUser
+        from .access_log import _request_finished
+        from .article_search import _article_deleted, _article_saved
+        from .cache import reference_cache, track_model_versions
+        from .front_page import _author_saved, _author_saving, _content_changed
+        from .images import _image_saved, image_models
+        from .models import AcademicYear, Article, CarouselImage, Term
+
+        reference_cache.register(AcademicYear)
+        # Term names repeat across years, so terms are only looked up by id.
+        reference_cache.register(Term, lookup_field=None, select_related=["academic_year"])
+
+        # Thumbnails and WebP variants are rendered after images are uploaded
+        for model, _ in image_models():
+            label = model._meta.label_lower
+            post_save.connect(
+                _image_saved, sender=model, dispatch_uid=f"images-{label}-save"
+            )
+
+        # The public front page is cached per version of what it shows, and
+        # rebuilt as soon as articles, carousel images or authors' names change.
+        track_model_versions(Article, CarouselImage)
+        for model in (Article, CarouselImage):
+            label = model._meta.label_lower
+            post_save.connect(
+                _content_changed, sender=model, dispatch_uid=f"frontpage-{label}-save"
+            )
+            post_delete.connect(
+                _content_changed, sender=model, dispatch_uid=f"frontpage-{label}-delete"
+            )
+        pre_save.connect(
+            _author_saving, sender=CustomUser, dispatch_uid="frontpage-author-saving"
+        )
+        post_save.connect(
+            _author_saved, sender=CustomUser, dispatch_uid="frontpage-author-saved"
+        )
+
+        # Article search indexes follow every save and delete
+        post_save.connect(
+            _article_saved, sender=Article, dispatch_uid="search-article-save"
+        )
+        post_delete.connect(
+            _article_deleted, sender=Article, dispatch_uid="search-article-delete"
+        )
+
+        # Buffered access logs are written once a request finishes
+        request_finished.connect(
+            _request_finished, dispatch_uid="access-log-request-finished"
+        )
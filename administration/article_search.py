@@ -0,0 +1,249 @@
+"""
+Full-text search over articles.
+
+On PostgreSQL every article stores a weighted ``tsvector`` of its title (A)
+and content (B) in ``Article.search_vector``, refreshed after each save and
+GIN-indexed (``Article.Meta.indexes``), so matching and ranking read the index rather
+than every article's text. Local SQLite databases get the same through an
+FTS5 table, ``administration_article_fts``, kept in step by the same
+signals. Other databases fall back to ``icontains``.
+
+Searches return hits (id, rank, highlighted title and a snippet of the
+content with matches wrapped in ``<mark>``) from an object the paginator
+can count and slice, so only one page of hits is ever highlighted. The
+database marks matches with control characters; the text is HTML-escaped
+before they are turned into ``<mark>`` tags, so article text can't inject
+markup into the public search page.
+"""
+
+import re
+
+from django.contrib.postgres.search import (
+    SearchHeadline,
+    SearchQuery,
+    SearchRank,
+    SearchVector,
+)
+from django.db import connection
+from django.db.models import F, Q
+from django.utils.html import escape
+
+from .models import Article
+from .serializers import SHORT_CONTENT_LENGTH, ArticleSummaryRowSerializer
+
+CONFIG = "english"
+FTS_TABLE = "administration_article_fts"
+# What the database wraps matches in, and the tags they become.
+START_SEL = "\x02"
+STOP_SEL = "\x03"
+START_MARK = "<mark>"
+STOP_MARK = "</mark>"
+# Approximate length of content snippets, in words.
+SNIPPET_WORDS = 32
+# On SQLite, a match in the title counts this many times one in the content.
+TITLE_WEIGHT = 10.0
+
+
+def article_vector():
+    return SearchVector("title", weight="A", config=CONFIG) + SearchVector(
+        "content", weight="B", config=CONFIG
+    )
+
+
+def index_article(article):
+    """Bring the search index of one article up to date."""
+    if connection.vendor == "postgresql":
+        Article.objects.filter(pk=article.pk).update(search_vector=article_vector())
+    elif connection.vendor == "sqlite":
+        with connection.cursor() as cursor:
+            cursor.execute(f"DELETE FROM {FTS_TABLE} WHERE rowid = %s", [article.pk])
+            cursor.execute(
+                f"INSERT INTO {FTS_TABLE} (rowid, title, content) VALUES (%s, %s, %s)",
+                [article.pk, article.title or "", article.content or ""],
+            )
+
+
+def unindex_article(article):
+    if connection.vendor == "sqlite":
+        with connection.cursor() as cursor:
+            cursor.execute(f"DELETE FROM {FTS_TABLE} WHERE rowid = %s", [article.pk])
+
+
+def rebuild_search_index():
+    """
+    Index every article again, e.g. after ``bulk_create()``, which sends no
+    signals.
+    """
+    if connection.vendor == "postgresql":
+        Article.objects.update(search_vector=article_vector())
+    elif connection.vendor == "sqlite":
+        with connection.cursor() as cursor:
+            cursor.execute(f"DELETE FROM {FTS_TABLE}")
+            cursor.execute(
+                f"INSERT INTO {FTS_TABLE} (rowid, title, content) "
+                "SELECT id, coalesce(title, ''), coalesce(content, '') "
+                "FROM administration_article"
+            )
+
+
+def _article_saved(sender, instance, raw=False, **kwargs):
+    if not raw:
+        index_article(instance)
+
+
+def _article_deleted(sender, instance, **kwargs):
+    unindex_article(instance)
+
+
+def marked(text):
+    """``text`` as HTML, with the database's match markers as ``<mark>`` tags."""
+    text = escape(text or "")
+    return text.replace(START_SEL, START_MARK).replace(STOP_SEL, STOP_MARK)
+
+
+def _marked_hit(hit):
+    return {
+        **hit,
+        "highlighted_title": marked(hit["highlighted_title"]),
+        "snippet": marked(hit["snippet"]),
+    }
+
+
+class PostgresSearch:
+    def __init__(self, text):
+        query = SearchQuery(text, search_type="websearch", config=CONFIG)
+        self.hits = (
+            Article.objects.filter(search_vector=query)
+            .annotate(
+                rank=SearchRank(F("search_vector"), query),
+                highlighted_title=SearchHeadline(
+                    "title",
+                    query,
+                    config=CONFIG,
+                    start_sel=START_SEL,
+                    stop_sel=STOP_SEL,
+                    highlight_all=True,
+                ),
+                snippet=SearchHeadline(
+                    "content",
+                    query,
+                    config=CONFIG,
+                    start_sel=START_SEL,
+                    stop_sel=STOP_SEL,
+                    max_words=SNIPPET_WORDS,
+                    min_words=SNIPPET_WORDS // 2,
+                ),
+            )
+            .order_by("-rank", "-created_at", "-id")
+            .values("id", "rank", "highlighted_title", "snippet")
+        )
+
+    def count(self):
+        return self.hits.count()
+
+    def __getitem__(self, index):
+        return [_marked_hit(hit) for hit in self.hits[index]]
+
+
+def fts_query(text):
+    """An FTS5 query matching every word of ``text``, free of FTS5 syntax."""
+    return " ".join(f'"{word}"' for word in re.findall(r"\w+", text))
+
+
+class SQLiteSearch:
+    def __init__(self, text):
+        self.query = fts_query(text)
+
+    def count(self):
+        if not self.query:
+            return 0
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"SELECT count(*) FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s",
+                [self.query],
+            )
+            return cursor.fetchone()[0]
+
+    def __getitem__(self, index):
+        if not self.query:
+            return []
+        with connection.cursor() as cursor:
+            # bm25() is lower for better matches.
+            cursor.execute(
+                f"SELECT rowid, -bm25({FTS_TABLE}, %s, 1.0), "
+                f"highlight({FTS_TABLE}, 0, %s, %s), "
+                f"snippet({FTS_TABLE}, 1, %s, %s, '…', %s) "
+                f"FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s "
+                f"ORDER BY bm25({FTS_TABLE}, %s, 1.0), rowid DESC "
+                "LIMIT %s OFFSET %s",
+                [
+                    TITLE_WEIGHT,
+                    START_SEL,
+                    STOP_SEL,
+                    START_SEL,
+                    STOP_SEL,
+                    SNIPPET_WORDS,
+                    self.query,
+                    TITLE_WEIGHT,
+                    index.stop - index.start,
+                    index.start,
+                ],
+            )
+            return [
+                _marked_hit(
+                    {
+                        "id": article_id,
+                        "rank": rank,
+                        "highlighted_title": title,
+                        "snippet": snippet,
+                    }
+                )
+                for article_id, rank, title, snippet in cursor.fetchall()
+            ]
+
+
+class ContainsSearch:
+    """Unranked and unhighlighted, for databases without full-text search."""
+
+    def __init__(self, text):
+        self.hits = (
+            Article.objects.filter(
+                Q(title__icontains=text) | Q(content__icontains=text)
+            )
+            .order_by("-created_at", "-id")
+            .values("id", "title", "content")
+        )
+
+    def count(self):
+        return self.hits.count()
+
+    def __getitem__(self, index):
+        return [
+            {
+                "id": row["id"],
+                "rank": None,
+                "highlighted_title": escape(row["title"] or ""),
+                "snippet": escape((row["content"] or "")[:SHORT_CONTENT_LENGTH]),
+            }
+            for row in self.hits[index]
+        ]
+
+
+def search_articles(text):
+    """Return the hits of ``text``, best first, as a countable, sliceable object."""
+    if connection.vendor == "postgresql":
+        return PostgresSearch(text)
+    if connection.vendor == "sqlite":
+        return SQLiteSearch(text)
+    return ContainsSearch(text)
+
+
+def with_summaries(hits):
+    """Add each hit's article summary (author, thumbnail, ...) in one query."""
+    summaries = {
+        row["id"]: row
+        for row in ArticleSummaryRowSerializer().data(
+            Article.objects.filter(pk__in=[hit["id"] for hit in hits])
+        )
+    }
+    return [{**summaries[hit["id"]], **hit} for hit in hits if hit["id"] in summaries]
@@ -0,0 +1,258 @@
+"""
+Per-process reference-data cache for small lookup tables.
+
+Tables such as ClassLevel, Stream, Subject or AttendanceStatus change a few
+times a year but are resolved on nearly every request. Registered models are
+hydrated in bulk (one query per table) and kept in Django's cache framework
+under versioned keys, with a per-process copy on top so repeated lookups in
+the same worker don't even unpickle. Saving or deleting a row bumps the
+model version, which makes every worker rebuild on its next lookup.
+
+Checking the version costs a cache round trip, so a worker only checks it
+once every ``ReferenceCache.version_ttl`` seconds; serializing a list of
+rows doesn't pay one per row. Changes made in the same worker are seen at
+once, other workers' changes within that many seconds.
+"""
+
+import threading
+import time
+
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
+from django.db.models.signals import m2m_changed, post_delete, post_save
+
+VERSION_KEY = "refdata:version:{label}"
+DATA_KEY = "refdata:data:{label}:{version}"
+
+
+def _normalize(value):
+    if value is None:
+        return None
+    return str(value).strip().casefold()
+
+
+def get_version(key):
+    """
+    Return the version stored under ``key``.
+
+    Versions are millisecond timestamps so they also tell us when the data
+    last changed. A missing key (fresh or evicted cache) is seeded with the
+    current time, which can never collide with an older cached version.
+    """
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, int(time.time() * 1000), timeout=None)
+        version = cache.get(key)
+    return version
+
+
+def bump_version(key):
+    """Mark the data versioned under ``key`` as stale."""
+    now = int(time.time() * 1000)
+    try:
+        version = cache.incr(key)
+        if version < now:
+            cache.set(key, now, timeout=None)
+    except ValueError:
+        # Key missing or evicted: start again from the current time.
+        cache.set(key, now, timeout=None)
+
+
+def get_model_version(model):
+    """Return the current version of a model's data."""
+    return get_version(VERSION_KEY.format(label=model._meta.label_lower))
+
+
+def bump_model_version(model):
+    """Mark a model's cached data as stale."""
+    bump_version(VERSION_KEY.format(label=model._meta.label_lower))
+
+
+def _bump_on_change(sender, **kwargs):
+    bump_model_version(sender)
+
+
+def track_model_versions(*models):
+    """Bump a model's version whenever one of its rows is saved or deleted."""
+    for model in models:
+        post_save.connect(
+            _bump_on_change,
+            sender=model,
+            dispatch_uid=f"refdata-save-{model._meta.label_lower}",
+        )
+        post_delete.connect(
+            _bump_on_change,
+            sender=model,
+            dispatch_uid=f"refdata-delete-{model._meta.label_lower}",
+        )
+
+
+def _bump_on_m2m_change(sender, action, **kwargs):
+    if action in ("post_add", "post_remove", "post_clear"):
+        bump_model_version(sender)
+
+
+def track_m2m_versions(*through_models):
+    """
+    Bump a many-to-many ``through`` model's version when links are added,
+    removed or cleared with ``add()``, ``remove()``, ``set()`` or ``clear()``.
+    """
+    for model in through_models:
+        m2m_changed.connect(
+            _bump_on_m2m_change,
+            sender=model,
+            dispatch_uid=f"refdata-m2m-{model._meta.label_lower}",
+        )
+
+
+class ReferenceTable:
+    """A hydrated copy of one reference table."""
+
+    def __init__(self, version, rows, lookup_field):
+        self.version = version
+        self.checked_at = time.monotonic()
+        self.by_id = {}
+        self.by_name = {}
+        for row in rows:
+            self.by_id[row.pk] = row
+            if lookup_field:
+                name = _normalize(getattr(row, lookup_field))
+                # Keep the first row when names repeat (e.g. streams).
+                self.by_name.setdefault(name, row.pk)
+
+
+class ReferenceCache:
+    """
+    Resolve reference-data names and ids without hitting the database.
+
+    Usage::
+
+        reference_cache.register(ClassLevel)
+        reference_cache.get(ClassLevel, 3)
+        reference_cache.get_by_name(Stream, "a")
+        reference_cache.name_of(ClassLevel, classroom.name_id)
+    """
+
+    timeout = 60 * 60 * 24
+    # Seconds a worker trusts its copy before checking the version again.
+    version_ttl = 2
+
+    def __init__(self):
+        self._registry = {}
+        self._local = {}
+        self._lock = threading.Lock()
+
+    def register(self, model, lookup_field="name", select_related=()):
+        """
+        Register a model as reference data.
+
+        ``lookup_field`` is the column used by ``get_by_name``; pass ``None``
+        for tables without a unique name. ``select_related`` lets cached
+        instances render ``__str__`` without extra queries.
+        """
+        self._registry[model] = (lookup_field, tuple(select_related))
+        track_model_versions(model)
+        for dependency in self._dependencies(model):
+            label = dependency._meta.label_lower
+            post_save.connect(
+                self._forget,
+                sender=dependency,
+                dispatch_uid=f"refdata-local-save-{label}",
+            )
+            post_delete.connect(
+                self._forget,
+                sender=dependency,
+                dispatch_uid=f"refdata-local-delete-{label}",
+            )
+
+    def is_registered(self, model):
+        return model in self._registry
+
+    def _dependencies(self, model):
+        # Related rows are cached too, so their changes must invalidate us.
+        select_related = self._registry[model][1]
+        return [model] + [
+            model._meta.get_field(name).related_model for name in select_related
+        ]
+
+    def _forget(self, sender, **kwargs):
+        """Drop this worker's copies of the tables that show ``sender``."""
+        with self._lock:
+            for model in list(self._local):
+                if sender in self._dependencies(model):
+                    del self._local[model]
+
+    def _table(self, model):
+        if model not in self._registry:
+            raise KeyError(f"{model._meta.label} is not registered as reference data.")
+
+        table = self._local.get(model)
+        now = time.monotonic()
+        if table is not None and now - table.checked_at < self.version_ttl:
+            return table
+
+        lookup_field, select_related = self._registry[model]
+        version = "-".join(str(get_model_version(m)) for m in self._dependencies(model))
+        if table is not None and table.version == version:
+            table.checked_at = now
+            return table
+
+        key = DATA_KEY.format(label=model._meta.label_lower, version=version)
+        rows = cache.get(key)
+        if rows is None:
+            queryset = model._default_manager.all()
+            if select_related:
+                queryset = queryset.select_related(*select_related)
+            rows = list(queryset)
+            cache.set(key, rows, timeout=self.timeout)
+
+        table = ReferenceTable(version, rows, lookup_field)
+        with self._lock:
+            self._local[model] = table
+        return table
+
+    def all(self, model):
+        """Return every cached row, in the model's default ordering."""
+        return list(self._table(model).by_id.values())
+
+    def get(self, model, pk):
+        """Return the cached instance with primary key ``pk``, or ``None``."""
+        if pk is None:
+            return None
+        table = self._table(model)
+        try:
+            return table.by_id.get(model._meta.pk.to_python(pk))
+        except (TypeError, ValueError, ValidationError):
+            return None
+
+    def get_by_name(self, model, name):
+        """Return the cached instance whose lookup field matches ``name``, or ``None``."""
+        table = self._table(model)
+        pk = table.by_name.get(_normalize(name))
+        return table.by_id.get(pk) if pk is not None else None
+
+    def id_for(self, model, name):
+        instance = self.get_by_name(model, name)
+        return instance.pk if instance else None
+
+    def name_of(self, model, pk):
+        """Return the display name (usually ``name``) for ``pk``, or ``None``."""
+        instance = self.get(model, pk)
+        if instance is None:
+            return None
+        lookup_field = self._registry[model][0]
+        if lookup_field is None:
+            return str(instance)
+        return getattr(instance, lookup_field)
+
+    def invalidate(self, model):
+        """
+        Drop the cached copy of ``model``.
+
+        Needed after ``bulk_create``/``update``, which don't send signals.
+        """
+        bump_model_version(model)
+        self._forget(model)
+
+
+reference_cache = ReferenceCache()
@@ -0,0 +1,103 @@
+"""
+Resolve the "current academic context": the active AcademicYear and Term.
+
+The answer only changes on a term boundary or when an admin edits years or
+terms, so it is cached until the next boundary date and keyed on the
+AcademicYear/Term versions kept by the reference cache.
+"""
+
+from datetime import timedelta
+
+from django.core.cache import cache
+from django.utils import timezone
+
+from .cache import get_model_version, reference_cache
+from .models import AcademicYear, Term
+
+CONTEXT_KEY = "academic_context:{years}-{terms}"
+
+
+class AcademicContext:
+    """The active academic year and the term running today (either may be None)."""
+
+    def __init__(self, academic_year=None, term=None):
+        self.academic_year = academic_year
+        self.term = term
+
+    def __repr__(self):
+        return f"<AcademicContext year={self.academic_year} term={self.term}>"
+
+
+def _resolve(today):
+    """
+    Work out (year_id, term_id, valid_until) for ``today``.
+
+    Uses the reference cache, so this costs no queries once it is warm.
+    """
+    years = reference_cache.all(AcademicYear)
+    terms = reference_cache.all(Term)
+
+    academic_year = next((year for year in years if year.active_year), None)
+    if academic_year is None:
+        academic_year = next(
+            (
+                year
+                for year in years
+                if year.start_date <= today
+                and (year.end_date is None or today <= year.end_date)
+            ),
+            None,
+        )
+
+    running = sorted(
+        (term for term in terms if term.start_date <= today <= term.end_date),
+        key=lambda term: term.start_date,
+    )
+    term = None
+    if academic_year is not None:
+        term = next(
+            (t for t in running if t.academic_year_id == academic_year.pk), None
+        )
+    if term is None and running:
+        term = running[0]
+    if academic_year is None and term is not None:
+        academic_year = term.academic_year
+
+    # The answer stays valid until the next day any term or year starts or ends.
+    boundaries = [term.start_date for term in terms]
+    boundaries += [term.end_date + timedelta(days=1) for term in terms]
+    boundaries += [year.start_date for year in years]
+    boundaries += [year.end_date + timedelta(days=1) for year in years if year.end_date]
+    upcoming = [boundary for boundary in boundaries if boundary > today]
+    valid_until = min(upcoming) if upcoming else today + timedelta(days=1)
+
+    return (
+        academic_year.pk if academic_year else None,
+        term.pk if term else None,
+        valid_until,
+    )
+
+
+def get_academic_context(today=None):
+    """
+    Return the AcademicContext for ``today`` (defaults to the current date).
+    """
+    use_cache = today is None
+    today = today or timezone.localdate()
+
+    key = CONTEXT_KEY.format(
+        years=get_model_version(AcademicYear), terms=get_model_version(Term)
+    )
+    cached = cache.get(key) if use_cache else None
+    if cached is not None and cached[2] <= today < cached[3]:
+        year_id, term_id = cached[0], cached[1]
+    else:
+        year_id, term_id, valid_until = _resolve(today)
+        if use_cache:
+            timeout = (valid_until - today).days * 24 * 60 * 60
+            cache.set(key, (year_id, term_id, today, valid_until), timeout=timeout)
+
+    return AcademicContext(
+        academic_year=reference_cache.get(AcademicYear, year_id),
+        term=reference_cache.get(Term, term_id),
+    )
@@ -0,0 +1,94 @@
+"""
+Public front-page content.
+
+The landing page shows article summaries and the carousel to anonymous
+visitors. Each is built with one ``values()`` query (the author's name is
+joined in rather than serialized through ``UserSerializer``) and cached
+under the versions of the models it shows. The payloads are rebuilt as
+soon as an article or carousel image change commits, so visitors are
+answered from the cache rather than by the first request after an edit.
+Users are not versioned with the articles, since most user saves (logins,
+profile edits) don't touch the front page; renaming an article's author
+bumps the article version instead.
+"""
+
+from functools import partial
+
+from django.core.cache import cache
+from django.db import transaction
+
+from .cache import bump_model_version, get_model_version
+from .models import Article, CarouselImage
+from .serializers import ArticleSummaryRowSerializer, CarouselSlideRowSerializer
+
+DATA_KEY = "frontpage:{name}:{version}"
+CACHE_TIMEOUT = 60 * 60 * 24
+
+# Every model each payload shows; the first is the one it lists.
+ARTICLE_MODELS = (Article,)
+# The author fields article summaries show.
+AUTHOR_FIELDS = ("first_name", "last_name")
+CAROUSEL_MODELS = (CarouselImage,)
+
+
+def _version(models):
+    return "-".join(str(get_model_version(model)) for model in models)
+
+
+def _cached(name, models, build, rebuild=False):
+    key = DATA_KEY.format(name=name, version=_version(models))
+    data = None if rebuild else cache.get(key)
+    if data is None:
+        data = build()
+        cache.set(key, data, timeout=CACHE_TIMEOUT)
+    return data
+
+
+def article_summaries(rebuild=False):
+    """Every article, newest first, as shown on the front page."""
+    return _cached(
+        "articles",
+        ARTICLE_MODELS,
+        lambda: ArticleSummaryRowSerializer().data(
+            Article.objects.order_by("-created_at", "-id")
+        ),
+        rebuild,
+    )
+
+
+def carousel_slides(rebuild=False):
+    """Every carousel image, in upload order."""
+    return _cached(
+        "carousel",
+        CAROUSEL_MODELS,
+        lambda: CarouselSlideRowSerializer().data(CarouselImage.objects.order_by("id")),
+        rebuild,
+    )
+
+
+def _content_changed(sender, **kwargs):
+    rebuild = article_summaries if sender is Article else carousel_slides
+    transaction.on_commit(partial(rebuild, rebuild=True))
+
+
+def _author_saving(sender, instance, update_fields=None, **kwargs):
+    # The name articles show now, or ``None`` if the user wrote none.
+    instance._article_author_name = None
+    if instance.pk is None or (
+        update_fields is not None and not set(AUTHOR_FIELDS) & set(update_fields)
+    ):
+        return
+    instance._article_author_name = (
+        Article.objects.filter(created_by_id=instance.pk)
+        .values_list(*(f"created_by__{field}" for field in AUTHOR_FIELDS))
+        .first()
+    )
+
+
+def _author_saved(sender, instance, **kwargs):
+    shown = instance.__dict__.pop("_article_author_name", None)
+    if shown is None:
+        return
+    if shown != tuple(getattr(instance, field) for field in AUTHOR_FIELDS):
+        bump_model_version(Article)
+        transaction.on_commit(partial(article_summaries, rebuild=True))
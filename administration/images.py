@@ -0,0 +1,143 @@
+"""
+Thumbnails and WebP variants of uploaded images.
+
+Every image field listed in ``IMAGE_FIELDS`` has two companions on its
+model, ``<field>_thumbnail`` and ``<field>_webp``. When an instance is saved
+with an image whose variants don't exist yet, rendering is queued once the
+transaction commits and runs on a small thread pool, so uploads return as
+soon as the original is stored. Variants are written next to the original:
+
+    Student_images/photo.png
+    Student_images/thumbnails/photo.png.jpg
+    Student_images/webp/photo.png.webp
+
+Workers record the variants with ``QuerySet.update()``, which neither fires
+signals nor overwrites fields saved in the meantime, and only if the image
+is still the one they rendered. ``generate_image_variants`` renders the
+variants of images uploaded before, or while the pool was not running.
+"""
+
+import logging
+import posixpath
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+
+from django.apps import apps
+from django.conf import settings
+from django.db import close_old_connections, connections, transaction
+
+from .cache import bump_model_version
+from .image_renderer import render_variants
+
+logger = logging.getLogger(__name__)
+
+IMAGE_FIELDS = {
+    "academic.Teacher": ("image",),
+    "academic.Parent": ("image",),
+    "academic.Student": ("image",),
+    "administration.Article": ("picture",),
+    "administration.CarouselImage": ("picture",),
+    "administration.School": ("school_logo",),
+}
+
+
+def image_models():
+    """Yield ``(model, field names)`` for every model with image variants."""
+    for label, fields in IMAGE_FIELDS.items():
+        yield apps.get_model(label), fields
+
+
+def variant_names(name):
+    """The storage names of the thumbnail and WebP variant of image ``name``."""
+    directory, filename = posixpath.split(name)
+    return (
+        posixpath.join(directory, "thumbnails", f"{filename}.jpg"),
+        posixpath.join(directory, "webp", f"{filename}.webp"),
+    )
+
+
+def variant_fields(field):
+    return f"{field}_thumbnail", f"{field}_webp"
+
+
+def record_variants(model, pk, field, name):
+    """
+    Store the variant names of image ``name`` on instance ``pk``, unless its
+    image was replaced since. Returns whether they were stored.
+    """
+    thumbnail_field, webp_field = variant_fields(field)
+    thumbnail, webp = variant_names(name)
+    updated = model.objects.filter(pk=pk, **{field: name}).update(
+        **{thumbnail_field: thumbnail, webp_field: webp}
+    )
+    if updated:
+        # ``update()`` sends no signals; responses cached per model version
+        # (see ``api.http_cache``) must still pick up the new URLs.
+        bump_model_version(model)
+    return bool(updated)
+
+
+def render_image(model, pk, field, name):
+    """Render and record the variants of image ``name`` of instance ``pk``."""
+    storage = model._meta.get_field(field).storage
+    thumbnail, webp = variant_names(name)
+    render_variants(storage.path(name), storage.path(thumbnail), storage.path(webp))
+    return record_variants(model, pk, field, name)
+
+
+def _render_in_background(model, pk, field, name):
+    close_old_connections()
+    try:
+        render_image(model, pk, field, name)
+    except Exception:
+        # The original stays usable; the backfill command can retry later.
+        logger.exception("Could not render the variants of %s", name)
+    finally:
+        # Pool threads have their own connections; don't leak them.
+        connections.close_all()
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def _get_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ThreadPoolExecutor(
+                max_workers=getattr(settings, "IMAGE_VARIANT_WORKERS", 2),
+                thread_name_prefix="image-variants",
+            )
+    return _pool
+
+
+def queue_render(model, pk, field, name):
+    """
+    Render in the background, or right away when ``IMAGE_VARIANT_WORKERS``
+    is 0.
+    """
+    if getattr(settings, "IMAGE_VARIANT_WORKERS", 2) == 0:
+        render_image(model, pk, field, name)
+    else:
+        _get_pool().submit(_render_in_background, model, pk, field, name)
+
+
+def _image_saved(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    model = type(instance)
+    for field in IMAGE_FIELDS[model._meta.label]:
+        name = getattr(instance, field).name
+        thumbnail_field, webp_field = variant_fields(field)
+        if not name:
+            if getattr(instance, thumbnail_field) or getattr(instance, webp_field):
+                cleared = {thumbnail_field: "", webp_field: ""}
+                model.objects.filter(pk=instance.pk).update(**cleared)
+                for attribute, value in cleared.items():
+                    setattr(instance, attribute, value)
+        elif getattr(instance, thumbnail_field).name != variant_names(name)[0]:
+            transaction.on_commit(
+                partial(queue_render, model, instance.pk, field, name)
+            )
@@ -0,0 +1,94 @@
+import statistics
+import time
+
+from django.core.handlers.wsgi import WSGIHandler
+from django.core.management.base import BaseCommand
+from django.db import connections
+from django.test import RequestFactory
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure per-request latency with a fresh database connection per request "
+        "versus persistent connections (with and without health checks)."
+    )
+
+    modes = (
+        (
+            "new connection per request",
+            {"CONN_MAX_AGE": 0, "CONN_HEALTH_CHECKS": False},
+        ),
+        (
+            "persistent connections",
+            {"CONN_MAX_AGE": 600, "CONN_HEALTH_CHECKS": False},
+        ),
+        (
+            "persistent connections + health checks",
+            {"CONN_MAX_AGE": 600, "CONN_HEALTH_CHECKS": True},
+        ),
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--path",
+            default="/api/sis/students/",
+            help="Endpoint to request (default: /api/sis/students/).",
+        )
+        parser.add_argument(
+            "--requests", type=int, default=200, help="Requests per mode."
+        )
+        parser.add_argument(
+            "--token", default="", help="Optional JWT access token to send."
+        )
+
+    def handle(self, *args, **options):
+        handler = WSGIHandler()
+        factory = RequestFactory()
+        extra = {"HTTP_HOST": "localhost"}
+        if options["token"]:
+            extra["HTTP_AUTHORIZATION"] = f"Bearer {options['token']}"
+
+        def start_response(status, headers):
+            pass
+
+        database = connections["default"]
+        self.stdout.write(
+            f"{database.vendor} | {options['path']} | "
+            f"{options['requests']} requests per mode"
+        )
+
+        results = {}
+        for label, overrides in self.modes:
+            connections.close_all()
+            database.settings_dict.update(overrides)
+
+            timings = []
+            # One warm-up request so imports and caches don't skew the first sample.
+            for i in range(options["requests"] + 1):
+                environ = factory.get(options["path"], **extra).environ
+                started = time.perf_counter()
+                response = handler(environ, start_response)
+                b"".join(response)
+                # Closing the response fires request_finished, which is where
+                # Django closes (or keeps) the connection.
+                response.close()
+                if i:
+                    timings.append((time.perf_counter() - started) * 1000)
+
+            timings.sort()
+            results[label] = statistics.mean(timings)
+            self.stdout.write(
+                f"{label:<42} mean {statistics.mean(timings):7.2f} ms"
+                f"  p50 {timings[len(timings) // 2]:7.2f} ms"
+                f"  p95 {timings[int(len(timings) * 0.95) - 1]:7.2f} ms"
+            )
+
+        connections.close_all()
+        baseline = results[self.modes[0][0]]
+        for label, mean in list(results.items())[1:]:
+            self.stdout.write(
+                self.style.SUCCESS(
+                    f"{label}: {baseline - mean:.2f} ms saved per request "
+                    f"({(baseline - mean) / baseline * 100:.1f}%)"
+                )
+            )
@@ -0,0 +1,116 @@
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+
+from administration.image_renderer import render_variants
+from administration.images import (
+    IMAGE_FIELDS,
+    image_models,
+    record_variants,
+    variant_fields,
+    variant_names,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Render the thumbnails and WebP variants of uploaded images that don't "
+        "have them yet, in a pool of processes."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--model",
+            action="append",
+            choices=sorted(IMAGE_FIELDS),
+            help="Only this model (may be repeated).",
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            help="Rendering processes (default: one per CPU; 1 disables the pool).",
+        )
+        parser.add_argument(
+            "--force",
+            action="store_true",
+            help="Render every image again, even those with variants.",
+        )
+
+    def handle(self, *args, **options):
+        if options["workers"] is not None and options["workers"] < 1:
+            raise CommandError("--workers must be at least 1.")
+
+        jobs = []
+        missing = 0
+        for model, fields in image_models():
+            if options["model"] and model._meta.label not in options["model"]:
+                continue
+            for field in fields:
+                storage = model._meta.get_field(field).storage
+                thumbnail_field, _ = variant_fields(field)
+                rows = (
+                    model.objects.exclude(**{field: ""})
+                    .exclude(**{f"{field}__isnull": True})
+                    .values_list("pk", field, thumbnail_field)
+                )
+                for pk, name, thumbnail in rows.iterator():
+                    if not options["force"] and thumbnail == variant_names(name)[0]:
+                        continue
+                    source = storage.path(name)
+                    if not os.path.exists(source):
+                        missing += 1
+                        continue
+                    paths = [source] + [
+                        storage.path(variant) for variant in variant_names(name)
+                    ]
+                    jobs.append((model, pk, field, name, paths))
+
+        if missing:
+            self.stdout.write(f"{missing} images are missing from storage; skipped.")
+        if not jobs:
+            self.stdout.write("Every image already has its variants.")
+            return
+
+        started = time.perf_counter()
+        rendered = failed = 0
+        for job, error in self.render(jobs, options["workers"]):
+            model, pk, field, name, _ = job
+            if error is not None:
+                failed += 1
+                self.stderr.write(f"{name}: {error}")
+                continue
+            record_variants(model, pk, field, name)
+            rendered += 1
+            if rendered % 100 == 0:
+                self.stdout.write(f"  {rendered}/{len(jobs)} rendered")
+        elapsed = time.perf_counter() - started
+
+        if failed:
+            self.stdout.write(
+                self.style.WARNING(f"{failed} images could not be rendered.")
+            )
+        self.stdout.write(
+            self.style.SUCCESS(f"{rendered} images rendered in {elapsed:.1f}s.")
+        )
+
+    def render(self, jobs, workers):
+        """Yield ``(job, error)`` for every job as it finishes."""
+        if workers == 1 or len(jobs) == 1:
+            for job in jobs:
+                try:
+                    render_variants(*job[-1])
+                except Exception as error:
+                    yield job, error
+                else:
+                    yield job, None
+            return
+
+        # Workers must not share this process's database connections.
+        connections.close_all()
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = {pool.submit(render_variants, *job[-1]): job for job in jobs}
+            for future in as_completed(futures):
+                yield futures[future], future.exception()
@@ -0,0 +1,118 @@
+import csv
+import gzip
+from datetime import datetime
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from administration.access_log import buffer
+from administration.models import AccessLog
+
+COLUMNS = ("id", "date", "login_id", "ip", "usage", "os", "browser", "ua")
+
+
+def month_start(year, month):
+    return timezone.make_aware(datetime(year, month, 1))
+
+
+def next_month(start):
+    if start.month == 12:
+        return month_start(start.year + 1, 1)
+    return month_start(start.year, start.month + 1)
+
+
+class Command(BaseCommand):
+    help = (
+        "Delete access logs older than the retention period, one month at a "
+        "time, optionally archiving each month to a gzipped CSV first."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--keep-months",
+            type=int,
+            default=6,
+            help="Months to keep, counting the current one (default 6).",
+        )
+        parser.add_argument(
+            "--archive",
+            help="Directory to write access-log-YYYY-MM.csv.gz files to "
+            "before deleting each month.",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=5000,
+            help="Rows deleted per statement (default 5000).",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Only count what would be deleted.",
+        )
+
+    def handle(self, *args, **options):
+        if options["keep_months"] < 1:
+            raise CommandError("--keep-months must be at least 1.")
+        archive = Path(options["archive"]) if options["archive"] else None
+        if archive is not None:
+            archive.mkdir(parents=True, exist_ok=True)
+
+        # Entries still in this process's buffer belong in the table first.
+        buffer.flush()
+
+        today = timezone.localdate()
+        months = today.year * 12 + today.month - 1 - (options["keep_months"] - 1)
+        cutoff = month_start(months // 12, months % 12 + 1)
+
+        oldest = (
+            AccessLog.objects.order_by("date").values_list("date", flat=True).first()
+        )
+        if oldest is None or oldest >= cutoff:
+            self.stdout.write(f"Nothing older than {cutoff:%Y-%m}.")
+            return
+
+        oldest = timezone.localtime(oldest)
+        start = month_start(oldest.year, oldest.month)
+        total = 0
+        while start < cutoff:
+            end = next_month(start)
+            entries = AccessLog.objects.filter(date__gte=start, date__lt=end)
+            if options["dry_run"]:
+                count = entries.count()
+            elif not entries.exists():
+                count = 0
+            else:
+                if archive is not None:
+                    path = archive / f"access-log-{start:%Y-%m}.csv.gz"
+                    self.archive_month(entries, path)
+                count = self.delete_in_batches(entries, options["batch_size"])
+            if count:
+                self.stdout.write(f"{start:%Y-%m}: {count} entries")
+            total += count
+            start = end
+
+        verb = "Would delete" if options["dry_run"] else "Deleted"
+        self.stdout.write(
+            self.style.SUCCESS(f"{verb} {total} entries older than {cutoff:%Y-%m}.")
+        )
+
+    def archive_month(self, entries, path):
+        partial = path.with_suffix(".part")
+        with gzip.open(partial, "wt", newline="") as output:
+            writer = csv.writer(output)
+            writer.writerow(COLUMNS)
+            for row in (
+                entries.order_by("id").values_list(*COLUMNS).iterator(chunk_size=5000)
+            ):
+                writer.writerow(row)
+        partial.replace(path)
+
+    def delete_in_batches(self, entries, batch_size):
+        deleted = 0
+        while True:
+            ids = list(entries.values_list("id", flat=True)[:batch_size])
+            if not ids:
+                return deleted
+            deleted += AccessLog.objects.filter(id__in=ids).delete()[0]
@@ -0,0 +1,70 @@
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+
+from administration.access_analytics import rollup_days
+from administration.access_log import buffer
+from administration.models import AccessLog, AccessRollup
+
+
+class Command(BaseCommand):
+    help = (
+        "Sum access logs into daily rollups for the access dashboards. By "
+        "default every day since the last rollup, up to yesterday; run nightly."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--from", dest="first", help="First day (YYYY-MM-DD).")
+        parser.add_argument("--to", dest="last", help="Last day (YYYY-MM-DD).")
+
+    def parse_day(self, value, option):
+        try:
+            day = parse_date(value)
+        except ValueError:
+            day = None
+        if day is None:
+            raise CommandError(f"{option} must be a date in the YYYY-MM-DD format.")
+        return day
+
+    def handle(self, *args, **options):
+        # Entries still in this process's buffer belong in the rollups too.
+        buffer.flush()
+
+        yesterday = timezone.localdate() - timedelta(days=1)
+        last = self.parse_day(options["last"], "--to") if options["last"] else yesterday
+        if options["first"]:
+            first = self.parse_day(options["first"], "--from")
+        else:
+            latest = (
+                AccessRollup.objects.order_by("-date")
+                .values_list("date", flat=True)
+                .first()
+            )
+            if latest is not None:
+                first = latest + timedelta(days=1)
+            else:
+                oldest = (
+                    AccessLog.objects.order_by("date")
+                    .values_list("date", flat=True)
+                    .first()
+                )
+                if oldest is None:
+                    self.stdout.write("No access logs to roll up.")
+                    return
+                first = timezone.localtime(oldest).date()
+        if first > last:
+            self.stdout.write(f"Rollups are up to date (last day {last}).")
+            return
+
+        started = time.perf_counter()
+        rollups = rollup_days(first, last)
+        elapsed = (time.perf_counter() - started) * 1000
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Rolled up {first} to {last} into {len(rollups)} rows "
+                f"in {elapsed:.1f} ms."
+            )
+        )
@@ -0,0 +1,38 @@
+from django.utils.deprecation import MiddlewareMixin
+from django.utils.functional import SimpleLazyObject
+
+from .access_log import log_access
+from .context import get_academic_context
+
+
+class AcademicContextMiddleware(MiddlewareMixin):
+    """
+    Attach the current academic context to every request as
+    ``request.academic_context``.
+
+    It is resolved lazily, so requests that never look at it pay nothing.
+    """
+
+    def process_request(self, request):
+        request.academic_context = SimpleLazyObject(get_academic_context)
+
+
+class AccessLogMiddleware(MiddlewareMixin):
+    """
+    Record every authenticated API request in the buffered access log.
+
+    Runs on the response, by which time DRF has put the authenticated user
+    on the request. Requests that logged themselves (logins) are skipped.
+    """
+
+    def process_response(self, request, response):
+        user = getattr(request, "user", None)
+        if (
+            request.path.startswith("/api/")
+            and request.method != "OPTIONS"
+            and user is not None
+            and user.is_authenticated
+            and not getattr(request, "access_logged", False)
+        ):
+            log_access(request, f"{request.method} {request.path}")
+        return response
@@ -0,0 +1,42 @@
+import django.utils.timezone
+from django.db import migrations, models
+from user_agents import parse
+
+
+def fill_os_and_browser(apps, schema_editor):
+    """Parse the user agents of existing entries once per distinct string."""
+    AccessLog = apps.get_model("administration", "AccessLog")
+    for ua in list(AccessLog.objects.values_list("ua", flat=True).distinct()):
+        try:
+            user_agent = parse(ua)
+            os_family = user_agent.os.family[:100] or "Unknown"
+            browser = user_agent.browser.family[:100] or "Unknown"
+        except Exception:
+            continue
+        AccessLog.objects.filter(ua=ua).update(os=os_family, browser=browser)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("administration", "0003_alter_term_default_term_fee"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="accesslog",
+            name="browser",
+            field=models.CharField(blank=True, default="Unknown", max_length=100),
+        ),
+        migrations.AddField(
+            model_name="accesslog",
+            name="os",
+            field=models.CharField(blank=True, default="Unknown", max_length=100),
+        ),
+        migrations.AlterField(
+            model_name="accesslog",
+            name="date",
+            field=models.DateTimeField(default=django.utils.timezone.now),
+        ),
+        migrations.RunPython(fill_os_and_browser, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 5.1 on 2026-10-19 02:58
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('administration', '0004_accesslog_os_browser'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AccessRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('dimension', models.CharField(max_length=10)),
+                ('value', models.CharField(blank=True, max_length=100)),
+                ('users', models.PositiveIntegerField(default=0)),
+                ('requests', models.PositiveIntegerField(default=0)),
+                ('logins', models.PositiveIntegerField(default=0)),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('date', 'dimension', 'value'), name='unique_access_rollup')],
+            },
+        ),
+    ]
@@ -0,0 +1,43 @@
+# Generated by Django 5.1 on 2026-10-19 03:01
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('administration', '0005_accessrollup'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='article',
+            name='picture_thumbnail',
+            field=models.ImageField(blank=True, editable=False, max_length=255, upload_to=''),
+        ),
+        migrations.AddField(
+            model_name='article',
+            name='picture_webp',
+            field=models.ImageField(blank=True, editable=False, max_length=255, upload_to=''),
+        ),
+        migrations.AddField(
+            model_name='carouselimage',
+            name='picture_thumbnail',
+            field=models.ImageField(blank=True, editable=False, max_length=255, upload_to=''),
+        ),
+        migrations.AddField(
+            model_name='carouselimage',
+            name='picture_webp',
+            field=models.ImageField(blank=True, editable=False, max_length=255, upload_to=''),
+        ),
+        migrations.AddField(
+            model_name='school',
+            name='school_logo_thumbnail',
+            field=models.ImageField(blank=True, editable=False, max_length=255, upload_to=''),
+        ),
+        migrations.AddField(
+            model_name='school',
+            name='school_logo_webp',
+            field=models.ImageField(blank=True, editable=False, max_length=255, upload_to=''),
+        ),
+    ]
@@ -1,7 +1,9 @@
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
 from django.db import models
 from django.conf import settings
 from datetime import date, datetime
-from user_agents import parse
+from django.utils import timezone
 
 from .common_objs import *
 from users.models import CustomUser
@@ -11,63 +13,58 @@ class Article(models.Model):
     title = models.CharField(max_length=150, blank=True, null=True)
     content = models.TextField(blank=True, null=True)
     picture = models.ImageField(upload_to="articles", blank=True, null=True)
+    picture_thumbnail = models.ImageField(max_length=255, blank=True, editable=False)
+    picture_webp = models.ImageField(max_length=255, blank=True, editable=False)
     created_by = models.ForeignKey(
         CustomUser, on_delete=models.DO_NOTHING, blank=True, null=True
     )
     created_at = models.DateTimeField(auto_now=True)
+    # Weighted title and content on PostgreSQL (see administration.article_search)
+    search_vector = SearchVectorField(null=True, editable=False)
 
     def __str__(self):
         return self.title
 
+    class Meta:
+        indexes = [
+            # Full-text search on PostgreSQL reads this, not every article
+            GinIndex(fields=["search_vector"], name="article_search_gin"),
+        ]
+
 
 class CarouselImage(models.Model):
     title = models.CharField(max_length=150, blank=True, null=True)
     description = models.TextField(blank=True, null=True)
     picture = models.ImageField(upload_to="carousel")
+    picture_thumbnail = models.ImageField(max_length=255, blank=True, editable=False)
+    picture_webp = models.ImageField(max_length=255, blank=True, editable=False)
 
     def __str__(self):
         return self.title
 
 
 class AccessLog(models.Model):
+    """
+    One request or login. Entries are written in batches by
+    ``administration.access_log``, which parses the user agent once into
+    ``os`` and ``browser``.
+    """
+
     login = models.ForeignKey(CustomUser, null=True, on_delete=models.SET_NULL)
     ua = models.CharField(
         max_length=2000,
         help_text="User agent. We can use this to determine operating system and browser in use.",
     )
-    date = models.DateTimeField(
-        auto_now_add=True
-    )  # Set this to add the timestamp on creation only
+    # When the access happened; entries reach the table a few seconds later.
+    date = models.DateTimeField(default=timezone.now)
     ip = models.GenericIPAddressField()
     usage = models.CharField(max_length=255)
+    os = models.CharField(max_length=100, blank=True, default="Unknown")
+    browser = models.CharField(max_length=100, blank=True, default="Unknown")
 
     def __str__(self):
         return f"{self.login} - {self.usage} on {self.date}"
 
-    def os(self):
-        """
-        Extract the operating system from the user agent string.
-        Returns 'Unknown' if it cannot be detected.
-        """
-        try:
-            user_agent = parse(self.ua)
-            return user_agent.os.family
-        except Exception as e:
-            print(f"Error extracting OS from UA: {e}")
-            return "Unknown"
-
-    def browser(self):
-        """
-        Extract the browser from the user agent string.
-        Returns 'Unknown' if it cannot be detected.
-        """
-        try:
-            user_agent = parse(self.ua)
-            return user_agent.browser.family
-        except Exception as e:
-            print(f"Error extracting Browser from UA: {e}")
-            return "Unknown"
-
     class Meta:
         indexes = [
             models.Index(fields=["login"]),  # Add index for faster querying by login
@@ -75,6 +72,34 @@ class AccessLog(models.Model):
         ]
 
 
+class AccessRollup(models.Model):
+    """
+    One day of ``AccessLog`` summed up along one dimension, written by the
+    ``rollup_access_logs`` command so the access dashboards never read the
+    raw logs. ``dimension`` is ``all``, ``role``, ``os``, ``browser`` or
+    ``hour`` and ``value`` the role, OS, browser or hour of the day.
+    """
+
+    DIMENSIONS = ("all", "role", "os", "browser", "hour")
+
+    date = models.DateField()
+    dimension = models.CharField(max_length=10)
+    value = models.CharField(max_length=100, blank=True)
+    users = models.PositiveIntegerField(default=0)
+    requests = models.PositiveIntegerField(default=0)
+    logins = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["date", "dimension", "value"], name="unique_access_rollup"
+            )
+        ]
+
+    def __str__(self):
+        return f"{self.date} {self.dimension}={self.value}"
+
+
 class School(models.Model):
     active = models.BooleanField(
         default=False,
@@ -96,6 +121,10 @@ class School(models.Model):
     telephone = models.CharField(max_length=20, blank=True)
     school_email = models.EmailField(blank=True, null=True)
     school_logo = models.ImageField(blank=True, null=True, upload_to="school_info")
+    school_logo_thumbnail = models.ImageField(
+        max_length=255, blank=True, editable=False
+    )
+    school_logo_webp = models.ImageField(max_length=255, blank=True, editable=False)
 
     def __str__(self):
         return self.name
@@ -1,14 +1,25 @@
 from rest_framework import serializers
+
+from api.rows import Computed, RowSerializer
 from .models import AcademicYear, Term, Article, CarouselImage
 
+SHORT_CONTENT_LENGTH = 200
+
+
+def _short_content(content):
+    return (content or "")[:SHORT_CONTENT_LENGTH]
 
-from users.serializers import UserSerializer
+
+def _author_name(first_name, last_name):
+    # Names only: public pages must not show the author's email.
+    return " ".join(name for name in (first_name, last_name) if name) or None
 
 
 class ArticleSerializer(serializers.ModelSerializer):
     created_by = serializers.SerializerMethodField(read_only=True)
     # created_at = serializers.SerializerMethodField(read_only=True)
     short_content = serializers.SerializerMethodField(read_only=True)
+    thumbnail_url = serializers.ImageField(source="picture_thumbnail", read_only=True)
 
     class Meta:
         model = Article
@@ -18,26 +29,58 @@ class ArticleSerializer(serializers.ModelSerializer):
             "content",
             "short_content",
             "picture",
+            "thumbnail_url",
             "created_at",
             "created_by",
         ]
 
     def get_created_by(self, obj):
         user = obj.created_by
-        serializer = UserSerializer(user, many=False)
-        if serializer.data["first_name"]:
-            return serializer.data["first_name"]
-        return serializer.data["email"]
+        if user is None:
+            return ""
+        return user.first_name or user.email
 
     def get_short_content(self, obj):
-        content = obj.content
-        return content[:200]
+        return _short_content(obj.content)
+
+
+class ArticleSummaryRowSerializer(RowSerializer):
+    """What the public front page shows of an article."""
+
+    model = Article
+    fields = {
+        "id": "id",
+        "title": "title",
+        "short_content": Computed(_short_content, "content"),
+        "picture": "picture",
+        "thumbnail_url": "picture_thumbnail",
+        "created_at": "created_at",
+        "author": Computed(
+            _author_name, "created_by__first_name", "created_by__last_name"
+        ),
+    }
 
 
 class CarouselImageSerializer(serializers.ModelSerializer):
+    thumbnail_url = serializers.ImageField(source="picture_thumbnail", read_only=True)
+
     class Meta:
         model = CarouselImage
-        fields = ["id", "title", "description", "picture"]
+        fields = ["id", "title", "description", "picture", "thumbnail_url"]
+
+
+class CarouselSlideRowSerializer(RowSerializer):
+    """A carousel image on the public front page."""
+
+    model = CarouselImage
+    fields = {
+        "id": "id",
+        "title": "title",
+        "description": "description",
+        "picture": "picture",
+        "thumbnail_url": "picture_thumbnail",
+        "webp_url": "picture_webp",
+    }
 
 
 class AcademicYearSerializer(serializers.ModelSerializer):
@@ -1,3 +1,129 @@
-from django.test import TestCase
+from datetime import date
+from unittest import mock
 
-# Create your tests here.
+from django.contrib.auth.models import AnonymousUser
+from django.db import DatabaseError
+from django.http import HttpResponse
+from django.test import RequestFactory, TestCase
+from django.utils import timezone
+
+from users.models import CustomUser
+from .access_log import AccessLogBuffer
+from .article_search import search_articles
+from .cache import reference_cache
+from .front_page import article_summaries
+from .middleware import AccessLogMiddleware
+from .models import AcademicYear, AccessLog, Article
+
+
+class AccessLogBufferTests(TestCase):
+    def entry(self):
+        return AccessLog(
+            ua="test",
+            date=timezone.now(),
+            ip="127.0.0.1",
+            usage="GET /api/",
+            os="Other",
+            browser="Other",
+        )
+
+    def test_full_batch_is_written_by_the_request_that_fills_it(self):
+        buffer = AccessLogBuffer(size=2, interval=60)
+        buffer.add(self.entry())
+        self.assertEqual(AccessLog.objects.count(), 0)
+        buffer.add(self.entry())
+        self.assertEqual(AccessLog.objects.count(), 2)
+        self.assertEqual(len(buffer), 0)
+
+    def test_failed_batch_is_kept(self):
+        buffer = AccessLogBuffer(size=2, interval=60)
+        with mock.patch.object(
+            AccessLog.objects, "bulk_create", side_effect=DatabaseError
+        ), self.assertLogs("administration.access_log", "ERROR"):
+            buffer.add(self.entry())
+            buffer.add(self.entry())
+        self.assertEqual(len(buffer), 2)
+        # Not retried before the interval has passed.
+        self.assertEqual(buffer.flush_if_due(), 0)
+        self.assertEqual(buffer.flush(), 2)
+        self.assertEqual(AccessLog.objects.count(), 2)
+
+    def test_buffer_drops_the_oldest_entries_beyond_its_maximum(self):
+        buffer = AccessLogBuffer(size=2, interval=60, max_entries=3)
+        entries = [self.entry() for _ in range(5)]
+        with mock.patch.object(
+            AccessLog.objects, "bulk_create", side_effect=DatabaseError
+        ), self.assertLogs("administration.access_log", "WARNING") as logs:
+            for entry in entries:
+                buffer.add(entry)
+        self.assertEqual(buffer._entries, entries[2:])
+        self.assertIn("dropped the 1 oldest entries", "\n".join(logs.output))
+
+    def test_anonymous_requests_are_not_logged(self):
+        request = RequestFactory().get("/api/articles/")
+        request.user = AnonymousUser()
+        with mock.patch("administration.middleware.log_access") as log_access:
+            AccessLogMiddleware(lambda request: HttpResponse())(request)
+        log_access.assert_not_called()
+
+
+class FrontPageTests(TestCase):
+    def setUp(self):
+        self.author = CustomUser.objects.create_user(
+            "author@school.test", "secret", first_name="Amina", last_name="Ally"
+        )
+        Article.objects.create(title="Sports day", created_by=self.author)
+        self.reader = CustomUser.objects.create_user("reader@school.test", "secret")
+
+    def test_unrelated_user_saves_keep_the_cached_page(self):
+        article_summaries()
+        self.reader.first_name = "Neema"
+        self.reader.save()
+        self.author.last_login = timezone.now()
+        self.author.save(update_fields=["last_login"])
+        with self.assertNumQueries(0):
+            article_summaries()
+
+    def test_renaming_an_author_rebuilds_the_page(self):
+        article_summaries()
+        self.author.first_name = "Neema"
+        with self.captureOnCommitCallbacks(execute=True):
+            self.author.save()
+        with self.assertNumQueries(0):
+            summaries = article_summaries()
+        self.assertEqual(summaries[0]["author"], "Neema Ally")
+
+
+class ArticleSearchTests(TestCase):
+    def test_article_text_is_escaped_around_the_marks(self):
+        Article.objects.create(
+            title="<script>alert(1)</script> Sports day",
+            content="Bring <b>water</b> to sports day.",
+        )
+        [hit] = search_articles("sports")[0:10]
+        self.assertEqual(
+            hit["highlighted_title"],
+            "&lt;script&gt;alert(1)&lt;/script&gt; <mark>Sports</mark> day",
+        )
+        self.assertIn("&lt;b&gt;water&lt;/b&gt;", hit["snippet"])
+        self.assertIn("<mark>sports</mark>", hit["snippet"])
+
+
+class ReferenceCacheTests(TestCase):
+    def setUp(self):
+        self.year = AcademicYear.objects.create(
+            name="2026", start_date=date(2026, 1, 1), active_year=True
+        )
+
+    def test_lookups_check_the_version_once(self):
+        reference_cache.name_of(AcademicYear, self.year.pk)
+        with mock.patch("administration.cache.cache.get") as cache_get:
+            for _ in range(10):
+                reference_cache.name_of(AcademicYear, self.year.pk)
+        cache_get.assert_not_called()
+
+    def test_changes_in_this_worker_are_seen_at_once(self):
+        reference_cache.name_of(AcademicYear, self.year.pk)
+        self.year.name = "2026/27"
+        self.year.save()
+        self.assertEqual(reference_cache.name_of(AcademicYear, self.year.pk), "2026/27")
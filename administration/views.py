@@ -1,6 +1,22 @@
-from rest_framework import generics
-from rest_framework.permissions import IsAuthenticated
-from .models import AcademicYear, Term, Article, CarouselImage
+from datetime import timedelta
+
+from django.utils import timezone
+from rest_framework import generics, status
+from rest_framework.pagination import PageNumberPagination
+from rest_framework.permissions import AllowAny, IsAdminUser, IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.views import APIView
+from api.exports import filter_dates
+from api.http_cache import CachedListMixin
+from .access_analytics import client_mix, daily_active_users, login_heatmap
+from .article_search import search_articles, with_summaries
+from .front_page import (
+    ARTICLE_MODELS,
+    CAROUSEL_MODELS,
+    article_summaries,
+    carousel_slides,
+)
+from .models import AcademicYear, AccessRollup, Term, Article, CarouselImage
 from .serializers import (
     AcademicYearSerializer,
     TermSerializer,
@@ -11,13 +27,13 @@ from .serializers import (
 
 # Article Views
 class ArticleListCreateView(generics.ListCreateAPIView):
-    queryset = Article.objects.all()
+    queryset = Article.objects.select_related("created_by")
     serializer_class = ArticleSerializer
     permission_classes = [IsAuthenticated]
 
 
 class ArticleDetailView(generics.RetrieveUpdateDestroyAPIView):
-    queryset = Article.objects.all()
+    queryset = Article.objects.select_related("created_by")
     serializer_class = ArticleSerializer
     permission_classes = [IsAuthenticated]
 
@@ -35,8 +51,70 @@ class CarouselImageDetailView(generics.RetrieveUpdateDestroyAPIView):
     permission_classes = [IsAuthenticated]
 
 
+# Public front page
+class PublicContentView(CachedListMixin, APIView):
+    """
+    Front-page content for anonymous visitors, answered from the cache.
+
+    No authentication runs, and the query string is ignored so made-up URLs
+    can't push requests through to the database.
+    """
+
+    authentication_classes = []
+    permission_classes = [AllowAny]
+    cache_control = "public, no-cache"
+    content = None
+
+    def get_cache_path(self, request):
+        return request.path
+
+    def get(self, request, format=None):
+        return self.cached_list_response(request, self.content)
+
+
+class PublicArticleListView(PublicContentView):
+    """Article summaries, newest first."""
+
+    cache_models = ARTICLE_MODELS
+    content = staticmethod(article_summaries)
+
+
+class PublicCarouselView(PublicContentView):
+    """The carousel images."""
+
+    cache_models = CAROUSEL_MODELS
+    content = staticmethod(carousel_slides)
+
+
+class ArticleSearchPagination(PageNumberPagination):
+    page_size = 10
+    page_size_query_param = "page_size"
+    max_page_size = 50
+
+
+class ArticleSearchView(APIView):
+    """
+    Full-text search over articles (``?q=``, paginated with ``page`` and
+    ``page_size``), best matches first, with highlighted titles and snippets.
+    """
+
+    authentication_classes = []
+    permission_classes = [AllowAny]
+
+    def get(self, request, format=None):
+        text = request.query_params.get("q", "").strip()
+        if not text:
+            return Response(
+                {"error": "Provide the text to search for as ?q=."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        paginator = ArticleSearchPagination()
+        hits = paginator.paginate_queryset(search_articles(text), request, view=self)
+        return paginator.get_paginated_response(with_summaries(hits))
+
+
 # AcademicYear Views
-class AcademicYearListCreateView(generics.ListCreateAPIView):
+class AcademicYearListCreateView(CachedListMixin, generics.ListCreateAPIView):
     queryset = AcademicYear.objects.all()
     serializer_class = AcademicYearSerializer
     permission_classes = [IsAuthenticated]
@@ -49,8 +127,9 @@ class AcademicYearDetailView(generics.RetrieveUpdateDestroyAPIView):
 
 
 # Term Views
-class TermListCreateView(generics.ListCreateAPIView):
-    queryset = Term.objects.all()
+class TermListCreateView(CachedListMixin, generics.ListCreateAPIView):
+    queryset = Term.objects.select_related("academic_year")
+    cache_models = (Term, AcademicYear)
     serializer_class = TermSerializer
     permission_classes = [IsAuthenticated]
 
@@ -59,3 +138,45 @@ class TermDetailView(generics.RetrieveUpdateDestroyAPIView):
     queryset = Term.objects.all()
     serializer_class = TermSerializer
     permission_classes = [IsAuthenticated]
+
+
+# Access analytics Views
+class AccessAnalyticsView(APIView):
+    """
+    Base for the access dashboards, which read the daily rollups of
+    ``rollup_access_logs`` for ``?date_from=``/``?date_to=`` (default: the
+    30 days up to yesterday).
+    """
+
+    permission_classes = [IsAdminUser]
+    report = None
+
+    def get(self, request, format=None):
+        rollups = AccessRollup.objects.all()
+        if not (
+            request.query_params.get("date_from")
+            or request.query_params.get("date_to")
+        ):
+            rollups = rollups.filter(
+                date__gte=timezone.localdate() - timedelta(days=30)
+            )
+        rollups = filter_dates(rollups, request)
+        return Response(self.report(rollups))
+
+
+class DailyActiveUsersView(AccessAnalyticsView):
+    """Distinct users per day, in total and per role, with requests and logins."""
+
+    report = staticmethod(daily_active_users)
+
+
+class ClientMixView(AccessAnalyticsView):
+    """Share of requests per operating system and per browser."""
+
+    report = staticmethod(client_mix)
+
+
+class LoginHeatmapView(AccessAnalyticsView):
+    """Logins per weekday and hour of the day."""
+
+    report = staticmethod(login_heatmap)
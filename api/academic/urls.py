@@ -20,6 +20,7 @@ from academic.views import (
     StudentClassListCreateView,
     StudentClassDetailView,
     BulkUploadStudentClassView,
+    AllocateDormitoriesView,
 )
 
 
@@ -107,4 +108,10 @@ urlpatterns = [
         BulkUploadStudentClassView.as_view(),
         name="student-class-bulk-upload",
     ),
+    # Dormitory URLs
+    path(
+        "dormitories/allocate/",
+        AllocateDormitoriesView.as_view(),
+        name="dormitory-allocate",
+    ),
 ]
@@ -5,6 +5,9 @@ from administration.views import (
     AcademicYearDetailView,
     TermListCreateView,
     TermDetailView,
+    DailyActiveUsersView,
+    ClientMixView,
+    LoginHeatmapView,
 )
 
 
@@ -23,4 +26,16 @@ urlpatterns = [
     # Term URLs
     path("terms/", TermListCreateView.as_view(), name="term-list-create"),
     path("terms/<int:pk>/", TermDetailView.as_view(), name="term-detail"),
+    # Access analytics URLs
+    path(
+        "access/daily-active-users/",
+        DailyActiveUsersView.as_view(),
+        name="access-daily-active-users",
+    ),
+    path("access/clients/", ClientMixView.as_view(), name="access-clients"),
+    path(
+        "access/login-heatmap/",
+        LoginHeatmapView.as_view(),
+        name="access-login-heatmap",
+    ),
 ]
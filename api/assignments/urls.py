@@ -1,6 +1,12 @@
+from django.urls import path
 from rest_framework.routers import DefaultRouter
-from notes.views import AssignmentViewSet
+from notes.views import AssignmentViewSet, BulkGradeAssignmentView, ItemAnalysisView
 
 router = DefaultRouter()
 router.register(r'', AssignmentViewSet)
-urlpatterns = router.urls
+urlpatterns = [
+    path("<int:pk>/grade/", BulkGradeAssignmentView.as_view(), name="grade-assignment"),
+    path(
+        "<int:pk>/analysis/", ItemAnalysisView.as_view(), name="assignment-analysis"
+    ),
+] + router.urls
@@ -0,0 +1,33 @@
+from django.urls import path
+
+from academic.views import active_parent_messages_async
+from examination.views import student_results_async
+from finance.views import student_receipts_async
+from schedule.views import classroom_timetable_async
+from sis.views import student_detail_async
+
+
+# Async read endpoints, meant to be served by an ASGI server (see README).
+urlpatterns = [
+    path("sis/students/<int:pk>/", student_detail_async, name="async-student-detail"),
+    path(
+        "finance/students/<int:pk>/receipts/",
+        student_receipts_async,
+        name="async-student-receipts",
+    ),
+    path(
+        "examination/students/<int:pk>/results/",
+        student_results_async,
+        name="async-student-results",
+    ),
+    path(
+        "timetable/classrooms/<int:pk>/",
+        classroom_timetable_async,
+        name="async-classroom-timetable",
+    ),
+    path(
+        "academic/parent-messages/",
+        active_parent_messages_async,
+        name="async-parent-messages",
+    ),
+]
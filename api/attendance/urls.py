@@ -4,6 +4,7 @@ from attendance.views import (
     TeacherAttendanceDetailView,
     StudentAttendanceListView,
     StudentAttendanceDetailView,
+    StudentAttendanceExportView,
     PeriodAttendanceListView,
     PeriodAttendanceDetailView,
 )
@@ -29,6 +30,11 @@ urlpatterns = [
         StudentAttendanceDetailView.as_view(),
         name="student-attendance-detail",
     ),
+    path(
+        "student-attendance/export/",
+        StudentAttendanceExportView.as_view(),
+        name="student-attendance-export",
+    ),
     path(
         "period-attendance/",
         PeriodAttendanceListView.as_view(),
@@ -3,8 +3,11 @@ from django.urls import path
 from administration.views import (
     ArticleListCreateView,
     ArticleDetailView,
+    ArticleSearchView,
     CarouselImageListCreateView,
     CarouselImageDetailView,
+    PublicArticleListView,
+    PublicCarouselView,
 )
 
 
@@ -23,4 +26,20 @@ urlpatterns = [
         CarouselImageDetailView.as_view(),
         name="carousel-image-detail",
     ),
+    # Public front page
+    path(
+        "public/articles/",
+        PublicArticleListView.as_view(),
+        name="public-article-list",
+    ),
+    path(
+        "public/articles/search/",
+        ArticleSearchView.as_view(),
+        name="public-article-search",
+    ),
+    path(
+        "public/carousel-images/",
+        PublicCarouselView.as_view(),
+        name="public-carousel-image-list",
+    ),
 ]
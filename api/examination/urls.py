@@ -0,0 +1,13 @@
+from django.urls import path
+from examination.views import BulkMarksEntryView, ExamAnalyticsView, MarksExportView
+
+
+urlpatterns = [
+    path(
+        "exams/<int:pk>/analytics/",
+        ExamAnalyticsView.as_view(),
+        name="exam-analytics",
+    ),
+    path("marks/bulk/", BulkMarksEntryView.as_view(), name="marks-bulk-entry"),
+    path("marks/export/", MarksExportView.as_view(), name="marks-export"),
+]
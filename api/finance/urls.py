@@ -2,6 +2,7 @@ from django.urls import path
 from finance.views import (
     ReceiptsListView,
     ReceiptDetailView,
+    ReceiptExportView,
     PaymentListView,
     PaymentDetailView,
     UpdateStudentDebtView,
@@ -11,6 +12,7 @@ from finance.views import (
 urlpatterns = [
     path("receipts/", ReceiptsListView.as_view(), name="receipt-list"),
     path("receipts/<int:pk>/", ReceiptDetailView.as_view(), name="receipt-detail"),
+    path("receipts/export/", ReceiptExportView.as_view(), name="receipt-export"),
     path("payments/", PaymentListView.as_view(), name="payment-list"),
     path("payments/<int:pk>/", PaymentDetailView.as_view(), name="payment-detail"),
     path(
@@ -0,0 +1,93 @@
+"""
+Conditional GET support for read-mostly list endpoints.
+
+Catalogue data (departments, class levels, streams, terms, ...) changes a few
+times a year but is fetched on every page load. Views using
+``CachedListMixin`` declare the models their output depends on; the ETag and
+Last-Modified headers are derived from those models' version counters (see
+``administration.cache``), so revalidation is answered with ``304 Not
+Modified`` from the cache alone, and full responses are served from the
+cache until one of the models changes.
+"""
+
+import hashlib
+
+from django.core.cache import cache
+from django.utils.http import http_date, parse_http_date_safe
+from rest_framework import status
+from rest_framework.response import Response
+
+from administration.cache import get_model_version
+
+
+class CachedListMixin:
+    """
+    Cache list responses and answer conditional GETs.
+
+    ``cache_models`` lists every model whose rows appear in the response,
+    including related models rendered by the serializer.
+    """
+
+    cache_models = ()
+    cache_timeout = 60 * 60 * 24
+    cache_control = "private, no-cache"
+
+    def get_cache_models(self):
+        if self.cache_models:
+            return self.cache_models
+        return (self.get_queryset().model,)
+
+    def get_cache_path(self, request):
+        """The part of the URL responses vary on."""
+        return request.get_full_path()
+
+    def get_cache_state(self, request):
+        versions = [get_model_version(model) for model in self.get_cache_models()]
+        view = f"{type(self).__module__}.{type(self).__name__}"
+        raw = f"{view}|{self.get_cache_path(request)}|{versions}"
+        digest = hashlib.md5(raw.encode()).hexdigest()
+        last_modified = max(versions) // 1000 if versions else None
+        return digest, last_modified
+
+    def not_modified(self, request, etag, last_modified):
+        if_none_match = request.headers.get("If-None-Match")
+        if if_none_match:
+            return etag in [tag.strip() for tag in if_none_match.split(",")]
+        if_modified_since = parse_http_date_safe(
+            request.headers.get("If-Modified-Since", "")
+        )
+        return (
+            if_modified_since is not None
+            and last_modified is not None
+            and last_modified <= if_modified_since
+        )
+
+    def cached_list_response(self, request, build_data):
+        """
+        Return a cached response for ``request``.
+
+        ``build_data`` is only called on a cache miss and must return the
+        serialized payload.
+        """
+        digest, last_modified = self.get_cache_state(request)
+        etag = f'"{digest}"'
+        headers = {"ETag": etag, "Cache-Control": self.cache_control}
+        if last_modified is not None:
+            headers["Last-Modified"] = http_date(last_modified)
+
+        if self.not_modified(request, etag, last_modified):
+            return Response(status=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+        key = f"httpcache:{digest}"
+        data = cache.get(key)
+        if data is None:
+            data = build_data()
+            cache.set(key, data, timeout=self.cache_timeout)
+        return Response(data, headers=headers)
+
+    def list(self, request, *args, **kwargs):
+        def build_data():
+            response = super(CachedListMixin, self).list(request, *args, **kwargs)
+            return response.data
+
+        return self.cached_list_response(request, build_data)
@@ -0,0 +1,161 @@
+"""
+Read-only serializers over ``QuerySet.values()`` rows.
+
+For large lists most of a ``ModelSerializer``'s time goes into building
+model instances and running every field through its serializer field. A
+``RowSerializer`` instead declares, once per class, where each output key
+comes from; the declaration is compiled into one small function per key, so
+turning a row into a dict is a handful of dictionary lookups.
+
+Output values match what DRF would produce for the same model field:
+datetimes in ISO 8601 with ``Z``, decimals as quantized strings, files as
+URLs.
+"""
+
+from itertools import islice
+from operator import itemgetter
+
+from asgiref.sync import sync_to_async
+from django.db import models
+from django.http import StreamingHttpResponse
+from rest_framework import serializers
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework.response import Response
+
+from .renderers import stream_json_array
+
+
+class Computed:
+    """An output value computed from one or more ``values()`` lookups."""
+
+    def __init__(self, function, *lookups):
+        self.function = function
+        self.lookups = lookups
+
+
+def _model_field(model, lookup):
+    field = None
+    for part in lookup.split("__"):
+        field = model._meta.get_field(part)
+        if field.is_relation and field.related_model is not None:
+            model = field.related_model
+    # A bare foreign key name selects the related primary key.
+    if field.is_relation and field.many_to_one:
+        field = field.target_field
+    return field
+
+
+def _converter(field):
+    if isinstance(field, models.DateTimeField):
+        return serializers.DateTimeField().to_representation
+    if isinstance(field, models.DateField):
+        return serializers.DateField().to_representation
+    if isinstance(field, models.TimeField):
+        return serializers.TimeField().to_representation
+    if isinstance(field, models.DecimalField):
+        return serializers.DecimalField(
+            max_digits=field.max_digits, decimal_places=field.decimal_places
+        ).to_representation
+    if isinstance(field, models.FileField):
+        storage = field.storage
+        return lambda name: storage.url(name) if name else None
+    if isinstance(field, models.UUIDField):
+        return str
+    return None
+
+
+def _getter(model, source):
+    if isinstance(source, Computed):
+        function, lookups = source.function, source.lookups
+        return lambda row: function(*[row[lookup] for lookup in lookups])
+
+    convert = _converter(_model_field(model, source))
+    if convert is None:
+        return itemgetter(source)
+
+    def get(row):
+        value = row[source]
+        return None if value is None else convert(value)
+
+    return get
+
+
+class RowSerializer:
+    """
+    Serialize a queryset from ``.values()`` rows.
+
+    ``fields`` maps output keys, in order, to a ``values()`` lookup, a
+    ``Computed`` or ``None``. ``None`` keys are filled in by ``add_related``,
+    which receives each chunk of output rows and can fetch related data for
+    the whole chunk in one query.
+    """
+
+    model = None
+    fields = {}
+    chunk_size = 2000
+
+    def __init__(self):
+        self.lookups = []
+        self.getters = []
+        for name, source in self.fields.items():
+            if source is None:
+                self.getters.append((name, lambda row: None))
+                continue
+            if isinstance(source, Computed):
+                self.lookups.extend(source.lookups)
+            else:
+                self.lookups.append(source)
+            self.getters.append((name, _getter(self.model, source)))
+        self.lookups = list(dict.fromkeys(self.lookups))
+
+    def to_representation(self, row):
+        return {name: get(row) for name, get in self.getters}
+
+    def add_related(self, rows):
+        pass
+
+    def iter_rows(self, queryset):
+        values = queryset.values(*self.lookups).iterator(chunk_size=self.chunk_size)
+        while True:
+            chunk = [
+                self.to_representation(row) for row in islice(values, self.chunk_size)
+            ]
+            if not chunk:
+                return
+            self.add_related(chunk)
+            yield from chunk
+
+    def data(self, queryset):
+        return list(self.iter_rows(queryset))
+
+    async def adata(self, queryset):
+        """``data()`` for async views, run where the async ORM runs queries."""
+        return await sync_to_async(self.data)(queryset)
+
+
+def query_flag(request, name, default=False):
+    """
+    Whether ``?name=`` is 1, true or yes. Writes may send the flag in their
+    body instead; without either, ``default``.
+    """
+    value = request.query_params.get(name)
+    if value is None and request.method not in SAFE_METHODS:
+        data = request.data
+        value = data.get(name) if hasattr(data, "get") else None
+    if value is None or value == "":
+        return default
+    return str(value).lower() in ("1", "true", "yes")
+
+
+def row_list_response(request, row_serializer, queryset):
+    """
+    Respond with every row of ``queryset``.
+
+    ``?stream=1`` streams the array instead of building it in memory first.
+    """
+    if query_flag(request, "stream"):
+        return StreamingHttpResponse(
+            stream_json_array(row_serializer.iter_rows(queryset)),
+            content_type="application/json",
+        )
+    return Response(row_serializer.data(queryset))
@@ -1,7 +1,16 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
 
-from schedule.views import PeriodViewSet, run_generate_timetable
+from schedule.views import (
+    PeriodViewSet,
+    run_generate_timetable,
+    SchoolTimetableView,
+    ClassroomTimetableView,
+    TeacherTimetableView,
+    TimetableClashesView,
+    RescheduleTimetableView,
+    SubstituteTeachersView,
+)
 
 # Initialize the router
 router = DefaultRouter()
@@ -12,4 +21,22 @@ urlpatterns = [
     path("", include(router.urls)),
     # Generate timetable endpoint
     path("generate-timetable/", run_generate_timetable, name="generate_timetable"),
+    # Clash detection and incremental rescheduling
+    path("clashes/", TimetableClashesView.as_view(), name="timetable-clashes"),
+    path(
+        "reschedule/", RescheduleTimetableView.as_view(), name="timetable-reschedule"
+    ),
+    path("substitutes/", SubstituteTeachersView.as_view(), name="substitutes"),
+    # Precomputed weekly grids
+    path("grid/", SchoolTimetableView.as_view(), name="timetable-grid"),
+    path(
+        "grid/classrooms/<int:pk>/",
+        ClassroomTimetableView.as_view(),
+        name="timetable-grid-classroom",
+    ),
+    path(
+        "grid/teachers/<int:pk>/",
+        TeacherTimetableView.as_view(),
+        name="timetable-grid-teacher",
+    ),
 ]
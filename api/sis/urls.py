@@ -6,6 +6,7 @@ from sis.views import (
     StudentListView,
     StudentDetailView,
     BulkUploadStudentsView,
+    StudentExportView,
 )
 
 
@@ -13,4 +14,5 @@ urlpatterns = [
     path("students/", StudentListView.as_view(), name="students-list"),
     path("students/<int:pk>/", StudentDetailView.as_view(), name="student-detail"),
     path("students/bulk-upload/", BulkUploadStudentsView.as_view()),
+    path("students/export/", StudentExportView.as_view(), name="students-export"),
 ]
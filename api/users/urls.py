@@ -3,6 +3,7 @@ from rest_framework.routers import DefaultRouter
 
 from users.views import (
     MyTokenObtainPairView,
+    CurrentUserView,
     UserListView,
     UserDetailView,
     ParentListView,
@@ -18,6 +19,7 @@ from users.views import (
 urlpatterns = [
     # JWT Token endpoint
     path("login/", MyTokenObtainPairView.as_view(), name="token_obtain_pair"),
+    path("users/me/", CurrentUserView.as_view(), name="current-user"),
     path("users/", UserListView.as_view(), name="users-list"),
     path("users/<int:pk>/", UserDetailView.as_view(), name="user-detail"),
     # teacher URLs
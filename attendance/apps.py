@@ -3,3 +3,9 @@ from django.apps import AppConfig
 
 class AttendanceConfig(AppConfig):
     name = 'attendance'
+
+    def ready(self):
+        from administration.cache import reference_cache
+        from .models import AttendanceStatus
+
+        reference_cache.register(AttendanceStatus)
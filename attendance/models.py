@@ -4,6 +4,7 @@ from django.conf import settings
 from academic.models import Student
 from users.models import CustomUser, Accountant
 from academic.models import Teacher
+from administration.cache import reference_cache
 import datetime
 
 
@@ -38,6 +39,14 @@ class AttendanceStatus(models.Model):
         return self.name
 
 
+def get_present_status():
+    """Return the "Present" status, creating it on first use."""
+    present = reference_cache.get_by_name(AttendanceStatus, "Present")
+    if present is None:
+        present, created = AttendanceStatus.objects.get_or_create(name="Present")
+    return present
+
+
 class TeachersAttendance(models.Model):
     date = models.DateField(blank=True, null=True, validators=settings.DATE_VALIDATORS)
     teacher = models.ForeignKey(Teacher, blank=True, on_delete=models.CASCADE)
@@ -61,7 +70,7 @@ class TeachersAttendance(models.Model):
 
     def save(self, *args, **kwargs):
         """Update for those who are late"""
-        present, created = AttendanceStatus.objects.get_or_create(name="Present")
+        present = get_present_status()
 
         # Check if the teacher is marked as "Present" and if they are late
         if (
@@ -100,7 +109,7 @@ class StudentAttendance(models.Model):
 
     def save(self, *args, **kwargs):
         """Don't save if status is 'Present'"""
-        present, created = AttendanceStatus.objects.get_or_create(name="Present")
+        present = get_present_status()
 
         if self.status != present:
             super(StudentAttendance, self).save(*args, **kwargs)
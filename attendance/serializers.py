@@ -1,4 +1,6 @@
 from rest_framework import serializers
+
+from api.rows import Computed, RowSerializer
 from .models import (
     TeachersAttendance,
     AttendanceStatus,
@@ -53,3 +55,74 @@ class PeriodAttendanceSerializer(serializers.ModelSerializer):
             "reason_for_absence",
             "notes",
         ]
+
+
+def _student_label(admission_number, first_name, last_name, debt):
+    # Matches Student.__str__.
+    return f"{admission_number} - {first_name} {last_name} - Debt: {debt}"
+
+
+def _classroom_label(class_level, stream):
+    # Matches ClassRoom.__str__.
+    if class_level is None:
+        return None
+    return f"{class_level} {stream}" if stream else class_level
+
+
+STUDENT_LABEL = Computed(
+    _student_label,
+    "student__admission_number",
+    "student__first_name",
+    "student__last_name",
+    "student__debt",
+)
+
+
+class TeacherAttendanceRowSerializer(RowSerializer):
+    """Same output as ``TeacherAttendanceSerializer``."""
+
+    model = TeachersAttendance
+    fields = {
+        "id": "id",
+        "teacher": Computed(
+            lambda first_name, last_name: f"{first_name} {last_name}",
+            "teacher__first_name",
+            "teacher__last_name",
+        ),
+        "date": "date",
+        "time_in": "time_in",
+        "time_out": "time_out",
+        "status": "status__name",
+        "notes": "notes",
+    }
+
+
+class StudentAttendanceRowSerializer(RowSerializer):
+    """Same output as ``StudentAttendanceSerializer``."""
+
+    model = StudentAttendance
+    fields = {
+        "id": "id",
+        "student": STUDENT_LABEL,
+        "date": "date",
+        "ClassRoom": Computed(
+            _classroom_label, "ClassRoom__name__name", "ClassRoom__stream__name"
+        ),
+        "status": "status__name",
+        "notes": "notes",
+    }
+
+
+class PeriodAttendanceRowSerializer(RowSerializer):
+    """Same output as ``PeriodAttendanceSerializer``."""
+
+    model = PeriodAttendance
+    fields = {
+        "id": "id",
+        "student": STUDENT_LABEL,
+        "date": "date",
+        "period": "period",
+        "status": "status__name",
+        "reason_for_absence": "reason_for_absence",
+        "notes": "notes",
+    }
@@ -5,10 +5,15 @@ from rest_framework.exceptions import NotFound
 from rest_framework.pagination import PageNumberPagination
 from rest_framework.filters import SearchFilter
 from .models import TeachersAttendance, StudentAttendance, PeriodAttendance
+from api.exports import ExportView, filter_dates, join_names
+from api.rows import Computed, row_list_response
 from .serializers import (
     TeacherAttendanceSerializer,
     StudentAttendanceSerializer,
     PeriodAttendanceSerializer,
+    TeacherAttendanceRowSerializer,
+    StudentAttendanceRowSerializer,
+    PeriodAttendanceRowSerializer,
 )
 
 
@@ -19,11 +24,11 @@ class TeacherAttendanceListView(APIView):
     pagination_class = PageNumberPagination
     filter_backends = (SearchFilter,)
     search_fields = ["teacher__fname", "date"]
+    row_serializer = TeacherAttendanceRowSerializer()
 
     def get(self, request):
         attendances = TeachersAttendance.objects.all()
-        serializer = TeacherAttendanceSerializer(attendances, many=True)
-        return Response(serializer.data)
+        return row_list_response(request, self.row_serializer, attendances)
 
     def post(self, request):
         serializer = TeacherAttendanceSerializer(data=request.data)
@@ -66,10 +71,11 @@ class TeacherAttendanceDetailView(APIView):
 
 
 class StudentAttendanceListView(APIView):
+    row_serializer = StudentAttendanceRowSerializer()
+
     def get(self, request):
         attendances = StudentAttendance.objects.all()
-        serializer = StudentAttendanceSerializer(attendances, many=True)
-        return Response(serializer.data)
+        return row_list_response(request, self.row_serializer, attendances)
 
     def post(self, request):
         serializer = StudentAttendanceSerializer(data=request.data)
@@ -111,11 +117,50 @@ class StudentAttendanceDetailView(APIView):
         return Response(status=status.HTTP_204_NO_CONTENT)
 
 
+class StudentAttendanceExportView(ExportView):
+    """
+    Download student attendance as CSV or XLSX, filtered by ``?classroom=``,
+    ``?date_from=`` and ``?date_to=``.
+    """
+
+    filename = "student-attendance"
+    columns = [
+        ("Date", "date"),
+        ("Admission Number", "student__admission_number"),
+        (
+            "Student",
+            Computed(
+                join_names,
+                "student__first_name",
+                "student__middle_name",
+                "student__last_name",
+            ),
+        ),
+        (
+            "Class",
+            Computed(join_names, "ClassRoom__name__name", "ClassRoom__stream__name"),
+        ),
+        ("Status", "status__name"),
+        ("Notes", "notes"),
+    ]
+
+    def get_queryset(self):
+        attendances = filter_dates(
+            StudentAttendance.objects.order_by("date", "student__admission_number"),
+            self.request,
+        )
+        classroom = self.request.query_params.get("classroom")
+        if classroom:
+            attendances = attendances.filter(ClassRoom_id=classroom)
+        return attendances
+
+
 class PeriodAttendanceListView(APIView):
+    row_serializer = PeriodAttendanceRowSerializer()
+
     def get(self, request):
         attendances = PeriodAttendance.objects.all()
-        serializer = PeriodAttendanceSerializer(attendances, many=True)
-        return Response(serializer.data)
+        return row_list_response(request, self.row_serializer, attendances)
 
     def post(self, request):
         serializer = PeriodAttendanceSerializer(data=request.data)
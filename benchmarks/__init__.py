@@ -0,0 +1,6 @@
+"""
+Performance benchmarks for the hot paths of the API.
+
+Run with ``python -m benchmarks.run`` from the project root; see
+``benchmarks/run.py`` for the options. Cases live in ``benchmarks/cases.py``.
+"""
@@ -0,0 +1,506 @@
+"""
+Benchmark cases.
+
+A case is a function that takes the benchmark environment, does any
+preparation that should not be timed, and returns the callable to time.
+Cases registered with ``rollback=True`` change data; every run of them
+happens in a transaction that is rolled back, so all runs start from the
+same database state.
+"""
+
+import io
+from datetime import date
+
+import openpyxl
+from django.contrib.auth.models import AnonymousUser
+from django.core.management import call_command
+from django.test import RequestFactory
+from rest_framework.test import APIClient
+
+from academic.models import (
+    AllocatedSubject,
+    ClassLevel,
+    Student,
+    StudentClass,
+    Subject,
+    Teacher,
+)
+from administration.access_log import buffer as access_log_buffer, log_access
+from administration.context import get_academic_context
+from administration.models import Article, CarouselImage
+from examination.analytics import invalidate_exam
+from examination.models import ExaminationListHandler, GradeScale, MarksManagement
+from finance.models import Receipt, ReceiptAllocation
+from notes.grading import invalidate_item_analysis, record_submissions
+from notes.models import Assignment
+from notes.serializers import create_assignment
+from schedule.models import Period
+from users.models import Accountant, CustomUser
+from users.views import MyTokenObtainPairSerializer
+
+CASES = {}
+
+
+class Case:
+    def __init__(self, name, setup, repeat, rollback):
+        self.name = name
+        self.setup = setup
+        self.repeat = repeat
+        self.rollback = rollback
+
+
+def case(name, repeat=5, rollback=False):
+    def register(setup):
+        CASES[name] = Case(name, setup, repeat, rollback)
+        return setup
+
+    return register
+
+
+def check(response, *expected):
+    if response.status_code not in expected:
+        raise RuntimeError(
+            f"{response.request['PATH_INFO']} returned {response.status_code}: "
+            f"{response.content[:200]!r}"
+        )
+    return response
+
+
+def workbook_upload(header, rows):
+    workbook = openpyxl.Workbook()
+    sheet = workbook.active
+    sheet.append(header)
+    for row in rows:
+        sheet.append(row)
+    buffer = io.BytesIO()
+    workbook.save(buffer)
+    return buffer.getvalue()
+
+
+@case("student_list")
+def student_list(env):
+    return lambda: check(env.client.get("/api/sis/students/"), 200)
+
+
+@case("student_list_stream")
+def student_list_stream(env):
+    def run():
+        response = check(env.client.get("/api/sis/students/?stream=1"), 200)
+        for _ in response.streaming_content:
+            pass
+
+    return run
+
+
+@case("user_list")
+def user_list(env):
+    return lambda: check(env.client.get("/api/users/users/"), 200)
+
+
+@case("user_list_compact")
+def user_list_compact(env):
+    return lambda: check(env.client.get("/api/users/users/?compact=1"), 200)
+
+
+@case("student_attendance_list")
+def student_attendance_list(env):
+    return lambda: check(env.client.get("/api/attendance/student-attendance/"), 200)
+
+
+@case("timetable_grid")
+def timetable_grid(env):
+    call_command("generate_timetable", stdout=io.StringIO())
+    return lambda: check(env.client.get("/api/timetable/grid/"), 200)
+
+
+@case("timetable_clashes")
+def timetable_clashes(env):
+    call_command("generate_timetable", stdout=io.StringIO())
+    return lambda: check(env.client.get("/api/timetable/clashes/"), 200)
+
+
+@case("timetable_reschedule", repeat=3, rollback=True)
+def timetable_reschedule(env):
+    call_command("generate_timetable", stdout=io.StringIO())
+    # Hand a fifth of the allocations to other teachers, as when staff leave.
+    allocations = list(
+        AllocatedSubject.objects.filter(term=get_academic_context().term)
+        .order_by("id")
+        .values_list("id", "teacher_name_id")
+    )
+    teachers = [teacher_id for _, teacher_id in allocations]
+
+    def run():
+        for index, (allocation_id, _) in enumerate(allocations[::5]):
+            AllocatedSubject.objects.filter(id=allocation_id).update(
+                teacher_name_id=teachers[(index * 7 + 3) % len(teachers)]
+            )
+        check(env.client.post("/api/timetable/reschedule/"), 200)
+
+    return run
+
+
+@case("substitute_teachers")
+def substitute_teachers(env):
+    call_command("generate_timetable", stdout=io.StringIO())
+    teacher_id = (
+        Period.objects.filter(day_of_week="Monday")
+        .order_by("id")
+        .values_list("teacher_id", flat=True)
+        .first()
+    )
+    # 2024-01-01 was a Monday.
+    url = f"/api/timetable/substitutes/?teacher={teacher_id}&date=2024-01-01"
+    return lambda: check(env.client.get(url), 200)
+
+
+@case("student_attendance_export")
+def student_attendance_export(env):
+    def run():
+        url = "/api/attendance/student-attendance/export/"
+        response = check(env.client.get(url), 200)
+        for _ in response.streaming_content:
+            pass
+
+    return run
+
+
+@case("marks_export_xlsx", repeat=3)
+def marks_export_xlsx(env):
+    def run():
+        url = "/api/examination/marks/export/?type=xlsx"
+        response = check(env.client.get(url), 200)
+        for _ in response.streaming_content:
+            pass
+        response.close()
+
+    return run
+
+
+@case("bulk_upload_students", repeat=3, rollback=True)
+def bulk_upload_students(env):
+    level = ClassLevel.objects.order_by("id").first()
+    header = [
+        "first_name",
+        "middle_name",
+        "last_name",
+        "admission_number",
+        "parent_contact",
+        "region",
+        "city",
+        "class_level",
+        "gender",
+        "date_of_birth",
+    ]
+    rows = [
+        [
+            "bench",
+            "upload",
+            f"student{index}",
+            f"B{index:06d}",
+            f"0799{index // 2:06d}",  # pairs of siblings
+            "Arusha",
+            "Arusha",
+            level.name,
+            "Male",
+            date(2010, 1, 1),
+        ]
+        for index in range(env.upload_rows)
+    ]
+    content = workbook_upload(header, rows)
+
+    def run():
+        upload = io.BytesIO(content)
+        upload.name = "students.xlsx"
+        check(
+            env.client.post(
+                "/api/sis/students/bulk-upload/", {"file": upload}, format="multipart"
+            ),
+            201,
+        )
+
+    return run
+
+
+@case("bulk_upload_teachers", repeat=3, rollback=True)
+def bulk_upload_teachers(env):
+    subjects = ",".join(Subject.objects.values_list("name", flat=True)[:2])
+    header = [
+        "first_name",
+        "middle_name",
+        "last_name",
+        "phone_number",
+        "employment_id",
+        "short_name",
+        "subject_specialization",
+        "address",
+        "gender",
+        "date_of_birth",
+        "salary",
+    ]
+    rows = [
+        [
+            "bench",
+            "upload",
+            f"teacher{index}",
+            f"0788{index:06d}",
+            f"BT{index:05d}",
+            f"Z{index:02d}"[:3],
+            subjects,
+            "Arusha",
+            "Female",
+            date(1985, 1, 1),
+            900000,
+        ]
+        for index in range(min(env.upload_rows, 100))
+    ]
+    content = workbook_upload(header, rows)
+
+    def run():
+        upload = io.BytesIO(content)
+        upload.name = "teachers.xlsx"
+        check(
+            env.client.post(
+                "/api/users/teachers/bulk-upload/",
+                {"file": upload},
+                format="multipart",
+            ),
+            201,
+        )
+
+    return run
+
+
+@case("update_student_debt", repeat=3, rollback=True)
+def update_student_debt(env):
+    return lambda: call_command("update_student_debt", stdout=io.StringIO())
+
+
+@case("generate_timetable", repeat=3, rollback=True)
+def generate_timetable(env):
+    return lambda: call_command("generate_timetable", stdout=io.StringIO())
+
+
+@case("grade_conversion")
+def grade_conversion(env):
+    """Convert one classroom's marks for the latest exam to letters and points."""
+    scale = GradeScale.objects.first()
+    classroom_id = StudentClass.objects.values_list("classroom_id", flat=True)[0]
+    marks = list(
+        MarksManagement.objects.filter(student__classroom_id=classroom_id)
+        .order_by("-exam_name_id")
+        .values_list("points_scored", flat=True)[: env.upload_rows]
+    )
+
+    def run():
+        for points in marks:
+            scale.to_letter(points)
+            scale.to_numeric(points)
+
+    return run
+
+
+@case("bulk_marks_entry", repeat=5, rollback=True)
+def bulk_marks_entry(env):
+    """Enter one subject's marks for every student sitting the latest exam."""
+    exam = ExaminationListHandler.objects.order_by("-id").first()
+    students = StudentClass.objects.filter(
+        classroom__in=exam.classrooms.values("id")
+    ).values_list("id", flat=True)[: env.upload_rows]
+    payload = {
+        "exam": exam.pk,
+        "subject": Subject.objects.order_by("id").values_list("id", flat=True)[0],
+        "teacher": Teacher.objects.order_by("id").values_list("id", flat=True)[0],
+        "marks": [
+            {"student": student_id, "points_scored": (index * 7) % exam.out_of}
+            for index, student_id in enumerate(students)
+        ],
+    }
+    return lambda: check(
+        env.client.post("/api/examination/marks/bulk/", payload, format="json"), 201
+    )
+
+
+@case("exam_analytics")
+def exam_analytics(env):
+    """Cold analytics for the latest exam: the cache is dropped every run."""
+    exam = ExaminationListHandler.objects.order_by("-id").first()
+    url = f"/api/examination/exams/{exam.pk}/analytics/"
+
+    def run():
+        invalidate_exam(exam.pk)
+        check(env.client.get(url), 200)
+
+    return run
+
+
+@case("receipt_posting", repeat=10, rollback=True)
+def receipt_posting(env):
+    student = Student.objects.order_by("id").first()
+    last = Receipt.objects.order_by("-receipt_no").first()
+    payload = {
+        "receipt_no": last.receipt_no + 1 if last else 1,
+        "payer": "Bench Parent",
+        "paid_for": ReceiptAllocation.objects.get(name="School Fees").pk,
+        "student": student.pk,
+        "amount": "50000.00",
+        "status": "Completed",
+        "received_by": Accountant.objects.first().pk,
+    }
+    return lambda: check(
+        env.client.post("/api/finance/receipts/", payload, format="json"), 201
+    )
+
+
+@case("assignment_authoring", repeat=5, rollback=True)
+def assignment_authoring(env):
+    """A 50-question quiz with four choices per question, answered by title."""
+    payload = {
+        "teacher": "benchmark@school.test",
+        "title": "Bench quiz",
+        "questions": [
+            {
+                "title": f"Question {number}",
+                "choices": ["True", "False", "Both", "Neither"],
+                "answer": ["True", "False", "Both", "Neither"][number % 4],
+            }
+            for number in range(1, 51)
+        ],
+    }
+    return lambda: check(
+        env.client.post("/api/assignments/", payload, format="json"), 201
+    )
+
+
+def bench_quiz():
+    assignment = Assignment.objects.filter(title="Bench grading quiz").first()
+    if assignment is None:
+        assignment = create_assignment(
+            CustomUser.objects.get(email="benchmark@school.test"),
+            "Bench grading quiz",
+            [
+                {
+                    "title": f"Question {number}",
+                    "choices": ["True", "False", "Both", "Neither"],
+                    "answer": number % 4,
+                }
+                for number in range(50)
+            ],
+        )
+    return assignment
+
+
+def class_submissions(size=45):
+    students = Student.objects.order_by("id").values_list("id", flat=True)[:size]
+    return [
+        {
+            "student": student_id,
+            "answers": [(number * index) % 5 or None for number in range(50)],
+        }
+        for index, student_id in enumerate(students)
+    ]
+
+
+@case("assignment_grading", repeat=10, rollback=True)
+def assignment_grading(env):
+    """A class of 45 handing in a 50-question quiz, graded in one request."""
+    url = f"/api/assignments/{bench_quiz().pk}/grade/"
+    payload = {"submissions": class_submissions()}
+    return lambda: check(env.client.post(url, payload, format="json"), 201)
+
+
+@case("assignment_item_analysis")
+def assignment_item_analysis(env):
+    """Cold item analysis of a 50-question quiz handed in by 45 students."""
+    assignment = bench_quiz()
+    record_submissions(
+        assignment.pk,
+        {
+            submission["student"]: submission["answers"]
+            for submission in class_submissions()
+        },
+    )
+    url = f"/api/assignments/{assignment.pk}/analysis/"
+
+    def run():
+        invalidate_item_analysis(assignment.pk)
+        check(env.client.get(url), 200)
+
+    return run
+
+
+@case("teacher_login", repeat=3)
+def teacher_login(env):
+    """A teacher logging in; password hashing dominates the timing."""
+    user = CustomUser.objects.filter(is_teacher=True).order_by("id").first()
+    user.set_password("bench-password")
+    user.save()
+    payload = {"email": user.email, "password": "bench-password"}
+    return lambda: check(env.client.post("/api/users/login/", payload), 200)
+
+
+@case("jwt_cached_read", repeat=20)
+def jwt_cached_read(env):
+    """
+    A cached read with a real bearer token, so authentication is part of the
+    timing (the other cases authenticate the client directly).
+    """
+    user = CustomUser.objects.get(email="benchmark@school.test")
+    client = APIClient()
+    client.credentials(
+        HTTP_AUTHORIZATION="Bearer "
+        + str(MyTokenObtainPairSerializer.get_token(user).access_token)
+    )
+    check(client.get("/api/timetable/grid/"), 200)
+    return lambda: check(client.get("/api/timetable/grid/"), 200)
+
+
+@case("access_logging", repeat=5, rollback=True)
+def access_logging(env):
+    """Logging 500 requests from a handful of browsers, flushes included."""
+    factory = RequestFactory()
+    agents = [
+        "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+        "(KHTML, like Gecko) Chrome/120.0 Safari/537.36",
+        "Mozilla/5.0 (iPhone; CPU iPhone OS 17_0 like Mac OS X) "
+        "AppleWebKit/605.1.15 (KHTML, like Gecko) Version/17.0 Mobile/15E148 "
+        "Safari/604.1",
+        "Mozilla/5.0 (X11; Linux x86_64; rv:121.0) Gecko/20100101 Firefox/121.0",
+    ]
+    requests = [
+        factory.get(f"/api/sis/students/{index}/", HTTP_USER_AGENT=agents[index % 3])
+        for index in range(500)
+    ]
+
+    def run():
+        for request in requests:
+            log_access(request, f"GET {request.path}", user=AnonymousUser())
+        access_log_buffer.flush()
+
+    return run
+
+
+@case("front_page", repeat=20)
+def front_page(env):
+    """An anonymous visitor loading the articles and carousel of the landing page."""
+    if not Article.objects.exists():
+        authors = list(CustomUser.objects.order_by("id")[:5])
+        Article.objects.bulk_create(
+            Article(
+                title=f"News {index}",
+                content="School news. " * 100,
+                created_by=authors[index % len(authors)],
+            )
+            for index in range(40)
+        )
+        CarouselImage.objects.bulk_create(
+            CarouselImage(title=f"Slide {index}", picture=f"carousel/{index}.jpg")
+            for index in range(6)
+        )
+    client = APIClient()
+
+    def run():
+        check(client.get("/api/blog/public/articles/"), 200)
+        check(client.get("/api/blog/public/carousel-images/"), 200)
+
+    return run
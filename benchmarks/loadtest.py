@@ -0,0 +1,104 @@
+"""
+Concurrent HTTP load generator for comparing deployments.
+
+Only the standard library is used, so it runs from any machine that can
+reach the servers:
+
+    python benchmarks/loadtest.py --token <access token> -c 50 -n 2000 \
+        --target wsgi=http://127.0.0.1:8000/api/sis/students/1/ \
+        --target asgi=http://127.0.0.1:8001/api/async/sis/students/1/
+
+Each target gets the same number of requests at the same concurrency and
+reports throughput, latency percentiles and the number of failed requests.
+"""
+
+import argparse
+import statistics
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+
+def fetch(url, headers, timeout):
+    request = urllib.request.Request(url, headers=headers)
+    started = time.perf_counter()
+    try:
+        with urllib.request.urlopen(request, timeout=timeout) as response:
+            response.read()
+            ok = response.status < 400
+    except (urllib.error.URLError, OSError):
+        ok = False
+    return time.perf_counter() - started, ok
+
+
+def percentile(values, fraction):
+    index = min(len(values) - 1, int(round(fraction * (len(values) - 1))))
+    return values[index]
+
+
+def run_target(url, requests, concurrency, headers, timeout):
+    # Warm up connections, caches and lazily imported code first.
+    for _ in range(min(concurrency, requests)):
+        fetch(url, headers, timeout)
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        results = list(
+            pool.map(lambda _: fetch(url, headers, timeout), range(requests))
+        )
+    elapsed = time.perf_counter() - started
+
+    timings = sorted(duration * 1000 for duration, _ in results)
+    return {
+        "requests": requests,
+        "errors": sum(1 for _, ok in results if not ok),
+        "rps": requests / elapsed,
+        "mean": statistics.mean(timings),
+        "p50": percentile(timings, 0.50),
+        "p95": percentile(timings, 0.95),
+        "p99": percentile(timings, 0.99),
+    }
+
+
+def parse_target(value):
+    name, sep, url = value.partition("=")
+    if not sep or not url:
+        raise argparse.ArgumentTypeError("Targets must look like name=URL")
+    return name, url
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument(
+        "--target",
+        action="append",
+        type=parse_target,
+        required=True,
+        help="name=URL, may be repeated",
+    )
+    parser.add_argument("-c", "--concurrency", type=int, default=20)
+    parser.add_argument("-n", "--requests", type=int, default=500)
+    parser.add_argument("--token", help="JWT access token sent as a Bearer token")
+    parser.add_argument("--timeout", type=float, default=30)
+    args = parser.parse_args()
+
+    headers = {"Accept": "application/json"}
+    if args.token:
+        headers["Authorization"] = f"Bearer {args.token}"
+
+    print(
+        f"{'target':<12} {'req/s':>9} {'mean ms':>9} {'p50 ms':>9} "
+        f"{'p95 ms':>9} {'p99 ms':>9} {'errors':>7}"
+    )
+    for name, url in args.target:
+        result = run_target(url, args.requests, args.concurrency, headers, args.timeout)
+        print(
+            f"{name:<12} {result['rps']:>9.1f} {result['mean']:>9.2f} "
+            f"{result['p50']:>9.2f} {result['p95']:>9.2f} {result['p99']:>9.2f} "
+            f"{result['errors']:>7}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,249 @@
+"""
+Run the benchmark suite and record the results as JSON.
+
+The suite never touches your data: it creates a test database the same way
+``manage.py test`` does (in memory for SQLite, ``test_<name>`` on
+PostgreSQL), fills it with ``generate_school_data`` and times every case.
+
+    python -m benchmarks.run
+    python -m benchmarks.run --students 5000 --case student_list
+    python -m benchmarks.run --compare benchmarks/results/<earlier run>.json
+
+The database comes from the settings module, so the ``DB_*`` environment
+variables select SQLite or PostgreSQL (``DB_ENGINE=django.db.backends.sqlite3``
+runs without a server). Results are written to ``benchmarks/results/``, named
+after the time and the current commit, so two commits can be compared.
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+
+RESULTS_DIR = Path(__file__).resolve().parent / "results"
+
+
+class Environment:
+    """What cases get to work with."""
+
+    def __init__(self, client, upload_rows):
+        self.client = client
+        self.upload_rows = upload_rows
+
+
+class QueryCounter:
+    """Count queries without the 9000 entry cap of ``connection.queries``."""
+
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.count += 1
+        return execute(sql, params, many, context)
+
+
+@contextmanager
+def rolled_back(enabled):
+    from django.db import transaction
+
+    if not enabled:
+        yield
+        return
+    with transaction.atomic():
+        yield
+        transaction.set_rollback(True)
+
+
+def git_revision():
+    try:
+        revision = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+        dirty = subprocess.run(
+            ["git", "status", "--porcelain", "--untracked-files=no"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+    return f"{revision}-dirty" if dirty else revision
+
+
+def run_case(bench_case, env, repeat):
+    from django.db import connection
+
+    run = bench_case.setup(env)
+
+    # One untimed run warms caches and records the query count.
+    queries = QueryCounter()
+    with rolled_back(bench_case.rollback):
+        with connection.execute_wrapper(queries):
+            run()
+
+    timings = []
+    for _ in range(repeat or bench_case.repeat):
+        with rolled_back(bench_case.rollback):
+            started = time.perf_counter()
+            run()
+            timings.append((time.perf_counter() - started) * 1000)
+
+    return {
+        "runs": len(timings),
+        "queries": queries.count,
+        "min_ms": round(min(timings), 3),
+        "median_ms": round(statistics.median(timings), 3),
+        "mean_ms": round(statistics.mean(timings), 3),
+        "max_ms": round(max(timings), 3),
+    }
+
+
+def compare(results, baseline_path):
+    baseline = json.loads(Path(baseline_path).read_text())
+    print(f"\nCompared with {baseline_path} ({baseline['meta']['revision']})")
+    print(f"{'case':<24} {'median ms':>20} {'change':>8} {'queries':>14}")
+    for name, result in results["cases"].items():
+        before = baseline["cases"].get(name)
+        if before is None:
+            print(f"{name:<24} {'new case':>20}")
+            continue
+        change = (result["median_ms"] - before["median_ms"]) / before["median_ms"]
+        print(
+            f"{name:<24} "
+            f"{before['median_ms']:>9.2f} -> {result['median_ms']:>7.2f} "
+            f"{change:>+8.1%} "
+            f"{before['queries']:>6} -> {result['queries']:>5}"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Time the API hot paths against a synthetic school."
+    )
+    parser.add_argument("--settings", default="school.settings")
+    parser.add_argument("--students", type=int, default=1000)
+    parser.add_argument("--teachers", type=int, default=60)
+    parser.add_argument("--days", type=int, default=180)
+    parser.add_argument(
+        "--upload-rows",
+        type=int,
+        default=200,
+        help="Rows in the bulk upload workbooks and marks converted per run.",
+    )
+    parser.add_argument(
+        "--case",
+        action="append",
+        dest="cases",
+        help="Only run this case; may be repeated.",
+    )
+    parser.add_argument("--repeat", type=int, help="Override every case's repeat.")
+    parser.add_argument("--output", help="Where to write the JSON results.")
+    parser.add_argument("--compare", help="Earlier results file to compare with.")
+    parser.add_argument(
+        "--keepdb",
+        action="store_true",
+        help="Keep the test database between runs (not for in-memory SQLite).",
+    )
+    args = parser.parse_args()
+
+    sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", args.settings)
+
+    import django
+
+    django.setup()
+
+    from django.conf import settings
+    from django.core.management import call_command
+    from django.db import connection
+    from django.test.utils import setup_test_environment
+    from rest_framework.test import APIClient
+
+    from academic.models import Student
+    from users.models import CustomUser
+
+    from .cases import CASES
+
+    unknown = set(args.cases or []) - set(CASES)
+    if unknown:
+        parser.error(f"Unknown case(s): {', '.join(sorted(unknown))}")
+
+    setup_test_environment()
+    # Same as the test runner: no debug toolbar or query log in timings.
+    settings.DEBUG = False
+    connection.creation.create_test_db(verbosity=0, keepdb=args.keepdb)
+
+    try:
+        if not Student.objects.exists():
+            print("Generating synthetic school data...")
+            started = time.perf_counter()
+            call_command(
+                "generate_school_data",
+                students=args.students,
+                teachers=args.teachers,
+                days=args.days,
+                verbosity=0,
+                stdout=open(os.devnull, "w"),
+            )
+            print(f"  done in {time.perf_counter() - started:.1f}s")
+
+        admin, _ = CustomUser.objects.get_or_create(
+            email="benchmark@school.test",
+            defaults={"is_staff": True, "is_superuser": True},
+        )
+        client = APIClient()
+        client.force_authenticate(user=admin)
+        env = Environment(client, args.upload_rows)
+
+        results = {
+            "meta": {
+                "revision": git_revision(),
+                "timestamp": datetime.now().isoformat(timespec="seconds"),
+                "database": connection.vendor,
+                "python": sys.version.split()[0],
+                "django": django.get_version(),
+                "students": Student.objects.count(),
+                "upload_rows": args.upload_rows,
+            },
+            "cases": {},
+        }
+
+        print(f"{'case':<24} {'median ms':>10} {'min ms':>10} {'queries':>8}")
+        for name, bench_case in CASES.items():
+            if args.cases and name not in args.cases:
+                continue
+            result = run_case(bench_case, env, args.repeat)
+            results["cases"][name] = result
+            print(
+                f"{name:<24} {result['median_ms']:>10.2f} "
+                f"{result['min_ms']:>10.2f} {result['queries']:>8}"
+            )
+    finally:
+        connection.creation.destroy_test_db(
+            connection.settings_dict["NAME"], verbosity=0, keepdb=args.keepdb
+        )
+
+    if args.output:
+        output = Path(args.output)
+    else:
+        RESULTS_DIR.mkdir(exist_ok=True)
+        stamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+        output = RESULTS_DIR / f"{stamp}-{results['meta']['revision']}.json"
+    output.write_text(json.dumps(results, indent=2))
+    print(f"\nResults written to {output}")
+
+    if args.compare:
+        compare(results, args.compare)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,290 @@
+"""
+Exam analytics computed in the database.
+
+For one ``ExaminationListHandler`` this reports, per subject and per
+classroom and subject, the mean, standard deviation, range and grade
+distribution of the marks, and ranks students by their total with window
+functions, overall and within their classroom. Every figure comes from an
+aggregate or window query, so no mark rows are loaded into Python.
+
+Results are cached per exam. Each exam has its own version counter, bumped
+whenever the exam (e.g. its ``out_of``) or one of its marks is saved or
+deleted (``bulk_create`` callers bump it themselves), so entering marks for
+one exam leaves the others cached.
+"""
+
+from django.core.cache import cache
+from django.db.models import (
+    Avg,
+    Count,
+    F,
+    FloatField,
+    Max,
+    Min,
+    Q,
+    StdDev,
+    Sum,
+    Window,
+)
+from django.db.models.functions import Cast, PercentRank, Rank
+
+from administration.cache import bump_version, get_model_version, get_version
+from .models import GradeScale, GradeScaleRule, MarksManagement
+
+EXAM_VERSION_KEY = "analytics:exam:{exam_id}:version"
+DATA_KEY = "analytics:exam:{exam_id}:{version}:{scale_id}:{top}"
+CACHE_TIMEOUT = 60 * 60 * 6
+
+
+def invalidate_exam(exam_id):
+    """Drop the cached analytics of one exam."""
+    bump_version(EXAM_VERSION_KEY.format(exam_id=exam_id))
+
+
+def _marks_changed(sender, instance, **kwargs):
+    invalidate_exam(instance.exam_name_id)
+
+
+def _exam_changed(sender, instance, **kwargs):
+    invalidate_exam(instance.pk)
+
+
+def _round(value, digits=2):
+    return None if value is None else round(value, digits)
+
+
+def _join(*names):
+    return " ".join(name for name in names if name)
+
+
+def _statistics():
+    return {
+        "mean": Avg("points_scored"),
+        "std_dev": StdDev("points_scored"),
+        "highest": Max("points_scored"),
+        "lowest": Min("points_scored"),
+        "count": Count("id"),
+    }
+
+
+def _grade_counts(rules, out_of):
+    """One filtered ``Count`` per grade; rule bounds are percentages."""
+    return {
+        f"grade_{rule.pk}": Count(
+            "id",
+            filter=Q(
+                points_scored__gte=float(rule.min_grade) * out_of / 100,
+                points_scored__lte=float(rule.max_grade) * out_of / 100,
+            ),
+        )
+        for rule in rules
+    }
+
+
+def _summary(row, rules):
+    summary = {
+        "mean": _round(row["mean"]),
+        "std_dev": _round(row["std_dev"]),
+        "highest": row["highest"],
+        "lowest": row["lowest"],
+        "count": row["count"],
+    }
+    if rules:
+        summary["grades"] = {
+            rule.letter_grade or str(rule.numeric_scale): row[f"grade_{rule.pk}"]
+            for rule in rules
+        }
+    return summary
+
+
+def subject_statistics(exam, rules=()):
+    """Mean, spread and grade distribution of every subject of ``exam``."""
+    rows = (
+        MarksManagement.objects.filter(exam_name=exam)
+        .values("subject_id", "subject__name")
+        .annotate(**_statistics(), **_grade_counts(rules, exam.out_of))
+        .order_by("subject__name")
+    )
+    return [
+        {
+            "subject_id": row["subject_id"],
+            "subject": row["subject__name"],
+            **_summary(row, rules),
+        }
+        for row in rows
+    ]
+
+
+def classroom_statistics(exam, rules=()):
+    """The same figures per classroom and subject, to compare streams."""
+    rows = (
+        MarksManagement.objects.filter(exam_name=exam)
+        .values(
+            "student__classroom_id",
+            "student__classroom__name__name",
+            "student__classroom__stream__name",
+            "subject_id",
+            "subject__name",
+        )
+        .annotate(**_statistics(), **_grade_counts(rules, exam.out_of))
+        .order_by(
+            "student__classroom__name__name",
+            "student__classroom__stream__name",
+            "subject__name",
+        )
+    )
+    return [
+        {
+            "classroom_id": row["student__classroom_id"],
+            "classroom": _join(
+                row["student__classroom__name__name"],
+                row["student__classroom__stream__name"],
+            ),
+            "subject_id": row["subject_id"],
+            "subject": row["subject__name"],
+            **_summary(row, rules),
+        }
+        for row in rows
+    ]
+
+
+def student_rankings(exam, top=10):
+    """
+    The ``top`` students by total marks, with their rank in the whole exam
+    and within their classroom and their percent rank (0 is the best).
+    """
+    total = F("total")
+    rows = (
+        MarksManagement.objects.filter(exam_name=exam)
+        .values(
+            "student_id",
+            "student__student__admission_number",
+            "student__student__first_name",
+            "student__student__last_name",
+            "student__classroom_id",
+            "student__classroom__name__name",
+            "student__classroom__stream__name",
+        )
+        .annotate(
+            total=Sum("points_scored"),
+            average=Avg("points_scored"),
+            subjects=Count("id"),
+        )
+        .annotate(
+            rank=Window(Rank(), order_by=total.desc()),
+            classroom_rank=Window(
+                Rank(), partition_by=F("student__classroom_id"), order_by=total.desc()
+            ),
+            percent_rank=Window(
+                PercentRank(), order_by=Cast(total, FloatField()).desc()
+            ),
+        )
+        .order_by("rank", "student__student__admission_number")[:top]
+    )
+    return [
+        {
+            "student_class_id": row["student_id"],
+            "admission_number": row["student__student__admission_number"],
+            "name": _join(
+                row["student__student__first_name"],
+                row["student__student__last_name"],
+            ),
+            "classroom_id": row["student__classroom_id"],
+            "classroom": _join(
+                row["student__classroom__name__name"],
+                row["student__classroom__stream__name"],
+            ),
+            "total": _round(row["total"]),
+            "average": _round(row["average"]),
+            "subjects": row["subjects"],
+            "rank": row["rank"],
+            "classroom_rank": row["classroom_rank"],
+            "percent_rank": _round(row["percent_rank"], 4),
+        }
+        for row in rows
+    ]
+
+
+def subject_toppers(exam, top=3):
+    """The ``top`` students of every subject, ranked within the subject."""
+    rows = (
+        MarksManagement.objects.filter(exam_name=exam)
+        .annotate(
+            subject_rank=Window(
+                Rank(), partition_by=F("subject_id"), order_by=F("points_scored").desc()
+            )
+        )
+        .filter(subject_rank__lte=top)
+        .values(
+            "subject_id",
+            "subject__name",
+            "student_id",
+            "student__student__admission_number",
+            "student__student__first_name",
+            "student__student__last_name",
+            "points_scored",
+            "subject_rank",
+        )
+        .order_by("subject__name", "subject_rank", "student_id")
+    )
+    toppers = {}
+    for row in rows:
+        subject = toppers.setdefault(
+            row["subject_id"],
+            {
+                "subject_id": row["subject_id"],
+                "subject": row["subject__name"],
+                "students": [],
+            },
+        )
+        subject["students"].append(
+            {
+                "student_class_id": row["student_id"],
+                "admission_number": row["student__student__admission_number"],
+                "name": _join(
+                    row["student__student__first_name"],
+                    row["student__student__last_name"],
+                ),
+                "points_scored": row["points_scored"],
+                "rank": row["subject_rank"],
+            }
+        )
+    return list(toppers.values())
+
+
+def exam_analytics(exam, grade_scale=None, top=10):
+    """Everything above for one exam, cached until its marks change."""
+    version = "-".join(
+        str(v)
+        for v in (
+            get_version(EXAM_VERSION_KEY.format(exam_id=exam.pk)),
+            get_model_version(GradeScaleRule),
+        )
+    )
+    key = DATA_KEY.format(
+        exam_id=exam.pk,
+        version=version,
+        scale_id=grade_scale.pk if grade_scale else "",
+        top=top,
+    )
+    data = cache.get(key)
+    if data is not None:
+        return data
+
+    rules = []
+    if grade_scale is not None:
+        rules = list(grade_scale.gradescalerule_set.order_by("-max_grade"))
+    data = {
+        "exam": {"id": exam.pk, "name": exam.name, "out_of": exam.out_of},
+        "grade_scale": grade_scale.name if grade_scale else None,
+        "subjects": subject_statistics(exam, rules),
+        "classrooms": classroom_statistics(exam, rules),
+        "top_students": student_rankings(exam, top),
+        "subject_toppers": subject_toppers(exam, min(top, 5)),
+    }
+    cache.set(key, data, timeout=CACHE_TIMEOUT)
+    return data
+
+
+def default_grade_scale():
+    return GradeScale.objects.order_by("id").first()
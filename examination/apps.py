@@ -4,3 +4,32 @@ from django.apps import AppConfig
 class ExaminationConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'examination'
+
+    def ready(self):
+        from django.db.models.signals import post_delete, post_save
+
+        from administration.cache import track_model_versions
+        from .analytics import _exam_changed, _marks_changed
+        from .models import (
+            ExaminationListHandler,
+            GradeScale,
+            GradeScaleRule,
+            MarksManagement,
+        )
+
+        # Cached exam analytics are dropped when their exam, marks or grades
+        # change
+        post_save.connect(
+            _exam_changed,
+            sender=ExaminationListHandler,
+            dispatch_uid="analytics-exam-save",
+        )
+        post_save.connect(
+            _marks_changed, sender=MarksManagement, dispatch_uid="analytics-mark-save"
+        )
+        post_delete.connect(
+            _marks_changed,
+            sender=MarksManagement,
+            dispatch_uid="analytics-mark-delete",
+        )
+        track_model_versions(GradeScale, GradeScaleRule)
@@ -0,0 +1,75 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from academic.models import ClassRoom
+from administration.context import get_academic_context
+from administration.models import Term
+from examination.report_cards import generate_report_cards
+
+
+class Command(BaseCommand):
+    help = (
+        "Render term report cards as PDFs under MEDIA_ROOT/report_cards, with a "
+        "zip bundle per classroom. Cards already rendered are skipped, so an "
+        "interrupted run can simply be started again."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--term", type=int, help="Term id (defaults to the current term)."
+        )
+        parser.add_argument("--classroom", type=int, help="Only this classroom id.")
+        parser.add_argument(
+            "--workers",
+            type=int,
+            help="Rendering processes (default: one per CPU; 1 disables the pool).",
+        )
+        parser.add_argument(
+            "--force",
+            action="store_true",
+            help="Render every card again, even those that already exist.",
+        )
+
+    def handle(self, *args, **options):
+        if options["term"]:
+            term = Term.objects.filter(pk=options["term"]).first()
+            if term is None:
+                raise CommandError(f"Term {options['term']} does not exist.")
+        else:
+            term = get_academic_context().term
+            if term is None:
+                raise CommandError("No current term set.")
+
+        classroom = None
+        if options["classroom"]:
+            classroom = ClassRoom.objects.filter(pk=options["classroom"]).first()
+            if classroom is None:
+                raise CommandError(f"Classroom {options['classroom']} does not exist.")
+
+        step = 1
+
+        def progress(done, total, path):
+            nonlocal step
+            # Roughly every 10%, and always the last card.
+            if done == total or done * 10 >= total * step:
+                self.stdout.write(f"  {done}/{total} rendered")
+                step = done * 10 // total + 1
+
+        started = time.perf_counter()
+        rendered, skipped, bundles = generate_report_cards(
+            term,
+            classroom=classroom,
+            workers=options["workers"],
+            force=options["force"],
+            progress=progress,
+        )
+        elapsed = time.perf_counter() - started
+
+        if skipped:
+            self.stdout.write(f"{skipped} cards already existed and were skipped.")
+        for bundle in bundles:
+            self.stdout.write(f"Bundled {bundle}")
+        self.stdout.write(
+            self.style.SUCCESS(f"{rendered} report cards rendered in {elapsed:.1f}s.")
+        )
@@ -0,0 +1,35 @@
+from django.db import migrations, models
+
+
+def remove_duplicate_marks(apps, schema_editor):
+    """Keep only the latest mark per exam, subject and student."""
+    MarksManagement = apps.get_model("examination", "MarksManagement")
+    duplicates = (
+        MarksManagement.objects.values("exam_name", "subject", "student")
+        .annotate(latest=models.Max("id"), count=models.Count("id"))
+        .filter(count__gt=1)
+    )
+    for duplicate in duplicates:
+        MarksManagement.objects.filter(
+            exam_name=duplicate["exam_name"],
+            subject=duplicate["subject"],
+            student=duplicate["student"],
+        ).exclude(id=duplicate["latest"]).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("examination", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.RunPython(remove_duplicate_marks, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name="marksmanagement",
+            constraint=models.UniqueConstraint(
+                fields=("exam_name", "subject", "student"),
+                name="unique_exam_subject_student_mark",
+            ),
+        ),
+    ]
@@ -142,6 +142,14 @@ class MarksManagement(models.Model):
     )
     date_time = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["exam_name", "subject", "student"],
+                name="unique_exam_subject_student_mark",
+            )
+        ]
+
     def __str__(self):
         return f"{self.exam_name} - {self.student} - {self.points_scored}"
 
@@ -0,0 +1,235 @@
+"""
+Draw one report card as a PDF with Pillow.
+
+This module deliberately imports nothing from Django: it runs in the worker
+processes of ``examination.report_cards``, which only receive plain data,
+so it works with the ``spawn`` start method as well as ``fork``.
+"""
+
+import os
+
+from PIL import Image, ImageDraw, ImageFont
+
+DPI = 150
+PAGE_SIZE = (1240, 1754)  # A4 at 150 dpi
+MARGIN = 90
+# Grayscale pages encode several times faster than RGB ones.
+MODE = "L"
+BLACK = 0
+GREY = 110
+LINE = 60
+SHADE = 236
+ROW_HEIGHT = 46
+ATTENDANCE_HEIGHT = 110
+# Page content stops above the signature lines of the footer.
+CONTENT_BOTTOM = PAGE_SIZE[1] - MARGIN - 170
+
+_fonts = {}
+
+
+def _font(size):
+    if size not in _fonts:
+        _fonts[size] = ImageFont.load_default(size=size)
+    return _fonts[size]
+
+
+def _text(draw, xy, text, size=26, anchor="la", fill=BLACK):
+    text = "" if text is None else str(text)
+    draw.text(xy, text, font=_font(size), fill=fill, anchor=anchor)
+
+
+def _format_score(value):
+    if value is None:
+        return "-"
+    return f"{value:g}" if isinstance(value, (int, float)) else str(value)
+
+
+def _header(draw, card):
+    width = PAGE_SIZE[0]
+    school = card["school"]
+    y = MARGIN
+    _text(draw, (width / 2, y), school["name"], size=48, anchor="mt")
+    y += 64
+    parts = (school["address"], school["telephone"], school["email"])
+    contact = " | ".join(part for part in parts if part)
+    _text(draw, (width / 2, y), contact, size=24, anchor="mt")
+    y += 50
+    draw.line((MARGIN, y, width - MARGIN, y), fill=LINE, width=3)
+    y += 24
+    _text(draw, (width / 2, y), "STUDENT REPORT CARD", size=36, anchor="mt")
+    y += 50
+    _text(draw, (width / 2, y), card["term"], size=26, anchor="mt")
+    return y + 60
+
+
+def _continued_header(draw, card):
+    width = PAGE_SIZE[0]
+    y = MARGIN
+    _text(draw, (width / 2, y), card["school"]["name"], size=36, anchor="mt")
+    y += 52
+    title = f"{card['student']['name']} - {card['term']} (continued)"
+    _text(draw, (width / 2, y), title, size=24, anchor="mt")
+    y += 44
+    draw.line((MARGIN, y, width - MARGIN, y), fill=LINE, width=3)
+    return y + 40
+
+
+def _student(draw, card, y):
+    student = card["student"]
+    right = PAGE_SIZE[0] / 2 + 40
+    rows = [
+        ("Name", student["name"], "Class", student["classroom"]),
+        (
+            "Admission No.",
+            student["admission_number"],
+            "Position",
+            f"{card['position']} of {card['class_size']}" if card["position"] else "-",
+        ),
+        (
+            "Average",
+            f"{card['average']:.1f}%" if card["average"] is not None else "-",
+            "GPA",
+            _format_score(card["gpa"]),
+        ),
+    ]
+    for left_label, left_value, right_label, right_value in rows:
+        _text(draw, (MARGIN, y), f"{left_label}:", size=26)
+        _text(draw, (MARGIN + 210, y), left_value, size=26)
+        _text(draw, (right, y), f"{right_label}:", size=26)
+        _text(draw, (right + 150, y), right_value, size=26)
+        y += 42
+    return y + 30
+
+
+def _marks_table(draw, card, y, start=0):
+    """
+    Draw the subjects from ``start`` on, as many as fit above the footer.
+    Return the position below the table and the first subject left over.
+    """
+    width = PAGE_SIZE[0] - 2 * MARGIN
+    exams = card["exams"]
+    subject_width = 300
+    tail_width = 260
+    exam_width = (width - subject_width - tail_width) / max(len(exams), 1)
+    row_height = ROW_HEIGHT
+    top = y
+
+    columns = [(MARGIN, subject_width, "Subject", "la")]
+    x = MARGIN + subject_width
+    for exam in exams:
+        columns.append((x, exam_width, exam, "ma"))
+        x += exam_width
+    columns.append((x, tail_width / 2, "Average", "ma"))
+    columns.append((x + tail_width / 2, tail_width / 2, "Grade", "ma"))
+
+    draw.rectangle((MARGIN, y, MARGIN + width, y + row_height), fill=SHADE)
+    for left, column_width, title, anchor in columns:
+        position = left + 12 if anchor == "la" else left + column_width / 2
+        _text(draw, (position, y + 12), title, size=22, anchor=anchor)
+    y += row_height
+
+    subjects = card["subjects"]
+    end = start
+    while end < len(subjects) and y + row_height <= CONTENT_BOTTOM:
+        subject = subjects[end]
+        end += 1
+        values = [subject["name"]]
+        values += [_format_score(score) for score in subject["scores"]]
+        values.append(
+            f"{subject['average']:.1f}%" if subject["average"] is not None else "-"
+        )
+        values.append(subject["grade"] or "-")
+        for (left, column_width, _, anchor), value in zip(columns, values):
+            position = left + 12 if anchor == "la" else left + column_width / 2
+            _text(draw, (position, y + 12), value, size=22, anchor=anchor)
+        draw.line((MARGIN, y + row_height, MARGIN + width, y + row_height), fill=LINE)
+        y += row_height
+
+    draw.rectangle((MARGIN, top, MARGIN + width, y), outline=LINE, width=2)
+    return y + 40, end
+
+
+def _attendance(draw, card, y):
+    attendance = card["attendance"]
+    _text(draw, (MARGIN, y), "Attendance", size=30)
+    y += 48
+    _text(
+        draw,
+        (MARGIN, y),
+        f"Days absent: {attendance['absent']}    "
+        f"Days late: {attendance['late']}    "
+        f"Excused: {attendance['excused']}",
+        size=26,
+    )
+    return y + 60
+
+
+def _footer(draw, card):
+    y = PAGE_SIZE[1] - MARGIN - 120
+    third = (PAGE_SIZE[0] - 2 * MARGIN) / 3
+    for index, label in enumerate(("Class teacher", "Head teacher", "Parent")):
+        left = MARGIN + index * third
+        draw.line((left + 20, y, left + third - 20, y), fill=LINE, width=2)
+        _text(draw, (left + third / 2, y + 12), label, size=22, anchor="ma")
+    _text(
+        draw,
+        (PAGE_SIZE[0] / 2, PAGE_SIZE[1] - MARGIN),
+        f"Generated on {card['generated_on']}",
+        size=20,
+        anchor="md",
+        fill=GREY,
+    )
+
+
+def _page_numbers(pages):
+    for number, (_, draw) in enumerate(pages, start=1):
+        _text(
+            draw,
+            (PAGE_SIZE[0] - MARGIN, PAGE_SIZE[1] - MARGIN),
+            f"Page {number} of {len(pages)}",
+            size=20,
+            anchor="rd",
+            fill=GREY,
+        )
+
+
+def render_report_card(card):
+    """
+    Render ``card`` to ``card["path"]`` and return the path.
+
+    Subjects that don't fit on the first page continue on further pages;
+    the signatures go at the bottom of the last one. The PDF is written
+    next to its final name and renamed into place, so an interrupted run
+    never leaves a half-written file behind.
+    """
+    pages = []
+
+    def new_page():
+        image = Image.new(MODE, PAGE_SIZE, 255)
+        draw = ImageDraw.Draw(image)
+        pages.append((image, draw))
+        return draw
+
+    draw = new_page()
+    y = _header(draw, card)
+    y = _student(draw, card, y)
+    y, done = _marks_table(draw, card, y)
+    while done < len(card["subjects"]):
+        draw = new_page()
+        y, done = _marks_table(draw, card, _continued_header(draw, card), done)
+    if y + ATTENDANCE_HEIGHT > CONTENT_BOTTOM:
+        draw = new_page()
+        y = _continued_header(draw, card)
+    _attendance(draw, card, y)
+    _footer(draw, card)
+    if len(pages) > 1:
+        _page_numbers(pages)
+
+    path = card["path"]
+    partial = f"{path}.part"
+    images = [image for image, _ in pages]
+    images[0].save(
+        partial, "PDF", resolution=DPI, save_all=True, append_images=images[1:]
+    )
+    os.replace(partial, path)
+    return path
@@ -0,0 +1,279 @@
+"""
+Term-end report cards.
+
+``collect_report_cards`` gathers everything the cards show for a term (or
+one classroom of it) in a fixed handful of queries: enrolments, the term's
+exams, every mark, the grade scale, attendance counts, results and the
+school's details. It returns one plain dict per student, which
+``examination.report_card_renderer`` draws as a PDF in a process pool.
+
+Cards are written under ``MEDIA_ROOT/report_cards/<term>/<classroom>/`` as
+``<admission number>.pdf``, with a ``<classroom>.zip`` bundle next to each
+classroom folder. Runs are resumable: cards that already exist are skipped
+(unless ``force`` is set) and files are renamed into place only once
+complete, so an interrupted run just picks up where it stopped.
+"""
+
+import os
+import zipfile
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+from django.conf import settings
+from django.db import connections
+from django.db.models import Count, Q
+from django.utils import timezone
+from django.utils.text import slugify
+
+from academic.models import StudentClass
+from administration.models import School
+from attendance.models import StudentAttendance
+from .models import ExaminationListHandler, GradeScale, MarksManagement, Result
+from .report_card_renderer import render_report_card
+
+OUTPUT_DIR = "report_cards"
+
+
+def _join(*names):
+    return " ".join(name for name in names if name)
+
+
+def _letter(rules, percent):
+    for rule in rules:
+        if rule.min_grade <= percent <= rule.max_grade:
+            return rule.letter_grade
+    return None
+
+
+def output_root(term):
+    return Path(settings.MEDIA_ROOT) / OUTPUT_DIR / slugify(str(term))
+
+
+def collect_report_cards(term, classroom=None):
+    """Return the data of every report card of ``term``, one dict per student."""
+    enrolments = StudentClass.objects.filter(
+        academic_year_id=term.academic_year_id, student__isnull=False
+    )
+    if classroom is not None:
+        enrolments = enrolments.filter(classroom=classroom)
+    enrolments = list(
+        enrolments.order_by("classroom_id", "student__admission_number").values(
+            "id",
+            "classroom_id",
+            "classroom__name__name",
+            "classroom__stream__name",
+            "student_id",
+            "student__admission_number",
+            "student__first_name",
+            "student__middle_name",
+            "student__last_name",
+        )
+    )
+    if not enrolments:
+        return []
+
+    exams = list(
+        ExaminationListHandler.objects.filter(
+            start_date__gte=term.start_date, start_date__lte=term.end_date
+        )
+        .order_by("start_date", "id")
+        .values("id", "name", "out_of")
+    )
+    out_of = {exam["id"]: exam["out_of"] for exam in exams}
+    exam_column = {exam["id"]: index for index, exam in enumerate(exams)}
+
+    enrolment_ids = [enrolment["id"] for enrolment in enrolments]
+    student_ids = [enrolment["student_id"] for enrolment in enrolments]
+
+    # enrolment -> subject -> one score per exam column
+    scores = defaultdict(dict)
+    for mark in MarksManagement.objects.filter(
+        exam_name_id__in=exam_column, student_id__in=enrolment_ids
+    ).values_list("student_id", "subject__name", "exam_name_id", "points_scored"):
+        enrolment_id, subject, exam_id, points = mark
+        row = scores[enrolment_id].setdefault(subject, [None] * len(exams))
+        row[exam_column[exam_id]] = points
+
+    grade_scale = GradeScale.objects.order_by("id").first()
+    rules = (
+        list(grade_scale.gradescalerule_set.order_by("-max_grade"))
+        if grade_scale
+        else []
+    )
+
+    attendance = {
+        row["student"]: row
+        for row in StudentAttendance.objects.filter(
+            student_id__in=student_ids,
+            date__gte=term.start_date,
+            date__lte=term.end_date,
+        )
+        .values("student")
+        .annotate(
+            absent=Count("id", filter=Q(status__absent=True)),
+            late=Count("id", filter=Q(status__late=True)),
+            excused=Count("id", filter=Q(status__excused=True)),
+        )
+    }
+    gpas = dict(
+        Result.objects.filter(term=term, student_id__in=student_ids).values_list(
+            "student_id", "gpa"
+        )
+    )
+    school = (
+        School.objects.filter(active=True).first()
+        or School.objects.first()
+        or School(name="", address="")
+    )
+    school_data = {
+        "name": school.name,
+        "address": school.address,
+        "telephone": school.telephone,
+        "email": school.school_email,
+    }
+
+    root = output_root(term)
+    generated_on = timezone.localdate().isoformat()
+    cards = []
+    for enrolment in enrolments:
+        subjects = []
+        percents = []
+        for subject, row in sorted(scores[enrolment["id"]].items()):
+            subject_percents = [
+                points * 100 / out_of[exam["id"]]
+                for points, exam in zip(row, exams)
+                if points is not None and out_of[exam["id"]]
+            ]
+            average = (
+                sum(subject_percents) / len(subject_percents)
+                if subject_percents
+                else None
+            )
+            if average is not None:
+                percents.append(average)
+            subjects.append(
+                {
+                    "name": subject,
+                    "scores": row,
+                    "average": average,
+                    "grade": _letter(rules, average) if average is not None else None,
+                }
+            )
+
+        classroom_name = _join(
+            enrolment["classroom__name__name"], enrolment["classroom__stream__name"]
+        )
+        counts = attendance.get(enrolment["student_id"], {})
+        cards.append(
+            {
+                "path": str(
+                    root
+                    / slugify(classroom_name)
+                    / f"{slugify(enrolment['student__admission_number'])}.pdf"
+                ),
+                "classroom_id": enrolment["classroom_id"],
+                "school": school_data,
+                "term": str(term),
+                "generated_on": generated_on,
+                "student": {
+                    "name": _join(
+                        enrolment["student__first_name"],
+                        enrolment["student__middle_name"],
+                        enrolment["student__last_name"],
+                    ),
+                    "admission_number": enrolment["student__admission_number"],
+                    "classroom": classroom_name,
+                },
+                "exams": [f"{exam['name']} (/{exam['out_of']})" for exam in exams],
+                "subjects": subjects,
+                "average": sum(percents) / len(percents) if percents else None,
+                "gpa": gpas.get(enrolment["student_id"]),
+                "attendance": {
+                    "absent": counts.get("absent", 0),
+                    "late": counts.get("late", 0),
+                    "excused": counts.get("excused", 0),
+                },
+                "position": None,
+                "class_size": 0,
+            }
+        )
+
+    _add_positions(cards)
+    return cards
+
+
+def _add_positions(cards):
+    """Rank students within their classroom by average (ties share a place)."""
+    by_classroom = defaultdict(list)
+    for card in cards:
+        by_classroom[card["classroom_id"]].append(card)
+    for classroom_cards in by_classroom.values():
+        ranked = sorted(
+            (card for card in classroom_cards if card["average"] is not None),
+            key=lambda card: card["average"],
+            reverse=True,
+        )
+        previous, position = None, 0
+        for index, card in enumerate(ranked, start=1):
+            if card["average"] != previous:
+                position, previous = index, card["average"]
+            card["position"] = position
+        for card in classroom_cards:
+            card["class_size"] = len(classroom_cards)
+
+
+def bundle_classroom(folder):
+    """Zip every card in ``folder`` into ``<folder>.zip`` and return its path."""
+    bundle = folder.with_suffix(".zip")
+    partial = bundle.with_suffix(".zip.part")
+    with zipfile.ZipFile(partial, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+        for pdf in sorted(folder.glob("*.pdf")):
+            archive.write(pdf, arcname=pdf.name)
+    os.replace(partial, bundle)
+    return bundle
+
+
+def generate_report_cards(
+    term, classroom=None, workers=None, force=False, progress=None
+):
+    """
+    Render the report cards of ``term`` (optionally one ``classroom``).
+
+    ``workers`` is the size of the process pool (default: one per CPU; 1
+    renders in this process). ``progress(done, total, path)`` is called
+    after every card. Returns ``(rendered, skipped, bundles)``.
+    """
+    cards = collect_report_cards(term, classroom)
+    folders = {Path(card["path"]).parent for card in cards}
+    for folder in folders:
+        folder.mkdir(parents=True, exist_ok=True)
+
+    pending = [card for card in cards if force or not os.path.exists(card["path"])]
+    skipped = len(cards) - len(pending)
+    changed = {Path(card["path"]).parent for card in pending}
+
+    done = 0
+    if workers == 1 or len(pending) <= 1:
+        for card in pending:
+            path = render_report_card(card)
+            done += 1
+            if progress:
+                progress(done, len(pending), path)
+    elif pending:
+        # Workers must not share this process's database connections.
+        connections.close_all()
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(render_report_card, card) for card in pending]
+            for future in as_completed(futures):
+                path = future.result()
+                done += 1
+                if progress:
+                    progress(done, len(pending), path)
+
+    bundles = [
+        bundle_classroom(folder)
+        for folder in sorted(folders)
+        if folder in changed or not folder.with_suffix(".zip").exists()
+    ]
+    return done, skipped, bundles
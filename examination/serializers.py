@@ -1,6 +1,7 @@
 from rest_framework import serializers
 
-from .models import GradeScale, GradeScaleRule
+from academic.models import Subject, Teacher
+from .models import ExaminationListHandler, GradeScale, GradeScaleRule
 
 
 class GradeScaleSerializer(serializers.ModelSerializer):
@@ -13,3 +14,23 @@ class GradeScaleRuleSerializer(serializers.ModelSerializer):
     class Meta:
         model = GradeScaleRule
         fields = "__all__"
+
+
+class MarkEntrySerializer(serializers.Serializer):
+    student = serializers.IntegerField(help_text="StudentClass id")
+    points_scored = serializers.FloatField()
+
+
+class MarksSheetSerializer(serializers.Serializer):
+    """One subject's marks for a whole class sheet of an exam."""
+
+    exam = serializers.PrimaryKeyRelatedField(
+        queryset=ExaminationListHandler.objects.all()
+    )
+    subject = serializers.PrimaryKeyRelatedField(queryset=Subject.objects.all())
+    teacher = serializers.PrimaryKeyRelatedField(
+        queryset=Teacher.objects.all(),
+        required=False,
+        help_text="Defaults to the teacher who is logged in.",
+    )
+    marks = MarkEntrySerializer(many=True, allow_empty=False)
@@ -1,3 +1,42 @@
+from datetime import date
+from unittest import mock
+
 from django.test import TestCase
+from rest_framework.test import APIClient
+
+from administration.access_log import AccessLogBuffer
+from administration.cache import get_version
+from users.models import CustomUser
+from .analytics import EXAM_VERSION_KEY
+from .models import ExaminationListHandler
+
+
+class ExamAnalyticsTests(TestCase):
+    def setUp(self):
+        self.exam = ExaminationListHandler.objects.create(
+            name="Midterm",
+            start_date=date(2026, 3, 1),
+            ends_date=date(2026, 3, 5),
+            out_of=100,
+        )
+
+    def test_parents_cannot_read_analytics(self):
+        # Keep the request's access log out of the process-wide buffer.
+        patcher = mock.patch("administration.access_log.buffer", AccessLogBuffer())
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        client = APIClient()
+        client.force_authenticate(
+            CustomUser.objects.create_user(
+                "parent@school.test", "secret", is_parent=True
+            )
+        )
+        response = client.get(f"/api/examination/exams/{self.exam.pk}/analytics/")
+        self.assertEqual(response.status_code, 403)
 
-# Create your tests here.
+    def test_changing_the_exam_invalidates_its_analytics(self):
+        key = EXAM_VERSION_KEY.format(exam_id=self.exam.pk)
+        version = get_version(key)
+        self.exam.out_of = 50
+        self.exam.save()
+        self.assertNotEqual(get_version(key), version)
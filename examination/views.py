@@ -1,3 +1,204 @@
-from django.shortcuts import render
+from django.http import JsonResponse
+from django.views.decorators.http import require_GET
+from django.shortcuts import get_object_or_404
+from rest_framework import status
+from rest_framework.exceptions import PermissionDenied, ValidationError
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.views import APIView
 
-# Create your views here.
+from academic.models import StudentClass
+from api.exports import ExportView, join_names
+from api.rows import Computed
+from users.authentication import async_jwt_required
+from users.permissions import IsTeacherOrAdmin
+from .analytics import default_grade_scale, exam_analytics, invalidate_exam
+from .models import ExaminationListHandler, GradeScale, MarksManagement, Result
+from .serializers import MarksSheetSerializer
+
+
+@require_GET
+@async_jwt_required
+async def student_results_async(request, pk):
+    """
+    List a student's results for the ASGI deployment, newest first.
+    """
+    results = [
+        result
+        async for result in Result.objects.filter(student_id=pk)
+        .order_by("-academic_year__start_date", "-term__start_date")
+        .values(
+            "id",
+            "student",
+            "gpa",
+            "cat_gpa",
+            "academic_year",
+            "academic_year__name",
+            "term",
+            "term__name",
+        )
+    ]
+    return JsonResponse(results, safe=False)
+
+
+class MarksExportView(ExportView):
+    """
+    Download exam marks as CSV or XLSX, filtered by ``?exam=`` and ``?subject=``.
+    """
+
+    filename = "marks"
+    columns = [
+        ("Exam", "exam_name__name"),
+        ("Out Of", "exam_name__out_of"),
+        ("Subject", "subject__name"),
+        ("Admission Number", "student__student__admission_number"),
+        (
+            "Student",
+            Computed(
+                join_names,
+                "student__student__first_name",
+                "student__student__middle_name",
+                "student__student__last_name",
+            ),
+        ),
+        (
+            "Class",
+            Computed(
+                join_names,
+                "student__classroom__name__name",
+                "student__classroom__stream__name",
+            ),
+        ),
+        ("Points Scored", "points_scored"),
+        (
+            "Entered By",
+            Computed(join_names, "created_by__first_name", "created_by__last_name"),
+        ),
+        ("Entered On", "date_time"),
+    ]
+
+    def get_queryset(self):
+        marks = MarksManagement.objects.order_by("exam_name_id", "subject_id", "id")
+        exam = self.request.query_params.get("exam")
+        if exam:
+            marks = marks.filter(exam_name_id=exam)
+        subject = self.request.query_params.get("subject")
+        if subject:
+            marks = marks.filter(subject_id=subject)
+        return marks
+
+
+class BulkMarksEntryView(APIView):
+    """
+    Save a subject's marks for a whole class sheet of an exam in one request.
+
+    Marks are checked against the exam's ``out_of`` and every student must
+    be a ``StudentClass`` of one of the exam's classrooms. Valid rows are
+    inserted, or update the existing mark for the same exam, subject and
+    student; the others are returned in ``not_saved``.
+
+    Teachers enter marks under their own name; only admins may name another
+    ``teacher``.
+    """
+
+    permission_classes = [IsTeacherOrAdmin]
+
+    def post(self, request):
+        serializer = MarksSheetSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        exam = serializer.validated_data["exam"]
+        subject = serializer.validated_data["subject"]
+        entries = serializer.validated_data["marks"]
+
+        own_teacher = getattr(request.user, "teacher", None)
+        teacher = serializer.validated_data.get("teacher") or own_teacher
+        if teacher != own_teacher and not request.user.is_staff:
+            raise PermissionDenied("Only admins can enter marks for another teacher.")
+        if teacher is None:
+            return Response(
+                {"teacher": ["Required when you are not logged in as a teacher."]},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        enrolled = set(
+            StudentClass.objects.filter(
+                id__in={entry["student"] for entry in entries},
+                classroom__in=exam.classrooms.values("id"),
+            ).values_list("id", flat=True)
+        )
+
+        marks = []
+        seen = set()
+        not_saved = []
+        for entry in entries:
+            if entry["student"] in seen:
+                error = "Student appears more than once in the sheet."
+            elif entry["student"] not in enrolled:
+                error = "Student is not in a classroom sitting this exam."
+            elif not 0 <= entry["points_scored"] <= exam.out_of:
+                error = f"Points scored must be between 0 and {exam.out_of}."
+            else:
+                error = None
+            if error:
+                not_saved.append({**entry, "error": error})
+                continue
+            seen.add(entry["student"])
+            marks.append(
+                MarksManagement(
+                    exam_name=exam,
+                    subject=subject,
+                    student_id=entry["student"],
+                    points_scored=entry["points_scored"],
+                    created_by=teacher,
+                )
+            )
+
+        MarksManagement.objects.bulk_create(
+            marks,
+            update_conflicts=True,
+            unique_fields=["exam_name", "subject", "student"],
+            update_fields=["points_scored", "created_by", "date_time"],
+        )
+        # bulk_create sends no signals
+        invalidate_exam(exam.pk)
+
+        return Response(
+            {
+                "message": f"{len(marks)} marks saved.",
+                "not_saved": not_saved,
+            },
+            status=status.HTTP_201_CREATED,
+        )
+
+
+class ExamAnalyticsView(APIView):
+    """
+    Subject and classroom statistics, grade distributions and rankings for
+    one exam.
+
+    ``?scale=`` picks the grade scale (default: the first one) and ``?top=``
+    how many students to rank (default 10, at most 100). Teachers and
+    admins only: it shows every student's scores.
+    """
+
+    permission_classes = [IsTeacherOrAdmin]
+
+    def get(self, request, pk):
+        exam = get_object_or_404(ExaminationListHandler, pk=pk)
+
+        scale_id = request.query_params.get("scale")
+        if scale_id:
+            try:
+                grade_scale = GradeScale.objects.get(pk=scale_id)
+            except (GradeScale.DoesNotExist, ValueError):
+                raise ValidationError({"scale": "Grade scale not found."})
+        else:
+            grade_scale = default_grade_scale()
+
+        try:
+            top = int(request.query_params.get("top", 10))
+        except ValueError:
+            raise ValidationError({"top": "A number is required."})
+        top = max(1, min(top, 100))
+
+        return Response(exam_analytics(exam, grade_scale, top))
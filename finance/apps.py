@@ -3,3 +3,10 @@ from django.apps import AppConfig
 
 class FinanceConfig(AppConfig):
     name = 'finance'
+
+    def ready(self):
+        from administration.cache import reference_cache
+        from .models import ReceiptAllocation, PaymentAllocation
+
+        reference_cache.register(ReceiptAllocation)
+        reference_cache.register(PaymentAllocation)
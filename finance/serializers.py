@@ -72,10 +72,26 @@ class ReceiptSerializer(serializers.ModelSerializer):
         return receipt
 
 
+class PaymentUserSerializer(UserSerializer):
+    """
+    The user a payment was made to, without the profile details.
+
+    Teacher and accountant details list the person's payments, so nesting
+    them here recursed forever for anyone who has been paid a salary.
+    """
+
+    class Meta(UserSerializer.Meta):
+        fields = [
+            field
+            for field in UserSerializer.Meta.fields
+            if not field.endswith("_details")
+        ]
+
+
 class PaymentSerializer(serializers.ModelSerializer):
     paid_for = PaymentAllocationSerializer(read_only=True)
     paid_by = AccountantSerializer(read_only=True)
-    user = UserSerializer(read_only=True)
+    user = PaymentUserSerializer(read_only=True)
     paid_for_id = serializers.PrimaryKeyRelatedField(
         queryset=PaymentAllocation.objects.all(), source="paid_for", write_only=True
     )
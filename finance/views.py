@@ -1,4 +1,5 @@
-from django.http import Http404
+from django.http import Http404, JsonResponse
+from django.views.decorators.http import require_GET
 from rest_framework import generics, permissions
 from rest_framework.pagination import PageNumberPagination
 from rest_framework.exceptions import NotFound
@@ -7,8 +8,9 @@ from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
 from academic.models import Student
-from administration.models import Term
-from django.utils.timezone import now
+from api.exports import ExportView, filter_dates, join_names
+from api.rows import Computed
+from users.authentication import async_jwt_required
 from .models import Receipt, Payment
 from .serializers import ReceiptSerializer, PaymentSerializer
 
@@ -93,10 +95,7 @@ class UpdateStudentDebtView(APIView):
     """
 
     def post(self, request, *args, **kwargs):
-        today = now().date()
-        current_term = Term.objects.filter(
-            start_date__lte=today, end_date__gte=today
-        ).first()
+        current_term = request.academic_context.term
 
         if not current_term:
             return Response(
@@ -110,3 +109,64 @@ class UpdateStudentDebtView(APIView):
         return Response(
             {"detail": "Student debts updated successfully."}, status=status.HTTP_200_OK
         )
+
+
+class ReceiptExportView(ExportView):
+    """
+    Download receipts as CSV or XLSX, filtered by ``?status=``,
+    ``?date_from=`` and ``?date_to=``.
+    """
+
+    filename = "receipts"
+    columns = [
+        ("Receipt No", "receipt_no"),
+        ("Date", "date"),
+        ("Payer", "payer"),
+        ("Paid For", "paid_for__name"),
+        ("Admission Number", "student__admission_number"),
+        (
+            "Student",
+            Computed(join_names, "student__first_name", "student__last_name"),
+        ),
+        ("Amount", "amount"),
+        ("Status", "status"),
+        (
+            "Received By",
+            Computed(join_names, "received_by__first_name", "received_by__last_name"),
+        ),
+    ]
+
+    def get_queryset(self):
+        receipts = filter_dates(
+            Receipt.objects.order_by("date", "receipt_no"), self.request
+        )
+        status_query = self.request.query_params.get("status")
+        if status_query:
+            receipts = receipts.filter(status=status_query)
+        return receipts
+
+
+@require_GET
+@async_jwt_required
+async def student_receipts_async(request, pk):
+    """
+    List a student's receipts for the ASGI deployment, newest first.
+    """
+    receipts = [
+        receipt
+        async for receipt in Receipt.objects.filter(student_id=pk)
+        .order_by("-date", "-receipt_no")
+        .values(
+            "id",
+            "receipt_no",
+            "date",
+            "payer",
+            "paid_for",
+            "paid_for__name",
+            "student",
+            "amount",
+            "status",
+            "received_by",
+        )
+    ]
+    return JsonResponse(receipts, safe=False)
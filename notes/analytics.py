@@ -0,0 +1,141 @@
+"""
+Item analysis of assignment results.
+
+From the stored ``AssignmentResponse`` rows this reports, for every question
+of an assignment:
+
+* the difficulty index: the share of students who answered it correctly;
+* the discrimination index: that share in the top 27% of students by score
+  minus the share in the bottom 27%, so a question the strong students get
+  right and the weak ones miss scores close to 1, and a negative value
+  flags a question worth reviewing;
+* how often each choice was picked overall and in both groups, which shows
+  the distractors that draw students away from the answer.
+
+Scores, per-question counts and choice counts each come from one grouped
+aggregate query. The result is cached per assignment until a submission
+comes in or the questions change.
+"""
+
+from django.core.cache import cache
+from django.db.models import Count, F, Q
+
+from administration.cache import get_version
+from .grading import RESPONSES_VERSION_KEY, VERSION_KEY, get_answer_key
+from .models import AssignmentResponse, Question
+
+DATA_KEY = "analytics:assignment:{assignment_id}:{version}"
+CACHE_TIMEOUT = 60 * 60 * 6
+GROUP_SHARE = 0.27
+
+
+def _round(value, digits=3):
+    return None if value is None else round(value, digits)
+
+
+def score_groups(responses):
+    """
+    Return the student ids of the top and bottom groups by number of right
+    answers, and how many students responded.
+    """
+    scores = list(
+        responses.values("student_id")
+        .annotate(score=Count("id", filter=Q(choice_id=F("question__answer_id"))))
+        .order_by("-score", "student_id")
+        .values_list("student_id", flat=True)
+    )
+    size = max(1, round(len(scores) * GROUP_SHARE)) if scores else 0
+    return scores[:size], scores[len(scores) - size :], len(scores)
+
+
+def item_analysis(assignment):
+    """Difficulty, discrimination and choice counts of every question."""
+    version = "-".join(
+        str(get_version(key.format(assignment_id=assignment.pk)))
+        for key in (VERSION_KEY, RESPONSES_VERSION_KEY)
+    )
+    key = DATA_KEY.format(assignment_id=assignment.pk, version=version)
+    data = cache.get(key)
+    if data is not None:
+        return data
+
+    responses = AssignmentResponse.objects.filter(assignment=assignment)
+    upper, lower, students = score_groups(responses)
+    in_upper = Q(student_id__in=upper)
+    in_lower = Q(student_id__in=lower)
+    correct = Q(choice_id=F("question__answer_id"))
+
+    per_question = {
+        row["question_id"]: row
+        for row in responses.values("question_id").annotate(
+            responses=Count("id"),
+            skipped=Count("id", filter=Q(choice__isnull=True)),
+            correct=Count("id", filter=correct),
+            upper_correct=Count("id", filter=correct & in_upper),
+            lower_correct=Count("id", filter=correct & in_lower),
+        )
+    }
+    per_choice = {
+        (row["question_id"], row["choice_id"]): row
+        for row in responses.filter(choice__isnull=False)
+        .values("question_id", "choice_id")
+        .annotate(
+            count=Count("id"),
+            upper=Count("id", filter=in_upper),
+            lower=Count("id", filter=in_lower),
+        )
+    }
+
+    answer_key = get_answer_key(assignment.pk)
+    texts = dict(
+        Question.objects.filter(assignment=assignment).values_list("id", "question")
+    )
+    questions = []
+    for index, (question_id, answer_id) in enumerate(answer_key.questions):
+        row = per_question.get(question_id, {})
+        answered = row.get("responses", 0)
+        titles = {
+            choice_id: title for title, choice_id in answer_key.titles[index].items()
+        }
+        choices = []
+        for choice_id in answer_key.choice_ids[index]:
+            counts = per_choice.get((question_id, choice_id), {})
+            choices.append(
+                {
+                    "id": choice_id,
+                    "title": titles.get(choice_id),
+                    "correct": choice_id == answer_id,
+                    "count": counts.get("count", 0),
+                    "share": (
+                        _round(counts.get("count", 0) / answered) if answered else None
+                    ),
+                    "upper": counts.get("upper", 0),
+                    "lower": counts.get("lower", 0),
+                }
+            )
+        questions.append(
+            {
+                "id": question_id,
+                "position": index,
+                "question": texts.get(question_id),
+                "responses": answered,
+                "skipped": row.get("skipped", 0),
+                "correct": row.get("correct", 0),
+                "difficulty": _round(row["correct"] / answered) if answered else None,
+                "discrimination": (
+                    _round((row["upper_correct"] - row["lower_correct"]) / len(upper))
+                    if answered and upper
+                    else None
+                ),
+                "choices": choices,
+            }
+        )
+
+    data = {
+        "assignment": {"id": assignment.pk, "title": assignment.title},
+        "students": students,
+        "group_size": len(upper),
+        "questions": questions,
+    }
+    cache.set(key, data, timeout=CACHE_TIMEOUT)
+    return data
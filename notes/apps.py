@@ -3,3 +3,52 @@ from django.apps import AppConfig
 
 class NotesConfig(AppConfig):
     name = 'notes'
+
+    def ready(self):
+        from django.db.models.signals import (
+            m2m_changed,
+            post_delete,
+            post_save,
+            pre_delete,
+        )
+
+        from .grading import (
+            QuestionChoice,
+            _choice_changed,
+            _question_changed,
+            _question_choices_changed,
+            _response_changed,
+        )
+        from .models import AssignmentResponse, Choice, Question
+
+        # Compiled answer keys are dropped when their questions or choices change
+        post_save.connect(
+            _question_changed, sender=Question, dispatch_uid="grading-question-save"
+        )
+        post_delete.connect(
+            _question_changed, sender=Question, dispatch_uid="grading-question-delete"
+        )
+        post_save.connect(
+            _choice_changed, sender=Choice, dispatch_uid="grading-choice-save"
+        )
+        # Before the delete, while the choice's question links still exist
+        pre_delete.connect(
+            _choice_changed, sender=Choice, dispatch_uid="grading-choice-delete"
+        )
+        m2m_changed.connect(
+            _question_choices_changed,
+            sender=QuestionChoice,
+            dispatch_uid="grading-question-choices",
+        )
+
+        # Cached item analysis is dropped when answers change
+        post_save.connect(
+            _response_changed,
+            sender=AssignmentResponse,
+            dispatch_uid="analysis-response-save",
+        )
+        post_delete.connect(
+            _response_changed,
+            sender=AssignmentResponse,
+            dispatch_uid="analysis-response-delete",
+        )
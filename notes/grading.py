@@ -0,0 +1,251 @@
+"""
+Assignment grading against compiled answer keys.
+
+An assignment's answer key is compiled once from two queries: its questions
+in order, with their correct choice, and the choices of every question in
+the order they were added. Grading a submission is then a walk over the
+key with no queries at all, which matters when a whole class hands in at
+the end of a lesson.
+
+Submitted answers are matched by question position, not by the order of
+the keys in the payload: either a list (one answer per question, ``None``
+for a skipped one) or a dict keyed by the 0-based position. An answer is
+the position of the picked choice within its question or the choice's
+title, the same way answers are given when the assignment is authored.
+
+Keys are cached per assignment under a version counter that is bumped when
+one of its questions, or a choice of one of them, is saved or deleted, or
+when the choices of a question change.
+
+``record_submissions`` stores each student's grade and, as one
+``AssignmentResponse`` row per question, the choice they picked, which is
+what ``notes.analytics`` analyses.
+"""
+
+from django.core.cache import cache
+from django.db import transaction
+
+from administration.cache import bump_version, get_version
+from .models import AssignmentResponse, Choice, GradedAssignment, Question
+
+VERSION_KEY = "grading:assignment:{assignment_id}:version"
+RESPONSES_VERSION_KEY = "grading:assignment:{assignment_id}:responses:version"
+DATA_KEY = "grading:assignment:{assignment_id}:{version}"
+CACHE_TIMEOUT = 60 * 60 * 24
+
+QuestionChoice = Question.choices.through
+
+
+def invalidate_answer_key(assignment_id):
+    """Drop the compiled answer key of one assignment."""
+    if assignment_id is not None:
+        bump_version(VERSION_KEY.format(assignment_id=assignment_id))
+
+
+def invalidate_item_analysis(assignment_id):
+    """Drop the cached item analysis of one assignment."""
+    bump_version(RESPONSES_VERSION_KEY.format(assignment_id=assignment_id))
+
+
+def _response_changed(sender, instance, **kwargs):
+    invalidate_item_analysis(instance.assignment_id)
+
+
+def _invalidate_assignments(question_ids):
+    assignment_ids = set(
+        Question.objects.filter(id__in=question_ids).values_list(
+            "assignment_id", flat=True
+        )
+    )
+    for assignment_id in assignment_ids:
+        invalidate_answer_key(assignment_id)
+
+
+def _question_changed(sender, instance, **kwargs):
+    invalidate_answer_key(instance.assignment_id)
+
+
+def _choice_changed(sender, instance, **kwargs):
+    # Also runs on pre_delete, while the choice still has its question links.
+    _invalidate_assignments(
+        QuestionChoice.objects.filter(choice_id=instance.pk).values("question_id")
+    )
+
+
+def _question_choices_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    if not reverse:
+        if action.startswith("post_"):
+            invalidate_answer_key(instance.assignment_id)
+    elif action == "pre_clear":
+        _choice_changed(Choice, instance)
+    elif action in ("post_add", "post_remove"):
+        _invalidate_assignments(pk_set)
+
+
+class AnswerKey:
+    """The questions of an assignment in order, with their choices."""
+
+    def __init__(self, questions, choices):
+        # questions: (question id, correct choice id) in order
+        # choices: (question id, choice id, title) in the order they were added
+        self.questions = tuple(questions)
+        by_question = {question_id: ([], []) for question_id, _ in self.questions}
+        for question_id, choice_id, title in choices:
+            if question_id in by_question:
+                by_question[question_id][0].append(choice_id)
+                by_question[question_id][1].append(title)
+        self.choice_ids = tuple(
+            tuple(by_question[question_id][0]) for question_id, _ in self.questions
+        )
+        self.titles = tuple(
+            {title: choice_id for choice_id, title in zip(*by_question[question_id])}
+            for question_id, _ in self.questions
+        )
+
+    def __len__(self):
+        return len(self.questions)
+
+    def resolve(self, index, answer):
+        """Return the id of the choice ``answer`` picks for question ``index``."""
+        if isinstance(answer, int) and not isinstance(answer, bool):
+            if 0 <= answer < len(self.choice_ids[index]):
+                return self.choice_ids[index][answer]
+            return None
+        if isinstance(answer, str):
+            return self.titles[index].get(answer)
+        return None
+
+    def responses(self, answers):
+        """
+        Return the ``(question id, choice id)`` of every question, in order;
+        the choice id is ``None`` when the question was skipped or the answer
+        is not one of its choices.
+        """
+        by_position = _by_position(answers, len(self))
+        return [
+            (question_id, self.resolve(index, by_position.get(index)))
+            for index, (question_id, _) in enumerate(self.questions)
+        ]
+
+    def score(self, responses):
+        """Return ``(grade, correct)`` of the ``responses`` to these questions."""
+        correct = sum(
+            choice_id is not None and choice_id == answer_id
+            for (_, choice_id), (_, answer_id) in zip(responses, self.questions)
+        )
+        grade = correct / len(self) * 100 if self.questions else 0
+        return grade, correct
+
+    def grade(self, answers):
+        """Return ``(grade, correct)``: the percentage and count of right answers."""
+        return self.score(self.responses(answers))
+
+
+def _by_position(answers, count):
+    if isinstance(answers, (list, tuple)):
+        return dict(enumerate(answers[:count]))
+    by_position = {}
+    for key, answer in (answers or {}).items():
+        try:
+            index = int(key)
+        except (TypeError, ValueError):
+            continue
+        if 0 <= index < count:
+            by_position[index] = answer
+    return by_position
+
+
+def compile_answer_key(assignment_id):
+    questions = Question.objects.filter(assignment_id=assignment_id).order_by(
+        "order", "id"
+    )
+    return AnswerKey(
+        questions.values_list("id", "answer_id"),
+        QuestionChoice.objects.filter(question__assignment_id=assignment_id)
+        .order_by("id")
+        .values_list("question_id", "choice_id", "choice__title"),
+    )
+
+
+def get_answer_key(assignment_id):
+    """Return the compiled answer key of an assignment."""
+    version = get_version(VERSION_KEY.format(assignment_id=assignment_id))
+    key = DATA_KEY.format(assignment_id=assignment_id, version=version)
+    answer_key = cache.get(key)
+    if answer_key is None:
+        answer_key = compile_answer_key(assignment_id)
+        cache.set(key, answer_key, timeout=CACHE_TIMEOUT)
+    return answer_key
+
+
+def save_grades(assignment_id, grades):
+    """
+    Store ``{student id: grade}`` for an assignment, replacing any grade a
+    student already has for it. Returns the saved ``GradedAssignment`` rows.
+    """
+    existing = {}
+    for graded in GradedAssignment.objects.filter(
+        assignment_id=assignment_id, student_id__in=grades
+    ).order_by("id"):
+        existing.setdefault(graded.student_id, graded)
+
+    updated = []
+    created = []
+    for student_id, grade in grades.items():
+        graded = existing.get(student_id)
+        if graded is None:
+            created.append(
+                GradedAssignment(
+                    assignment_id=assignment_id, student_id=student_id, grade=grade
+                )
+            )
+        else:
+            graded.grade = grade
+            updated.append(graded)
+    GradedAssignment.objects.bulk_update(updated, ["grade"])
+    GradedAssignment.objects.bulk_create(created)
+    return updated + created
+
+
+def save_responses(assignment_id, responses):
+    """
+    Store every student's ``(question id, choice id)`` answers from
+    ``{student id: responses}``, replacing their earlier answers.
+    """
+    AssignmentResponse.objects.bulk_create(
+        [
+            AssignmentResponse(
+                assignment_id=assignment_id,
+                student_id=student_id,
+                question_id=question_id,
+                choice_id=choice_id,
+            )
+            for student_id, student_responses in responses.items()
+            for question_id, choice_id in student_responses
+        ],
+        update_conflicts=True,
+        unique_fields=["assignment", "student", "question"],
+        update_fields=["choice"],
+    )
+
+
+@transaction.atomic
+def record_submissions(assignment_id, submissions):
+    """
+    Grade ``{student id: answers}`` against the assignment's answer key and
+    store each student's grade and answers. Returns ``{student id: (grade,
+    correct)}``.
+    """
+    answer_key = get_answer_key(assignment_id)
+    results = {}
+    responses = {}
+    for student_id, answers in submissions.items():
+        responses[student_id] = answer_key.responses(answers)
+        results[student_id] = answer_key.score(responses[student_id])
+    save_grades(
+        assignment_id, {student_id: grade for student_id, (grade, _) in results.items()}
+    )
+    save_responses(assignment_id, responses)
+    # bulk writes send no signals
+    invalidate_item_analysis(assignment_id)
+    return results
@@ -0,0 +1,28 @@
+# Generated by Django 5.1 on 2026-10-19 02:50
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('academic', '0010_allocatedsubject_term_foreign_key'),
+        ('notes', '0002_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AssignmentResponse',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('assignment', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='responses', to='notes.assignment')),
+                ('choice', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, to='notes.choice')),
+                ('question', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='notes.question')),
+                ('student', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='academic.student')),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('assignment', 'student', 'question'), name='unique_assignment_student_question_response')],
+            },
+        ),
+    ]
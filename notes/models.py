@@ -49,6 +49,28 @@ class Question(models.Model):
         return self.question
 
 
+class AssignmentResponse(models.Model):
+    """The choice one student picked for one question (``None`` if skipped)."""
+
+    assignment = models.ForeignKey(
+        Assignment, on_delete=models.CASCADE, related_name="responses"
+    )
+    student = models.ForeignKey(Student, on_delete=models.CASCADE)
+    question = models.ForeignKey(Question, on_delete=models.CASCADE)
+    choice = models.ForeignKey(Choice, on_delete=models.SET_NULL, blank=True, null=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["assignment", "student", "question"],
+                name="unique_assignment_student_question_response",
+            )
+        ]
+
+    def __str__(self):
+        return f"{self.student} {self.question}"
+
+
 class SpecificExplanations(models.Model):
     sub_topic = models.ForeignKey(
         SubTopic, on_delete=models.CASCADE, blank=True, null=True
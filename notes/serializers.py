@@ -1,6 +1,9 @@
+from django.db import transaction
 from rest_framework import serializers
 
+from academic.models import Student
 from users.models import CustomUser as User
+from .grading import record_submissions
 from .models import (
     Assignment,
     Question,
@@ -36,31 +39,78 @@ class AssignmentSerializer(serializers.ModelSerializer):
 
     def create(self, request):
         data = request.data
-
-        assignment = Assignment()
-        teacher = User.objects.get(username=data["teacher"])
-        assignment.teacher = teacher
-        assignment.title = data["title"]
-        assignment.save()
-
-        order = 1
-        for q in data["questions"]:
-            newQ = Question()
-            newQ.question = q["title"]
-            newQ.order = order
-            newQ.save()
-
-            for c in q["choices"]:
-                newC = Choice()
-                newC.title = c
-                newC.save()
-                newQ.choices.add(newC)
-
-            newQ.answer = Choice.objects.get(title=q["answer"])
-            newQ.assignment = assignment
-            newQ.save()
-            order += 1
-        return assignment
+        # Teachers are given as they are serialized: by email. Accounts have
+        # no username, so the previous ``username`` lookup could never match.
+        teacher = request.user
+        if data.get("teacher"):
+            teacher = User.objects.filter(email=data["teacher"]).first()
+            if teacher is None:
+                raise serializers.ValidationError({"teacher": "Unknown teacher."})
+        elif not teacher.is_authenticated:
+            raise serializers.ValidationError({"teacher": "A teacher is required."})
+        return create_assignment(teacher, data["title"], data["questions"])
+
+
+def _resolve_answer(answer, choices):
+    """
+    Return the index of ``answer`` in one question's ``choices``.
+
+    ``answer`` is either the position of the correct choice or its title;
+    titles are only matched within the question's own choices.
+    """
+    if isinstance(answer, int) and not isinstance(answer, bool):
+        if 0 <= answer < len(choices):
+            return answer
+    elif answer in choices:
+        return choices.index(answer)
+    return None
+
+
+@transaction.atomic
+def create_assignment(teacher, title, questions):
+    """
+    Create an assignment with its questions and choices in a fixed number of
+    queries, however many questions it has: the choices, the questions and
+    the question-choice links are each written with a single insert.
+    """
+    choices = []
+    answers = []
+    errors = {}
+    for index, question in enumerate(questions):
+        titles = list(question["choices"])
+        answer = _resolve_answer(question.get("answer"), titles)
+        if answer is None:
+            errors[index] = "The answer must be one of the question's choices."
+        answers.append(answer)
+        choices.append([Choice(title=choice) for choice in titles])
+    if errors:
+        raise serializers.ValidationError({"questions": errors})
+
+    assignment = Assignment.objects.create(teacher=teacher, title=title)
+    Choice.objects.bulk_create(
+        [choice for question_choices in choices for choice in question_choices]
+    )
+    new_questions = Question.objects.bulk_create(
+        [
+            Question(
+                question=question["title"],
+                order=order,
+                answer=question_choices[answer],
+                assignment=assignment,
+            )
+            for order, (question, question_choices, answer) in enumerate(
+                zip(questions, choices, answers), start=1
+            )
+        ]
+    )
+    Question.choices.through.objects.bulk_create(
+        [
+            Question.choices.through(question_id=question.pk, choice_id=choice.pk)
+            for question, question_choices in zip(new_questions, choices)
+            for choice in question_choices
+        ]
+    )
+    return assignment
 
 
 class GradedAssignmentSerializer(serializers.ModelSerializer):
@@ -72,25 +122,32 @@ class GradedAssignmentSerializer(serializers.ModelSerializer):
 
     def create(self, request):
         data = request.data
-        print(data)
 
-        assignment = Assignment.objects.get(id=data["asntId"])
-        student = User.objects.get(username=data["username"])
-
-        graded_asnt = GradedAssignment()
-        graded_asnt.assignment = assignment
-        graded_asnt.student = student
-
-        questions = [q for q in assignment.questions.all()]
-        answers = [data["answers"][a] for a in data["answers"]]
+        assignment = Assignment.objects.filter(id=data["asntId"]).first()
+        if assignment is None:
+            raise serializers.ValidationError({"asntId": "Unknown assignment."})
+        # Students have no username; they are given by id.
+        student = Student.objects.filter(id=data.get("student")).first()
+        if student is None:
+            raise serializers.ValidationError({"student": "Unknown student."})
+
+        record_submissions(assignment.pk, {student.pk: data["answers"]})
+        return GradedAssignment.objects.filter(
+            assignment=assignment, student=student
+        ).first()
+
+
+class SubmissionSerializer(serializers.Serializer):
+    student = serializers.IntegerField()
+    answers = serializers.JSONField()
+
+    def validate_answers(self, value):
+        if not isinstance(value, (list, dict)):
+            raise serializers.ValidationError(
+                "Give a list of answers or a dict keyed by question position."
+            )
+        return value
 
-        answered_correct_count = 0
-        for i in range(len(questions)):
-            if questions[i].answer.title == answers[i]:
-                answered_correct_count += 1
-            i += 1
 
-        grade = answered_correct_count / len(questions) * 100
-        graded_asnt.grade = grade
-        graded_asnt.save()
-        return graded_asnt
+class GradingSheetSerializer(serializers.Serializer):
+    submissions = SubmissionSerializer(many=True, allow_empty=False)
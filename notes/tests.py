@@ -1,3 +1,43 @@
+from unittest import mock
+
 from django.test import TestCase
+from rest_framework.test import APIClient
+
+from administration.access_log import AccessLogBuffer
+from users.models import CustomUser
+
+
+class BulkGradeAssignmentTests(TestCase):
+    def setUp(self):
+        # Keep the requests' access logs out of the process-wide buffer.
+        patcher = mock.patch("administration.access_log.buffer", AccessLogBuffer())
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.client = APIClient()
+
+    def test_non_teachers_cannot_grade(self):
+        for email, flags in (
+            ("parent@school.test", {"is_parent": True}),
+            ("user@school.test", {}),
+        ):
+            self.client.force_authenticate(
+                CustomUser.objects.create_user(email, "secret", **flags)
+            )
+            response = self.client.post(
+                "/api/assignments/1/grade/", {"submissions": []}, format="json"
+            )
+            self.assertEqual(response.status_code, 403, email)
+
+
+class AssignmentCreateTests(TestCase):
+    def setUp(self):
+        # Keep the requests' access logs out of the process-wide buffer.
+        patcher = mock.patch("administration.access_log.buffer", AccessLogBuffer())
+        patcher.start()
+        self.addCleanup(patcher.stop)
 
-# Create your tests here.
+    def test_anonymous_users_cannot_create_assignments(self):
+        response = APIClient().post(
+            "/api/assignments/", {"title": "Quiz", "questions": []}, format="json"
+        )
+        self.assertEqual(response.status_code, 401)
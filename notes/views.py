@@ -1,8 +1,15 @@
+from django.shortcuts import get_object_or_404
 from rest_framework import viewsets
 from rest_framework.generics import ListAPIView, CreateAPIView
+from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.status import HTTP_201_CREATED, HTTP_400_BAD_REQUEST
+from rest_framework.views import APIView
 
+from academic.models import Student
+from users.permissions import IsTeacherOrAdmin, IsTeacherOrAdminOrReadOnly
+from .analytics import item_analysis
+from .grading import record_submissions
 from .models import *
 from .serializers import *
 
@@ -10,6 +17,7 @@ from .serializers import *
 class AssignmentViewSet(viewsets.ModelViewSet):
     serializer_class = AssignmentSerializer
     queryset = Assignment.objects.all()
+    permission_classes = [IsTeacherOrAdminOrReadOnly]
 
     def create(self, request):
         serializer = AssignmentSerializer(data=request.data)
@@ -43,3 +51,68 @@ class GradedAssignmentCreateView(CreateAPIView):
         if graded_assignment:
             return Response(status=HTTP_201_CREATED)
         return Response(status=HTTP_400_BAD_REQUEST)
+
+
+class BulkGradeAssignmentView(APIView):
+    """
+    Grade a whole class's submissions of an assignment in one request.
+
+    Every submission is graded in memory against the assignment's compiled
+    answer key, and the grades and answers are saved together, replacing
+    those the same student handed in earlier. Submissions of unknown
+    students, or repeated ones, are returned in ``not_graded``.
+    """
+
+    permission_classes = [IsTeacherOrAdmin]
+
+    def post(self, request, pk):
+        assignment = get_object_or_404(Assignment, pk=pk)
+        serializer = GradingSheetSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        submissions = serializer.validated_data["submissions"]
+
+        known = set(
+            Student.objects.filter(
+                id__in={submission["student"] for submission in submissions}
+            ).values_list("id", flat=True)
+        )
+
+        answers = {}
+        not_graded = []
+        for submission in submissions:
+            if submission["student"] in answers:
+                error = "Student appears more than once in the submissions."
+            elif submission["student"] not in known:
+                error = "Unknown student."
+            else:
+                error = None
+            if error:
+                not_graded.append({"student": submission["student"], "error": error})
+                continue
+            answers[submission["student"]] = submission["answers"]
+
+        results = record_submissions(assignment.pk, answers)
+        return Response(
+            {
+                "message": f"{len(results)} submissions graded.",
+                "grades": [
+                    {"student": student_id, "grade": grade, "correct": correct}
+                    for student_id, (grade, correct) in results.items()
+                ],
+                "not_graded": not_graded,
+            },
+            status=HTTP_201_CREATED,
+        )
+
+
+class ItemAnalysisView(APIView):
+    """
+    Difficulty and discrimination of every question of an assignment, and
+    how often each of its choices was picked.
+    """
+
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, pk):
+        assignment = get_object_or_404(Assignment, pk=pk)
+        return Response(item_analysis(assignment))
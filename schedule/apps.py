@@ -3,3 +3,14 @@ from django.apps import AppConfig
 
 class ScheduleConfig(AppConfig):
     name = 'schedule'
+
+    def ready(self):
+        from administration.cache import track_m2m_versions, track_model_versions
+        from academic.models import AllocatedSubject, Teacher
+        from .models import Period
+
+        # Timetable grids are rebuilt when these change (see schedule.timetable)
+        track_model_versions(Period, AllocatedSubject)
+        # and the availability index when specializations do
+        track_model_versions(Teacher.subject_specialization.through)
+        track_m2m_versions(Teacher.subject_specialization.through)
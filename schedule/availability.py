@@ -0,0 +1,180 @@
+"""
+Teacher availability index and substitute finder.
+
+For every teacher the index holds one integer per weekday whose bits mark
+the timetable slots (see ``schedule.timetable``) the teacher is teaching,
+together with their subject specializations. Finding who is free for a
+period is then a bit test per teacher rather than a query.
+
+The index is built from the cached timetable grids and stored under the
+version counters of everything it reads, so a change to a period, an
+allocation, a teacher or a teacher's specializations rebuilds it on the
+next lookup.
+"""
+
+import threading
+
+from django.core.cache import cache
+
+from academic.models import Teacher
+from attendance.models import TeachersAttendance
+from administration.cache import get_model_version
+from .models import WEEKDAYS
+from .timetable import TIMETABLE_MODELS, current_term_id, get_timetable
+
+SpecializationLink = Teacher.subject_specialization.through
+
+AVAILABILITY_MODELS = TIMETABLE_MODELS + (SpecializationLink,)
+
+DATA_KEY = "timetable:availability:{term}:{version}"
+CACHE_TIMEOUT = 60 * 60 * 24
+
+_local = {}
+_lock = threading.Lock()
+
+
+class AvailabilityIndex:
+    """Busy-slot bitmaps and specializations of every active teacher."""
+
+    def __init__(self, timetable, teachers, specializations):
+        self.slots = timetable["slots"]
+        self.names = {}
+        self.busy = {}
+        self.subjects = {}
+        for teacher in teachers:
+            teacher_id = teacher["id"]
+            self.names[teacher_id] = " ".join(
+                name for name in (teacher["first_name"], teacher["last_name"]) if name
+            )
+            self.busy[teacher_id] = dict.fromkeys(WEEKDAYS, 0)
+            self.subjects[teacher_id] = frozenset()
+
+        for teacher_id, subject_id in specializations:
+            if teacher_id in self.subjects:
+                self.subjects[teacher_id] |= {subject_id}
+
+        for teacher_id, entry in timetable["teachers"].items():
+            if teacher_id not in self.busy:
+                continue
+            for day, cells in entry["grid"].items():
+                bits = 0
+                for index, cell in enumerate(cells):
+                    if cell is not None:
+                        bits |= 1 << index
+                self.busy[teacher_id][day] = bits
+
+        self.weekly_load = {
+            teacher_id: sum(bits.bit_count() for bits in week.values())
+            for teacher_id, week in self.busy.items()
+        }
+
+    def load(self, teacher_id, day=None):
+        """Periods taught on ``day``, or over the whole week."""
+        if day is not None:
+            return self.busy[teacher_id][day].bit_count()
+        return self.weekly_load[teacher_id]
+
+    def substitutes(self, day, slot_index, subject_id, exclude=(), limit=None):
+        """
+        Teachers free at ``slot_index`` on ``day``, best first: those who
+        teach ``subject_id``, then the least loaded that day and that week.
+        """
+        bit = 1 << slot_index
+        ranked = sorted(
+            (
+                subject_id not in self.subjects[teacher_id],
+                week[day].bit_count(),
+                self.weekly_load[teacher_id],
+                self.names[teacher_id],
+                teacher_id,
+            )
+            for teacher_id, week in self.busy.items()
+            if teacher_id not in exclude and not week[day] & bit
+        )
+        return [
+            {
+                "id": teacher_id,
+                "name": name,
+                "subject_match": not no_match,
+                "periods_today": today,
+                "periods_this_week": this_week,
+            }
+            for no_match, today, this_week, name, teacher_id in ranked[:limit]
+        ]
+
+
+def availability_version():
+    return "-".join(str(get_model_version(model)) for model in AVAILABILITY_MODELS)
+
+
+def get_availability():
+    """Return the current term's index, building it only after a change."""
+    term_id = current_term_id()
+    version = (term_id, availability_version())
+    local = _local.get("availability")
+    if local is not None and local[0] == version:
+        return local[1]
+
+    key = DATA_KEY.format(term=term_id, version=version[1])
+    index = cache.get(key)
+    if index is None:
+        index = AvailabilityIndex(
+            get_timetable(),
+            Teacher.objects.filter(inactive=False).values(
+                "id", "first_name", "last_name"
+            ),
+            SpecializationLink.objects.values_list("teacher_id", "subject_id"),
+        )
+        cache.set(key, index, timeout=CACHE_TIMEOUT)
+
+    with _lock:
+        _local["availability"] = (version, index)
+    return index
+
+
+def absent_teacher_ids(date):
+    """Teachers recorded with an absent status on ``date``."""
+    return set(
+        TeachersAttendance.objects.filter(date=date, status__absent=True).values_list(
+            "teacher_id", flat=True
+        )
+    )
+
+
+def find_substitutes(teacher_id, date, limit=5):
+    """
+    Rank substitutes for each period ``teacher_id`` teaches on ``date``,
+    which must fall in the current term: its timetable is the one used.
+
+    Teachers who are themselves absent that day are left out.
+    """
+    if date.weekday() >= len(WEEKDAYS):
+        return []
+    day = WEEKDAYS[date.weekday()]
+    teacher = get_timetable()["teachers"].get(teacher_id)
+    if teacher is None:
+        return []
+
+    index = get_availability()
+    exclude = absent_teacher_ids(date) | {teacher_id}
+    periods = []
+    for slot_index, cell in enumerate(teacher["grid"][day]):
+        if cell is None:
+            continue
+        slot = index.slots[slot_index]
+        substitutes = index.substitutes(
+            day, slot_index, cell["subject_id"], exclude, limit
+        )
+        periods.append(
+            {
+                "period": cell["period"],
+                "start_time": slot["start_time"],
+                "end_time": slot["end_time"],
+                "subject_id": cell["subject_id"],
+                "subject": cell["subject"],
+                "classroom_id": cell["classroom_id"],
+                "classroom": cell["classroom"],
+                "substitutes": substitutes,
+            }
+        )
+    return periods
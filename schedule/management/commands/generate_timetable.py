@@ -1,81 +1,81 @@
 # timetable/management/commands/generate_timetable.py
 from django.core.management.base import BaseCommand
-from datetime import time, timedelta
+from django.db import transaction
+from django.db.models import F
+
 from academic.models import AllocatedSubject
+from administration.cache import bump_model_version
+from administration.context import get_academic_context
 from schedule.models import Period
-from administration.models import Term
+from schedule.scheduler import (
+    Bookings,
+    build_slots,
+    place_periods,
+)
 
 
 class Command(BaseCommand):
     help = "Generate a timetable for the school learning days with a break after the fourth period."
 
     def handle(self, *args, **kwargs):
-        days = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday"]
-        period_duration = 40
-        break_duration = 20
-        periods_per_day = 8
-
-        current_term = Term.objects.filter(is_current=True).first()
+        current_term = get_academic_context().term
         if not current_term:
             self.stdout.write(self.style.ERROR("No current term set."))
             return
 
-        allocated_subjects = AllocatedSubject.objects.filter(term=current_term)
-        if not allocated_subjects.exists():
+        allocated_subjects = list(
+            AllocatedSubject.objects.filter(term=current_term)
+            .order_by("id")
+            .values(
+                "id",
+                "weekly_periods",
+                "max_daily_periods",
+                teacher_id=F("teacher_name_id"),
+                classroom_id=F("class_room_id"),
+            )
+        )
+        if not allocated_subjects:
             self.stdout.write(
                 self.style.WARNING("No AllocatedSubjects found for the current term.")
             )
             return
 
-        for allocated_subject in allocated_subjects:
-            weekly_limit = allocated_subject.weekly_periods
-            max_daily_periods = allocated_subject.max_daily_periods
-            classroom = allocated_subject.class_room
-            subject = allocated_subject.subject
-            teacher = allocated_subject.teacher
-
-            day_periods = {day: 0 for day in days}
-
-            for day in days:
-                time_pointer = time(8, 0)
-                consecutive_periods = 0
-
-                for period_index in range(periods_per_day):
-                    # Handle the break
-                    if period_index == 4:
-                        time_pointer = (
-                            time_pointer.hour * 60
-                            + time_pointer.minute
-                            + break_duration
-                        ) // 60, (time_pointer.minute + break_duration) % 60
-                        time_pointer = time(*time_pointer)
-                        continue
+        slots = build_slots()
+        # Slots already taken, per classroom and per teacher.
+        bookings = Bookings()
+        periods = []
+        unplaced = 0
 
-                    # Check weekly and daily limits
-                    if (
-                        day_periods[day] >= weekly_limit
-                        or consecutive_periods >= max_daily_periods
-                    ):
-                        break
-
-                    # Calculate end time
-                    end_time_minutes = (
-                        time_pointer.hour * 60 + time_pointer.minute + period_duration
-                    )
-                    end_time = time(end_time_minutes // 60, end_time_minutes % 60)
-
-                    # Create the period
-                    Period.objects.create(
+        for allocated_subject in allocated_subjects:
+            placed = place_periods(
+                allocated_subject,
+                allocated_subject["weekly_periods"],
+                slots,
+                bookings,
+            )
+            for day, start_time, end_time in placed:
+                periods.append(
+                    Period(
                         day_of_week=day,
-                        start_time=time_pointer,
+                        start_time=start_time,
                         end_time=end_time,
-                        classroom=classroom,
-                        subject=subject,
-                        teacher=teacher,
+                        classroom_id=allocated_subject["classroom_id"],
+                        subject_id=allocated_subject["id"],
+                        teacher_id=allocated_subject["teacher_id"],
+                        term=current_term,
                     )
+                )
+            unplaced += allocated_subject["weekly_periods"] - len(placed)
 
-                    day_periods[day] += 1
-                    consecutive_periods += 1
-                    time_pointer = end_time
+        # Regenerating replaces the periods of this term's allocations.
+        with transaction.atomic():
+            Period.objects.filter(term=current_term).delete()
+            Period.objects.bulk_create(periods)
+        # bulk_create sends no signals; let the cached grids know.
+        bump_model_version(Period)
 
+        if unplaced:
+            self.stdout.write(
+                self.style.WARNING(f"{unplaced} periods could not be placed.")
+            )
         self.stdout.write(self.style.SUCCESS("Timetable generated successfully!"))
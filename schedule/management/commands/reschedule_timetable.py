@@ -0,0 +1,80 @@
+import time
+from collections import Counter
+
+from django.core.management.base import BaseCommand, CommandError
+
+from administration.context import get_academic_context
+from administration.models import Term
+from schedule.scheduler import find_clashes, plan_reschedule
+
+
+class Command(BaseCommand):
+    help = (
+        "Report timetable clashes and move only the periods that need to move "
+        "to resolve them."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--term", type=int, help="Term id (defaults to the current term)."
+        )
+        parser.add_argument(
+            "--check",
+            action="store_true",
+            help="Only list the clashes; don't reschedule anything.",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Show what would change without saving it.",
+        )
+
+    def handle(self, *args, **options):
+        if options["term"]:
+            term = Term.objects.filter(pk=options["term"]).first()
+            if term is None:
+                raise CommandError(f"Term {options['term']} does not exist.")
+        else:
+            term = get_academic_context().term
+            if term is None:
+                raise CommandError("No current term set.")
+
+        started = time.perf_counter()
+        clashes = find_clashes(term)
+        elapsed = (time.perf_counter() - started) * 1000
+        counts = Counter(clash["type"] for clash in clashes)
+        self.stdout.write(
+            f"{len(clashes)} clashes found in {elapsed:.1f} ms "
+            f"(teacher: {counts['teacher']}, classroom: {counts['classroom']}, "
+            f"max daily periods: {counts['max_daily_periods']})"
+        )
+        if options["verbosity"] > 1:
+            for clash in clashes:
+                self.stdout.write(f"  {clash}")
+        if options["check"]:
+            return
+
+        started = time.perf_counter()
+        plan = plan_reschedule(term)
+        planned = (time.perf_counter() - started) * 1000
+        summary = plan.summary()
+        self.stdout.write(
+            f"Planned in {planned:.1f} ms: {summary['kept']} kept, "
+            f"{summary['reassigned']} reassigned to a new teacher, "
+            f"{summary['removed']} removed, {summary['created']} created."
+        )
+        if summary["unplaced"]:
+            self.stdout.write(
+                self.style.WARNING(
+                    f"{summary['unplaced']} periods could not be placed."
+                )
+            )
+
+        if options["dry_run"] or not plan.changed:
+            self.stdout.write("Nothing saved.")
+            return
+
+        started = time.perf_counter()
+        plan.apply()
+        applied = (time.perf_counter() - started) * 1000
+        self.stdout.write(self.style.SUCCESS(f"Timetable updated in {applied:.1f} ms."))
@@ -0,0 +1,49 @@
+# Generated by Django 5.1 on 2026-10-19 03:50
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+
+
+def copy_allocation_terms(apps, schema_editor):
+    Period = apps.get_model("schedule", "Period")
+    AllocatedSubject = apps.get_model("academic", "AllocatedSubject")
+    Period.objects.update(
+        term_id=Subquery(
+            AllocatedSubject.objects.filter(pk=OuterRef("subject_id")).values(
+                "term_id"
+            )[:1]
+        )
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("academic", "0012_dormitory_gender"),
+        ("administration", "0007_article_search"),
+        ("schedule", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AlterUniqueTogether(
+            name="period",
+            unique_together=set(),
+        ),
+        migrations.AddField(
+            model_name="period",
+            name="term",
+            field=models.ForeignKey(
+                blank=True,
+                editable=False,
+                null=True,
+                on_delete=django.db.models.deletion.CASCADE,
+                to="administration.term",
+            ),
+        ),
+        migrations.RunPython(copy_allocation_terms, migrations.RunPython.noop),
+        migrations.AlterUniqueTogether(
+            name="period",
+            unique_together={("term", "day_of_week", "start_time", "classroom")},
+        ),
+    ]
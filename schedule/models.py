@@ -1,27 +1,39 @@
 from django.db import models
 
 from academic.models import ClassRoom, Teacher, AllocatedSubject
+from administration.models import Term
+
+
+WEEKDAYS = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday"]
+
+# Sorts periods Monday to Friday instead of alphabetically
+WEEKDAY_ORDER = models.Case(
+    *[models.When(day_of_week=day, then=index) for index, day in enumerate(WEEKDAYS)],
+    output_field=models.IntegerField(),
+)
 
 
 class Period(models.Model):
     day_of_week = models.CharField(
         max_length=10,
-        choices=[
-            ("Monday", "Monday"),
-            ("Tuesday", "Tuesday"),
-            ("Wednesday", "Wednesday"),
-            ("Thursday", "Thursday"),
-            ("Friday", "Friday"),
-        ],
+        choices=[(day, day) for day in WEEKDAYS],
     )
     start_time = models.TimeField()
     end_time = models.TimeField()
     classroom = models.ForeignKey(ClassRoom, on_delete=models.CASCADE)
     subject = models.ForeignKey(AllocatedSubject, on_delete=models.CASCADE)
     teacher = models.ForeignKey(Teacher, on_delete=models.CASCADE)
+    # The allocation's term, copied so each term can use every classroom slot.
+    term = models.ForeignKey(
+        Term, on_delete=models.CASCADE, blank=True, null=True, editable=False
+    )
 
     class Meta:
-        unique_together = ("day_of_week", "start_time", "classroom")
+        unique_together = ("term", "day_of_week", "start_time", "classroom")
+
+    def save(self, *args, **kwargs):
+        self.term_id = self.subject.term_id
+        super().save(*args, **kwargs)
 
     def __str__(self):
         return f"{self.classroom} - {self.subject} ({self.day_of_week} {self.start_time}-{self.end_time})"
@@ -0,0 +1,338 @@
+"""
+Timetable placement, clash detection and incremental rescheduling.
+
+``generate_timetable`` lays out a whole term from scratch. The functions
+here work on the timetable that already exists:
+
+* ``find_clashes`` reads the term's periods in one query and reports
+  teacher double-bookings, classroom overlaps and allocations taught more
+  often in a day than their ``max_daily_periods``.
+* ``plan_reschedule`` keeps every period that is still valid where it is and
+  only moves what has to move: periods involved in a clash, periods whose
+  allocation changed teacher or classroom, and the periods an allocation
+  is missing or has too many of.
+"""
+
+from collections import defaultdict
+from datetime import datetime, time, timedelta
+
+from django.db import transaction
+from django.db.models import F
+
+from academic.models import AllocatedSubject
+from administration.cache import bump_model_version
+from .models import WEEKDAYS, Period
+
+PERIODS_PER_DAY = 8
+PERIOD_MINUTES = 40
+BREAK_MINUTES = 20
+BREAK_AFTER = 4
+DAY_START = time(8, 0)
+
+
+def build_slots(
+    periods_per_day=PERIODS_PER_DAY,
+    period_minutes=PERIOD_MINUTES,
+    break_minutes=BREAK_MINUTES,
+    break_after=BREAK_AFTER,
+    day_start=DAY_START,
+):
+    """Return the ``(start_time, end_time)`` of every period in a day."""
+    slots = []
+    pointer = datetime.combine(datetime.today(), day_start)
+    for index in range(periods_per_day):
+        if index == break_after:
+            pointer += timedelta(minutes=break_minutes)
+        end = pointer + timedelta(minutes=period_minutes)
+        slots.append((pointer.time(), end.time()))
+        pointer = end
+    return slots
+
+
+class Bookings:
+    """Time ranges already taken, per teacher or classroom and day."""
+
+    def __init__(self):
+        self._ranges = defaultdict(list)
+
+    def is_free(self, key, start_time, end_time):
+        return all(
+            end_time <= start or start_time >= end for start, end in self._ranges[key]
+        )
+
+    def add(self, key, start_time, end_time):
+        self._ranges[key].append((start_time, end_time))
+
+
+def place_periods(allocation, count, slots, bookings, daily_counts=None):
+    """
+    Find up to ``count`` free slots for ``allocation``, filling the week
+    from Monday morning, and book them.
+
+    ``allocation`` needs ``id``, ``teacher_id``, ``classroom_id`` and
+    ``max_daily_periods``. ``daily_counts`` maps a day to the periods the
+    allocation already has that day. Returns ``(day, start, end)`` tuples.
+    """
+    daily_counts = daily_counts or {}
+    placed = []
+    for day in WEEKDAYS:
+        today = daily_counts.get(day, 0)
+        for start_time, end_time in slots:
+            if len(placed) == count or today >= allocation["max_daily_periods"]:
+                break
+            classroom_key = ("classroom", allocation["classroom_id"], day)
+            teacher_key = ("teacher", allocation["teacher_id"], day)
+            if not bookings.is_free(
+                classroom_key, start_time, end_time
+            ) or not bookings.is_free(teacher_key, start_time, end_time):
+                continue
+            bookings.add(classroom_key, start_time, end_time)
+            bookings.add(teacher_key, start_time, end_time)
+            placed.append((day, start_time, end_time))
+            today += 1
+    return placed
+
+
+def _join(*names):
+    return " ".join(name for name in names if name)
+
+
+def _overlapping_groups(periods):
+    """Group periods (sorted by start time) whose time ranges overlap."""
+    group = []
+    group_end = None
+    for period in periods:
+        if group and period["start_time"] < group_end:
+            group.append(period)
+            group_end = max(group_end, period["end_time"])
+            continue
+        if len(group) > 1:
+            yield group
+        group = [period]
+        group_end = period["end_time"]
+    if len(group) > 1:
+        yield group
+
+
+def term_periods(term=None):
+    """The periods of ``term``'s allocations (every period if ``None``)."""
+    periods = Period.objects.all()
+    if term is not None:
+        periods = periods.filter(term=term)
+    return periods
+
+
+def find_clashes(term=None):
+    """
+    Return every clash in ``term``'s timetable.
+
+    Each clash is a dict with a ``type`` of ``teacher``, ``classroom`` or
+    ``max_daily_periods``, the day, and the ids of the periods involved.
+    """
+    periods = list(
+        term_periods(term)
+        .order_by("start_time", "id")
+        .values(
+            "id",
+            "day_of_week",
+            "start_time",
+            "end_time",
+            "classroom_id",
+            "classroom__name__name",
+            "classroom__stream__name",
+            "teacher_id",
+            "teacher__first_name",
+            "teacher__last_name",
+            "subject_id",
+            "subject__subject__name",
+            "subject__max_daily_periods",
+        )
+    )
+
+    by_teacher = defaultdict(list)
+    by_classroom = defaultdict(list)
+    by_allocation = defaultdict(list)
+    for period in periods:
+        day = period["day_of_week"]
+        by_teacher[(period["teacher_id"], day)].append(period)
+        by_classroom[(period["classroom_id"], day)].append(period)
+        by_allocation[(period["subject_id"], day)].append(period)
+
+    clashes = []
+    for (teacher_id, day), day_periods in by_teacher.items():
+        for group in _overlapping_groups(day_periods):
+            clashes.append(
+                {
+                    "type": "teacher",
+                    "day": day,
+                    "teacher_id": teacher_id,
+                    "teacher": _join(
+                        group[0]["teacher__first_name"],
+                        group[0]["teacher__last_name"],
+                    ),
+                    "periods": [period["id"] for period in group],
+                }
+            )
+    for (classroom_id, day), day_periods in by_classroom.items():
+        for group in _overlapping_groups(day_periods):
+            clashes.append(
+                {
+                    "type": "classroom",
+                    "day": day,
+                    "classroom_id": classroom_id,
+                    "classroom": _join(
+                        group[0]["classroom__name__name"],
+                        group[0]["classroom__stream__name"],
+                    ),
+                    "periods": [period["id"] for period in group],
+                }
+            )
+    for (allocation_id, day), day_periods in by_allocation.items():
+        limit = day_periods[0]["subject__max_daily_periods"]
+        if len(day_periods) > limit:
+            clashes.append(
+                {
+                    "type": "max_daily_periods",
+                    "day": day,
+                    "allocated_subject_id": allocation_id,
+                    "subject": day_periods[0]["subject__subject__name"],
+                    "limit": limit,
+                    "count": len(day_periods),
+                    "periods": [period["id"] for period in day_periods],
+                }
+            )
+
+    order = {day: index for index, day in enumerate(WEEKDAYS)}
+    clashes.sort(key=lambda clash: (order.get(clash["day"], 0), clash["type"]))
+    return clashes
+
+
+class ReschedulePlan:
+    """What ``plan_reschedule`` decided; ``apply()`` writes it."""
+
+    def __init__(self):
+        self.kept = 0
+        self.reassigned = []
+        self.removed = []
+        self.created = []
+        self.unplaced = {}
+
+    @property
+    def changed(self):
+        return bool(self.reassigned or self.removed or self.created)
+
+    def summary(self):
+        return {
+            "kept": self.kept,
+            "reassigned": len(self.reassigned),
+            "removed": len(self.removed),
+            "created": len(self.created),
+            "unplaced": sum(self.unplaced.values()),
+            "unplaced_by_allocation": self.unplaced,
+        }
+
+    @transaction.atomic
+    def apply(self):
+        if self.removed:
+            Period.objects.filter(id__in=self.removed).delete()
+        if self.reassigned:
+            Period.objects.bulk_update(self.reassigned, ["teacher"])
+        if self.created:
+            Period.objects.bulk_create(self.created)
+        # bulk_update and bulk_create send no signals; refresh cached grids.
+        bump_model_version(Period)
+
+
+def plan_reschedule(term, slots=None):
+    """
+    Work out the smallest set of period changes that leaves ``term``'s
+    timetable without clashes and every allocation with its weekly periods.
+
+    Existing periods are visited in a fixed order and kept where they are
+    unless they clash with a period kept before them, belong to a classroom
+    the allocation no longer uses, or exceed the allocation's daily or
+    weekly limit. A period whose allocation changed teacher stays in its
+    slot when the new teacher is free then. Everything else is removed and
+    the missing periods are placed in the free slots.
+    """
+    slots = slots or build_slots()
+    allocations = {
+        allocation["id"]: allocation
+        for allocation in AllocatedSubject.objects.filter(term=term).values(
+            "id",
+            "weekly_periods",
+            "max_daily_periods",
+            teacher_id=F("teacher_name_id"),
+            classroom_id=F("class_room_id"),
+        )
+    }
+    periods = list(
+        term_periods(term)
+        .order_by("subject_id", "id")
+        .values(
+            "id",
+            "day_of_week",
+            "start_time",
+            "end_time",
+            "classroom_id",
+            "teacher_id",
+            "subject_id",
+        )
+    )
+
+    plan = ReschedulePlan()
+    bookings = Bookings()
+    weekly = defaultdict(int)
+    daily = defaultdict(lambda: defaultdict(int))
+
+    for period in periods:
+        allocation = allocations[period["subject_id"]]
+        day = period["day_of_week"]
+        start, end = period["start_time"], period["end_time"]
+        classroom_key = ("classroom", allocation["classroom_id"], day)
+        teacher_key = ("teacher", allocation["teacher_id"], day)
+        keep = (
+            period["classroom_id"] == allocation["classroom_id"]
+            and weekly[allocation["id"]] < allocation["weekly_periods"]
+            and daily[allocation["id"]][day] < allocation["max_daily_periods"]
+            and bookings.is_free(classroom_key, start, end)
+            and bookings.is_free(teacher_key, start, end)
+        )
+        if not keep:
+            plan.removed.append(period["id"])
+            continue
+
+        bookings.add(classroom_key, start, end)
+        bookings.add(teacher_key, start, end)
+        weekly[allocation["id"]] += 1
+        daily[allocation["id"]][day] += 1
+        if period["teacher_id"] != allocation["teacher_id"]:
+            plan.reassigned.append(
+                Period(id=period["id"], teacher_id=allocation["teacher_id"])
+            )
+        else:
+            plan.kept += 1
+
+    for allocation in allocations.values():
+        missing = allocation["weekly_periods"] - weekly[allocation["id"]]
+        if missing <= 0:
+            continue
+        placed = place_periods(
+            allocation, missing, slots, bookings, daily[allocation["id"]]
+        )
+        for day, start_time, end_time in placed:
+            plan.created.append(
+                Period(
+                    day_of_week=day,
+                    start_time=start_time,
+                    end_time=end_time,
+                    classroom_id=allocation["classroom_id"],
+                    subject_id=allocation["id"],
+                    teacher_id=allocation["teacher_id"],
+                    term=term,
+                )
+            )
+        if len(placed) < missing:
+            plan.unplaced[allocation["id"]] = missing - len(placed)
+
+    return plan
@@ -11,9 +11,10 @@ from administration.serializers import TermSerializer
 
 class PeriodSerializer(serializers.ModelSerializer):
     teacher = TeacherSerializer(read_only=True)  # Include teacher details
-    subject = SubjectSerializer(read_only=True)  # Include subject details
+    # Period.subject is the AllocatedSubject; show the subject and its term
+    subject = SubjectSerializer(source="subject.subject", read_only=True)
     classroom = ClassRoomSerializer(read_only=True)  # Include classroom details
-    term = TermSerializer(read_only=True)  # Include term details
+    term = TermSerializer(source="subject.term", read_only=True)
 
     class Meta:
         model = Period
@@ -39,15 +40,9 @@ class PeriodSerializer(serializers.ModelSerializer):
                 {"error": "AllocatedSubject is required to create a period."}
             )
 
-        teacher = allocated_subject.teacher
-        subject = allocated_subject.subject
-        classroom = allocated_subject.class_room
-        term = allocated_subject.term
-
         return Period.objects.create(
             **validated_data,
-            teacher=teacher,
-            subject=subject,
-            classroom=classroom,
-            term=term,
+            teacher_id=allocated_subject.teacher_name_id,
+            subject=allocated_subject,
+            classroom_id=allocated_subject.class_room_id,
         )
@@ -0,0 +1,199 @@
+"""
+Precomputed weekly timetable grids.
+
+Every period of the current term is read in one ``values()`` query and laid
+out as a grid per classroom and per teacher: for each weekday, one cell per
+time slot holding the subject and the teacher (for classrooms) or the
+classroom (for teachers), or ``None`` for a free slot.
+
+The grids are kept in Django's cache under a key made of the current term
+and the version counters of the models they are built from (see
+``administration.cache``), with a per-process copy on top. Changing a
+period, or a teacher, subject or classroom name, bumps a version, and a new
+term starting changes the term, so the next lookup rebuilds the grids.
+"""
+
+import threading
+
+from django.core.cache import cache
+
+from academic.models import (
+    AllocatedSubject,
+    ClassLevel,
+    ClassRoom,
+    Stream,
+    Subject,
+    Teacher,
+)
+from administration.cache import get_model_version
+from administration.context import get_academic_context
+from .models import WEEKDAYS, Period
+from .scheduler import term_periods
+
+TIMETABLE_MODELS = (
+    Period,
+    AllocatedSubject,
+    Subject,
+    Teacher,
+    ClassRoom,
+    ClassLevel,
+    Stream,
+)
+
+DATA_KEY = "timetable:grids:{term}:{version}"
+CACHE_TIMEOUT = 60 * 60 * 24
+
+_local = {}
+_lock = threading.Lock()
+
+
+def _join(*names):
+    return " ".join(name for name in names if name)
+
+
+def _empty_grid(slot_count):
+    return {day: [None] * slot_count for day in WEEKDAYS}
+
+
+def current_term_id():
+    """The term the grids show: the current one, or ``None`` between terms."""
+    term = get_academic_context().term
+    return term.pk if term else None
+
+
+def build_timetable(term_id):
+    """
+    Build the classroom and teacher grids from the periods of ``term_id``.
+    Between terms (``None``) the grids are empty: merging every term's
+    periods would let them overwrite each other's cells.
+    """
+    if term_id is None:
+        return {"days": WEEKDAYS, "slots": [], "classrooms": {}, "teachers": {}}
+    periods = list(
+        term_periods(term_id).values(
+            "id",
+            "day_of_week",
+            "start_time",
+            "end_time",
+            "classroom_id",
+            "classroom__name__name",
+            "classroom__stream__name",
+            "subject__subject_id",
+            "subject__subject__name",
+            "teacher_id",
+            "teacher__first_name",
+            "teacher__last_name",
+        )
+    )
+
+    slots = sorted({(period["start_time"], period["end_time"]) for period in periods})
+    slot_index = {slot: index for index, slot in enumerate(slots)}
+
+    classrooms = {}
+    teachers = {}
+    for period in periods:
+        day = period["day_of_week"]
+        index = slot_index[(period["start_time"], period["end_time"])]
+        classroom_name = _join(
+            period["classroom__name__name"], period["classroom__stream__name"]
+        )
+        teacher_name = _join(
+            period["teacher__first_name"], period["teacher__last_name"]
+        )
+
+        classroom = classrooms.get(period["classroom_id"])
+        if classroom is None:
+            classroom = classrooms[period["classroom_id"]] = {
+                "id": period["classroom_id"],
+                "name": classroom_name,
+                "grid": _empty_grid(len(slots)),
+            }
+        classroom["grid"][day][index] = {
+            "period": period["id"],
+            "subject_id": period["subject__subject_id"],
+            "subject": period["subject__subject__name"],
+            "teacher_id": period["teacher_id"],
+            "teacher": teacher_name,
+        }
+
+        teacher = teachers.get(period["teacher_id"])
+        if teacher is None:
+            teacher = teachers[period["teacher_id"]] = {
+                "id": period["teacher_id"],
+                "name": teacher_name,
+                "grid": _empty_grid(len(slots)),
+            }
+        teacher["grid"][day][index] = {
+            "period": period["id"],
+            "subject_id": period["subject__subject_id"],
+            "subject": period["subject__subject__name"],
+            "classroom_id": period["classroom_id"],
+            "classroom": classroom_name,
+        }
+
+    return {
+        "days": WEEKDAYS,
+        "slots": [
+            {"start_time": start.isoformat(), "end_time": end.isoformat()}
+            for start, end in slots
+        ],
+        "classrooms": _by_name(classrooms),
+        "teachers": _by_name(teachers),
+    }
+
+
+def _by_name(entries):
+    return dict(sorted(entries.items(), key=lambda item: item[1]["name"]))
+
+
+def timetable_version():
+    return "-".join(str(get_model_version(model)) for model in TIMETABLE_MODELS)
+
+
+def get_timetable():
+    """Return the current term's grids, building them only after a change."""
+    term_id = current_term_id()
+    version = (term_id, timetable_version())
+    local = _local.get("timetable")
+    if local is not None and local[0] == version:
+        return local[1]
+
+    key = DATA_KEY.format(term=term_id, version=version[1])
+    timetable = cache.get(key)
+    if timetable is None:
+        timetable = build_timetable(term_id)
+        cache.set(key, timetable, timeout=CACHE_TIMEOUT)
+
+    with _lock:
+        _local["timetable"] = (version, timetable)
+    return timetable
+
+
+def empty_timetable(pk, name):
+    """Return a grid with every slot free, for rooms or teachers without periods."""
+    timetable = get_timetable()
+    return {
+        "days": timetable["days"],
+        "slots": timetable["slots"],
+        "id": pk,
+        "name": name,
+        "grid": _empty_grid(len(timetable["slots"])),
+    }
+
+
+def classroom_timetable(classroom_id):
+    """Return one classroom's grid, or ``None`` if it has no periods."""
+    timetable = get_timetable()
+    classroom = timetable["classrooms"].get(classroom_id)
+    if classroom is None:
+        return None
+    return {"days": timetable["days"], "slots": timetable["slots"], **classroom}
+
+
+def teacher_timetable(teacher_id):
+    """Return one teacher's grid, or ``None`` if they teach no periods."""
+    timetable = get_timetable()
+    teacher = timetable["teachers"].get(teacher_id)
+    if teacher is None:
+        return None
+    return {"days": timetable["days"], "slots": timetable["slots"], **teacher}
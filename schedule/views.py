@@ -1,13 +1,36 @@
+from asgiref.sync import sync_to_async
 from django.http import JsonResponse
+from django.shortcuts import get_object_or_404
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+from django.views.decorators.http import require_GET
 from django.core.management import call_command
 from io import StringIO
+import time
 from rest_framework import viewsets
+from rest_framework.exceptions import NotFound, ValidationError
 from rest_framework.views import APIView
+from rest_framework.permissions import IsAdminUser, IsAuthenticated
 from rest_framework.response import Response
 from rest_framework import status
-from .models import Period
+from .models import Period, WEEKDAY_ORDER
+from .availability import find_substitutes
+from .scheduler import find_clashes, plan_reschedule, term_periods
 from .serializers import PeriodSerializer
-from academic.models import AllocatedSubject
+from .timetable import (
+    TIMETABLE_MODELS,
+    classroom_timetable,
+    current_term_id,
+    empty_timetable,
+    get_timetable,
+    teacher_timetable,
+)
+from academic.models import AllocatedSubject, ClassRoom, Teacher
+from administration.context import get_academic_context
+from administration.models import Term
+from api.http_cache import CachedListMixin
+from api.rows import query_flag
+from users.authentication import async_jwt_required
 
 
 class PeriodCreateView(APIView):
@@ -30,10 +53,204 @@ class PeriodCreateView(APIView):
 
 
 class PeriodViewSet(viewsets.ModelViewSet):
-    queryset = Period.objects.all()
+    queryset = Period.objects.select_related(
+        "teacher", "subject__subject", "subject__term__academic_year", "classroom"
+    )
     serializer_class = PeriodSerializer
 
 
+class TimetableCacheMixin(CachedListMixin):
+    """Cached timetable responses, which also change when a new term starts."""
+
+    cache_models = TIMETABLE_MODELS
+
+    def get_cache_path(self, request):
+        return f"{request.get_full_path()}|term={current_term_id()}"
+
+
+class SchoolTimetableView(TimetableCacheMixin, APIView):
+    """
+    Weekly grid of every classroom and every teacher in one response.
+
+    Each grid maps a weekday to one cell per entry of ``slots``.
+    """
+
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        def build_data():
+            timetable = get_timetable()
+            return {
+                "days": timetable["days"],
+                "slots": timetable["slots"],
+                "classrooms": list(timetable["classrooms"].values()),
+                "teachers": list(timetable["teachers"].values()),
+            }
+
+        return self.cached_list_response(request, build_data)
+
+
+class ClassroomTimetableView(TimetableCacheMixin, APIView):
+    """
+    Weekly grid of one classroom: subject and teacher per day and slot.
+    """
+
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, pk):
+        def build_data():
+            timetable = classroom_timetable(pk)
+            if timetable is None:
+                classroom = get_object_or_404(ClassRoom, pk=pk)
+                timetable = empty_timetable(classroom.pk, str(classroom))
+            return timetable
+
+        return self.cached_list_response(request, build_data)
+
+
+class TeacherTimetableView(TimetableCacheMixin, APIView):
+    """
+    Weekly grid of one teacher: subject and classroom per day and slot.
+    """
+
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, pk):
+        def build_data():
+            timetable = teacher_timetable(pk)
+            if timetable is None:
+                teacher = get_object_or_404(Teacher, pk=pk)
+                name = " ".join(
+                    name for name in (teacher.first_name, teacher.last_name) if name
+                )
+                timetable = empty_timetable(teacher.pk, name)
+            return timetable
+
+        return self.cached_list_response(request, build_data)
+
+
+def _selected_term(term_id):
+    """The term with ``term_id``, or the current term when it is empty."""
+    if term_id in (None, ""):
+        term = get_academic_context().term
+        if term is None:
+            raise ValidationError({"term": "No current term set."})
+        return term
+    try:
+        return Term.objects.get(pk=term_id)
+    except (Term.DoesNotExist, ValueError, TypeError):
+        raise NotFound("Term not found.")
+
+
+class TimetableClashesView(APIView):
+    """
+    List teacher double-bookings, classroom overlaps and ``max_daily_periods``
+    violations in a term's timetable (``?term=``, default current term).
+    """
+
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        term = _selected_term(request.query_params.get("term"))
+        started = time.perf_counter()
+        clashes = find_clashes(term)
+        elapsed = (time.perf_counter() - started) * 1000
+        return Response(
+            {
+                "term": term.pk,
+                "count": len(clashes),
+                "elapsed_ms": round(elapsed, 1),
+                "clashes": clashes,
+            }
+        )
+
+
+class RescheduleTimetableView(APIView):
+    """
+    Resolve clashes and allocation changes by moving only the affected
+    periods. Send ``{"dry_run": true}`` to see the plan without saving it.
+    """
+
+    permission_classes = [IsAdminUser]
+
+    def post(self, request):
+        term = _selected_term(request.data.get("term"))
+        dry_run = str(request.data.get("dry_run", "")).lower() in ("1", "true", "yes")
+        dry_run = dry_run or query_flag(request, "dry_run")
+
+        started = time.perf_counter()
+        plan = plan_reschedule(term)
+        if not dry_run and plan.changed:
+            plan.apply()
+        elapsed = (time.perf_counter() - started) * 1000
+
+        return Response(
+            {
+                "term": term.pk,
+                "dry_run": dry_run,
+                **plan.summary(),
+                "remaining_clashes": len(find_clashes(term)) if not dry_run else None,
+                "elapsed_ms": round(elapsed, 1),
+            }
+        )
+
+
+class SubstituteTeachersView(APIView):
+    """
+    Rank free teachers to cover each period of an absent teacher.
+
+    ``?teacher=`` is required; ``?date=`` defaults to today and must fall in
+    the current term, whose timetable is used. ``?limit=`` (default 5) caps
+    the substitutes listed per period. Teachers who teach the period's
+    subject come first, then the least busy.
+    """
+
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        teacher = get_object_or_404(
+            Teacher, pk=_positive_int(request.query_params.get("teacher"), "teacher")
+        )
+        date_param = request.query_params.get("date")
+        if date_param:
+            try:
+                date = parse_date(date_param)
+            except ValueError:
+                date = None
+            if date is None:
+                raise ValidationError({"date": "Use the YYYY-MM-DD format."})
+        else:
+            date = timezone.localdate()
+        term = get_academic_context().term
+        if term is None or not term.start_date <= date <= term.end_date:
+            raise ValidationError(
+                {"date": "Substitutes can only be found for days of the current term."}
+            )
+        limit = _positive_int(request.query_params.get("limit", 5), "limit")
+
+        started = time.perf_counter()
+        periods = find_substitutes(teacher.pk, date, limit)
+        elapsed = (time.perf_counter() - started) * 1000
+        return Response(
+            {
+                "teacher": teacher.pk,
+                "date": date,
+                "periods": periods,
+                "elapsed_ms": round(elapsed, 1),
+            }
+        )
+
+
+def _positive_int(value, name):
+    try:
+        number = int(value)
+    except (TypeError, ValueError):
+        number = 0
+    if number < 1:
+        raise ValidationError({name: "A positive integer is required."})
+    return number
+
+
 def run_generate_timetable(request):
     """
     View to trigger the timetable generation management command.
@@ -44,3 +261,34 @@ def run_generate_timetable(request):
         return JsonResponse({"status": "success", "message": output.getvalue()})
     except Exception as e:
         return JsonResponse({"status": "error", "message": str(e)})
+
+
+@require_GET
+@async_jwt_required
+async def classroom_timetable_async(request, pk):
+    """
+    Return a classroom's weekly periods in the current term for the ASGI
+    deployment (none between terms).
+    """
+    term_id = await sync_to_async(current_term_id)()
+    if term_id is None:
+        return JsonResponse([], safe=False)
+    periods = [
+        period
+        async for period in term_periods(term_id)
+        .filter(classroom_id=pk)
+        .order_by(WEEKDAY_ORDER, "start_time")
+        .values(
+            "id",
+            "day_of_week",
+            "start_time",
+            "end_time",
+            "classroom",
+            "subject",
+            "subject__subject__name",
+            "teacher",
+            "teacher__first_name",
+            "teacher__last_name",
+        )
+    ]
+    return JsonResponse(periods, safe=False)
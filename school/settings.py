@@ -1,6 +1,7 @@
 import os
 from pathlib import Path
 from datetime import timedelta, date
+from decouple import config
 from django.core.validators import MinValueValidator  # Could use MaxValueValidator too
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -54,6 +55,8 @@ MIDDLEWARE = [
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
     "django.contrib.auth.middleware.AuthenticationMiddleware",
+    "administration.middleware.AcademicContextMiddleware",
+    "administration.middleware.AccessLogMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
 ]
@@ -79,19 +82,34 @@ TEMPLATES = [
 ]
 
 WSGI_APPLICATION = "school.wsgi.application"
+ASGI_APPLICATION = "school.asgi.application"
 
 
 # Database
 # https://docs.djangoproject.com/en/3.1/ref/settings/#databases
+# Every value can be overridden from the environment or a .env file.
 
 DATABASES = {
     "default": {
-        "ENGINE": "django.db.backends.postgresql",
-        "NAME": "scms",
-        "USER": "postgres",
-        "PASSWORD": "Siah.1921#",
-        "HOST": "127.0.0.1",
-        "PORT": "5432",
+        "ENGINE": config("DB_ENGINE", default="django.db.backends.postgresql"),
+        "NAME": config("DB_NAME", default="scms"),
+        "USER": config("DB_USER", default="postgres"),
+        "PASSWORD": config("DB_PASSWORD", default="Siah.1921#"),
+        "HOST": config("DB_HOST", default="127.0.0.1"),
+        "PORT": config("DB_PORT", default="5432"),
+    }
+}
+
+
+# Cache
+# https://docs.djangoproject.com/en/5.1/topics/cache/
+# Per-process memory locally; production should point this at a shared cache
+# so reference-data invalidations reach every worker.
+
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "scms",
     }
 }
 
@@ -148,8 +166,12 @@ REST_FRAMEWORK = {
     # or allow read-only access for unauthenticated users.
     "DEFAULT_PERMISSION_CLASSES": ["rest_framework.permissions.AllowAny"],
     "DEFAULT_AUTHENTICATION_CLASSES": (
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        "users.authentication.ClaimsJWTAuthentication",
     ),
+    "DEFAULT_RENDERER_CLASSES": [
+        "api.renderers.FastJSONRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ],
 }
 
 SIMPLE_JWT = {
@@ -179,6 +201,19 @@ CORS_ALLOW_ALL_ORIGINS = True
 
 AUTH_USER_MODEL = "users.CustomUser"
 
+# Access logs are written in batches of this size, or by the first request
+# to finish this many seconds after the oldest unwritten entry (see
+# administration.access_log).
+ACCESS_LOG_FLUSH_SIZE = 200
+ACCESS_LOG_FLUSH_INTERVAL = 5
+# Most entries a worker keeps while they can't be written; older ones are
+# dropped first.
+ACCESS_LOG_MAX_BUFFER = 10000
+
+# Threads rendering image thumbnails and WebP variants after uploads; 0
+# renders them during the request instead (see administration.images).
+IMAGE_VARIANT_WORKERS = 2
+
 INTERNAL_IPS = [
     "127.0.0.1",
 ]
@@ -0,0 +1,81 @@
+"""
+Production settings.
+
+Everything deployment specific is read from the environment (or a .env file)
+with python-decouple. Use with::
+
+    DJANGO_SETTINGS_MODULE=school.settings_production
+"""
+
+from decouple import config, Csv
+from django.core.exceptions import ImproperlyConfigured
+
+from .settings import *  # noqa: F401,F403
+
+
+SECRET_KEY = config("SECRET_KEY")
+
+DEBUG = config("DEBUG", default=False, cast=bool)
+
+ALLOWED_HOSTS = config("ALLOWED_HOSTS", default="", cast=Csv())
+
+CSRF_TRUSTED_ORIGINS = config("CSRF_TRUSTED_ORIGINS", default="", cast=Csv())
+
+SECURE_PROXY_SSL_HEADER = ("HTTP_X_FORWARDED_PROTO", "https")
+
+# The toolbar middleware is sync only and would force async views onto a
+# thread under ASGI.
+MIDDLEWARE = [
+    middleware
+    for middleware in MIDDLEWARE
+    if middleware != "debug_toolbar.middleware.DebugToolbarMiddleware"
+]
+
+
+# Database connections
+# https://docs.djangoproject.com/en/5.1/ref/databases/#persistent-connections
+# https://docs.djangoproject.com/en/5.1/ref/databases/#connection-pool
+#
+# By default connections are kept open between requests for DB_CONN_MAX_AGE
+# seconds and checked before reuse, so a worker only pays the connection
+# handshake once instead of on every request.
+#
+# Set DB_POOL=True to use Django's native PostgreSQL connection pool instead.
+# It needs psycopg 3 with the pool extra (pip install "psycopg[binary,pool]")
+# and can't be combined with persistent connections.
+
+DB_POOL = config("DB_POOL", default=False, cast=bool)
+
+if DB_POOL:
+    DATABASES["default"]["CONN_MAX_AGE"] = 0
+    DATABASES["default"]["OPTIONS"] = {
+        "pool": {
+            "min_size": config("DB_POOL_MIN_SIZE", default=2, cast=int),
+            "max_size": config("DB_POOL_MAX_SIZE", default=10, cast=int),
+            "timeout": config("DB_POOL_TIMEOUT", default=10, cast=int),
+        }
+    }
+else:
+    DATABASES["default"]["CONN_MAX_AGE"] = config(
+        "DB_CONN_MAX_AGE", default=600, cast=int
+    )
+    DATABASES["default"]["CONN_HEALTH_CHECKS"] = True
+
+
+# Cache
+# Reference data, ETag and front-page versions and revoked tokens live in the
+# cache, so every worker has to share it: a per-process cache would keep
+# serving stale data and accepting revoked tokens on the other workers.
+# Requires the redis package.
+
+REDIS_URL = config("REDIS_URL", default="")
+
+if not REDIS_URL:
+    raise ImproperlyConfigured("Set REDIS_URL: production workers need a shared cache.")
+
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.redis.RedisCache",
+        "LOCATION": REDIS_URL,
+    }
+}
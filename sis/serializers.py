@@ -1,5 +1,8 @@
 from rest_framework import serializers
 
+from administration.cache import reference_cache
+from api.rows import RowSerializer
+
 from academic.models import (
     StudentsMedicalHistory,
     Student,
@@ -24,6 +27,8 @@ class StudentHealthRecordSerializer(serializers.ModelSerializer):
 
 
 class ParentSerializer(serializers.ModelSerializer):
+    thumbnail_url = serializers.ImageField(source="image_thumbnail", read_only=True)
+
     class Meta:
         model = Parent
         fields = "__all__"
@@ -33,13 +38,14 @@ class StudentSerializer(serializers.ModelSerializer):
     class_level = serializers.SerializerMethodField(read_only=True)
     class_of_year = serializers.SerializerMethodField(read_only=True)
     parent_guardian = serializers.SerializerMethodField(read_only=True)
+    thumbnail_url = serializers.ImageField(source="image_thumbnail", read_only=True)
 
     class Meta:
         model = Student
         fields = "__all__"
 
     def get_class_level(self, obj):
-        return obj.class_level.name if obj.class_level else None
+        return reference_cache.name_of(ClassLevel, obj.class_level_id)
 
     def get_class_of_year(self, obj):
         return obj.class_of_year.full_name if obj.class_of_year else None
@@ -51,9 +57,8 @@ class StudentSerializer(serializers.ModelSerializer):
         """
         Reusable method to validate and create a student instance.
         """
-        try:
-            class_level = ClassLevel.objects.get(name__iexact=data.get("class_level"))
-        except ClassLevel.DoesNotExist:
+        class_level = reference_cache.get_by_name(ClassLevel, data.get("class_level"))
+        if class_level is None:
             raise serializers.ValidationError(
                 f"Class level '{data['class_level']}' does not exist."
             )
@@ -121,3 +126,50 @@ class StudentSerializer(serializers.ModelSerializer):
 
         return created_students, errors
 
+
+class StudentRowSerializer(RowSerializer):
+    """Same output as ``StudentSerializer``, built from ``values()`` rows."""
+
+    model = Student
+    fields = {
+        "id": "id",
+        "class_level": "class_level__name",
+        "class_of_year": "class_of_year__full_name",
+        "parent_guardian": "parent_guardian__email",
+        "thumbnail_url": "image_thumbnail",
+        "first_name": "first_name",
+        "middle_name": "middle_name",
+        "last_name": "last_name",
+        "graduation_date": "graduation_date",
+        "date_dismissed": "date_dismissed",
+        "gender": "gender",
+        "religion": "religion",
+        "region": "region",
+        "city": "city",
+        "street": "street",
+        "blood_group": "blood_group",
+        "parent_contact": "parent_contact",
+        "date_of_birth": "date_of_birth",
+        "admission_date": "admission_date",
+        "admission_number": "admission_number",
+        "prem_number": "prem_number",
+        "image": "image",
+        "image_thumbnail": "image_thumbnail",
+        "image_webp": "image_webp",
+        "cache_gpa": "cache_gpa",
+        "debt": "debt",
+        "reason_left": "reason_left",
+        "siblings": None,
+    }
+
+    def add_related(self, rows):
+        siblings = {row["id"]: [] for row in rows}
+        links = (
+            Student.siblings.through.objects.filter(from_student_id__in=siblings)
+            .order_by(*[f"to_student__{field}" for field in Student._meta.ordering])
+            .values_list("from_student_id", "to_student_id")
+        )
+        for student_id, sibling_id in links:
+            siblings[student_id].append(sibling_id)
+        for row in rows:
+            row["siblings"] = siblings[row["id"]]
@@ -6,10 +6,15 @@ from rest_framework.permissions import IsAuthenticated, IsAdminUser
 from rest_framework.response import Response
 from rest_framework.pagination import PageNumberPagination
 from rest_framework import status
-from django.http import Http404
+from django.http import Http404, JsonResponse
+from django.views.decorators.http import require_GET
 
 from academic.models import Student, ClassLevel, Parent
-from .serializers import StudentSerializer
+from administration.cache import reference_cache
+from api.exports import ExportView
+from api.rows import row_list_response
+from users.authentication import async_jwt_required
+from .serializers import StudentSerializer, StudentRowSerializer
 
 
 class StudentListView(APIView):
@@ -22,6 +27,8 @@ class StudentListView(APIView):
         page_size_query_param = "page_size"  # Allow clients to specify page size
         max_page_size = 100  # Maximum allowed page size
 
+    row_serializer = StudentRowSerializer()
+
     def get(self, request, format=None):
         # Retrieve search query parameters
         first_name_query = request.query_params.get("first_name", "")
@@ -55,8 +62,7 @@ class StudentListView(APIView):
         return paginator.get_paginated_response(serializer.data)
         '''
 
-        serializer = StudentSerializer(students, many=True)
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        return row_list_response(request, self.row_serializer, students)
 
     def post(self, request, format=None):
         data = request.data
@@ -145,11 +151,10 @@ class BulkUploadStudentsView(APIView):
 
                 try:
                     # Validate class level
-                    try:
-                        class_level = ClassLevel.objects.get(
-                            name=student_data["class_level"]
-                        )
-                    except ClassLevel.DoesNotExist:
+                    class_level = reference_cache.get_by_name(
+                        ClassLevel, student_data["class_level"]
+                    )
+                    if class_level is None:
                         raise ValueError(
                             f"Class level '{student_data['class_level']}' does not exist."
                         )
@@ -225,6 +230,55 @@ class BulkUploadStudentsView(APIView):
             return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
 
 
+class StudentExportView(ExportView):
+    """
+    Download every student as CSV or XLSX, optionally for one ``?class_level=``.
+    """
+
+    filename = "students"
+    columns = [
+        ("Admission Number", "admission_number"),
+        ("First Name", "first_name"),
+        ("Middle Name", "middle_name"),
+        ("Last Name", "last_name"),
+        ("Gender", "gender"),
+        ("Date of Birth", "date_of_birth"),
+        ("Class Level", "class_level__name"),
+        ("Class of Year", "class_of_year__full_name"),
+        ("Admission Date", "admission_date"),
+        ("Parent Contact", "parent_contact"),
+        ("Parent Email", "parent_guardian__email"),
+        ("Region", "region"),
+        ("City", "city"),
+        ("Debt", "debt"),
+    ]
+
+    def get_queryset(self):
+        students = Student.objects.order_by("admission_number")
+        class_level = self.request.query_params.get("class_level")
+        if class_level:
+            students = students.filter(class_level_id=class_level)
+        return students
+
+
+student_row_serializer = StudentRowSerializer()
+
+
+@require_GET
+@async_jwt_required
+async def student_detail_async(request, pk):
+    """
+    Async version of StudentDetailView.get for the ASGI deployment.
+
+    Built by StudentRowSerializer, like the student list, so it has the same
+    fields as StudentSerializer.
+    """
+    students = await student_row_serializer.adata(Student.objects.filter(pk=pk))
+    if not students:
+        return JsonResponse({"detail": "Not found."}, status=404)
+    return JsonResponse(students[0])
+
+
 """
 class StudentHealthRecordViewSet(viewsets.ModelViewSet):
 	queryset = StudentHealthRecord.objects.all()
@@ -3,3 +3,32 @@ from django.apps import AppConfig
 
 class UsersConfig(AppConfig):
     name = 'users'
+
+    def ready(self):
+        from django.contrib.auth.models import Group
+        from django.db.models.signals import m2m_changed, post_delete, post_save
+
+        from academic.models import Parent, Teacher
+        from .models import Accountant, CustomUser
+        from .roles import _groups_changed, _profile_changed, _user_changed
+
+        # Cached roles are dropped when the user, a profile or a group changes
+        post_save.connect(
+            _user_changed, sender=CustomUser, dispatch_uid="roles-user-save"
+        )
+        post_delete.connect(
+            _user_changed, sender=CustomUser, dispatch_uid="roles-user-delete"
+        )
+        for model in (Teacher, Accountant, Parent):
+            label = model._meta.label_lower
+            post_save.connect(
+                _profile_changed, sender=model, dispatch_uid=f"roles-{label}-save"
+            )
+            post_delete.connect(
+                _profile_changed, sender=model, dispatch_uid=f"roles-{label}-delete"
+            )
+        m2m_changed.connect(
+            _groups_changed,
+            sender=Group.user_set.through,
+            dispatch_uid="roles-user-groups",
+        )
@@ -0,0 +1,187 @@
+from functools import wraps
+
+from django.core.cache import caches
+from django.core.cache.backends.dummy import DummyCache
+from django.core.cache.backends.locmem import LocMemCache
+from django.http import JsonResponse
+from django.utils.translation import gettext_lazy as _
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import (
+    AuthenticationFailed,
+    InvalidToken,
+    TokenError,
+)
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import AccessToken
+
+from .models import CustomUser
+from .roles import VERSION_CLAIM, get_cached_user, token_state
+
+# Claims copied onto ClaimsUser.
+USER_CLAIMS = (
+    "email",
+    "first_name",
+    "middle_name",
+    "last_name",
+    "is_staff",
+    "is_superuser",
+    "is_teacher",
+    "is_accountant",
+    "is_parent",
+    "teacher_id",
+    "accountant_id",
+    "parent_id",
+)
+
+
+def load_user(user_id, fresh=False):
+    """The active user ``user_id``, from the user cache unless ``fresh``."""
+    if fresh:
+        user = CustomUser.objects.filter(pk=user_id).first()
+    else:
+        user = get_cached_user(user_id)
+    if user is None:
+        raise AuthenticationFailed(_("User not found"), code="user_not_found")
+    if not user.is_active:
+        raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+    return user
+
+
+class ClaimsUser:
+    """
+    A user built from the claims of a verified token.
+
+    It holds the identity and role fields of the token, which is all the
+    permission checks read, so authenticating a read request costs no query.
+    It is not a ``CustomUser``: code that needs the model instance (for a
+    serializer, a query or a foreign key) uses ``pk`` or ``load_user()``.
+    """
+
+    is_active = True
+    is_authenticated = True
+    is_anonymous = False
+
+    def __init__(self, user_id, claims):
+        self.id = self.pk = user_id
+        for claim in USER_CLAIMS:
+            setattr(self, claim, claims.get(claim))
+        self.group_names = frozenset(claims.get("groups", ()))
+
+    def __eq__(self, other):
+        return isinstance(other, (ClaimsUser, CustomUser)) and other.pk == self.pk
+
+    def __hash__(self):
+        return hash(self.pk)
+
+    def __str__(self):
+        return self.email
+
+
+def cache_is_shared():
+    """
+    Whether every worker sees the same default cache.
+
+    User versions, revocations and cached users live there. With a
+    per-process cache a worker would keep trusting the tokens of a user
+    disabled on another one, so users are then read from the database.
+    """
+    return not isinstance(caches["default"], (LocMemCache, DummyCache))
+
+
+class ClaimsJWTAuthentication(JWTAuthentication):
+    """
+    JWT authentication that does not load the user on read requests.
+
+    A ``GET``, ``HEAD`` or ``OPTIONS`` request whose token was minted at the
+    user's current version (see ``users.roles``) gets a ``ClaimsUser``, so
+    permission and role checks cost no query. Write requests, and tokens
+    whose user changed since they were issued, get the real user from a
+    cache that is refreshed at least once a minute. Revoked users are
+    rejected either way.
+
+    This needs a cache shared by every worker; with a per-process cache
+    (``LocMemCache``) each request reads its user from the database.
+    """
+
+    def authenticate(self, request):
+        header = self.get_header(request)
+        if header is None:
+            return None
+
+        raw_token = self.get_raw_token(header)
+        if raw_token is None:
+            return None
+
+        validated_token = self.get_validated_token(raw_token)
+
+        return self.get_user(validated_token, request.method), validated_token
+
+    def get_user(self, validated_token, method=None):
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken(_("Token contained no recognizable user identification"))
+
+        if not cache_is_shared():
+            return load_user(user_id, fresh=True)
+
+        version, revoked = token_state(user_id)
+        if revoked:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+        if (
+            method in SAFE_METHODS
+            and version is not None
+            and validated_token.get(VERSION_CLAIM) == version
+        ):
+            return ClaimsUser(user_id, validated_token)
+        return load_user(user_id)
+
+
+async def aget_user_from_request(request):
+    """
+    Authenticate a Bearer access token for async views.
+
+    Token validation is pure computation; only the user lookup touches the
+    database, through the async ORM. Returns ``None`` when the request is not
+    authenticated.
+    """
+    header = request.headers.get("Authorization", "")
+    parts = header.split()
+    if len(parts) != 2 or parts[0] not in api_settings.AUTH_HEADER_TYPES:
+        return None
+
+    try:
+        token = AccessToken(parts[1])
+    except TokenError:
+        return None
+
+    user_id = token.get(api_settings.USER_ID_CLAIM)
+    if user_id is None:
+        return None
+    try:
+        return await CustomUser.objects.aget(
+            **{api_settings.USER_ID_FIELD: user_id}, is_active=True
+        )
+    except CustomUser.DoesNotExist:
+        return None
+
+
+def async_jwt_required(view):
+    """Reject unauthenticated requests to an async view with a 401."""
+
+    @wraps(view)
+    async def wrapper(request, *args, **kwargs):
+        user = await aget_user_from_request(request)
+        if user is None:
+            return JsonResponse(
+                {
+                    "detail": "Authentication credentials were not provided "
+                    "or are invalid."
+                },
+                status=401,
+            )
+        request.user = user
+        return await view(request, *args, **kwargs)
+
+    return wrapper
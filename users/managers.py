@@ -1,8 +1,24 @@
 from django.contrib.auth.base_user import BaseUserManager
+from django.db import models
 from django.utils.translation import gettext_lazy as _
 
 
-class CustomUserManager(BaseUserManager):
+class CustomUserQuerySet(models.QuerySet):
+    def update(self, **kwargs):
+        """
+        Update the users, then refresh their cached roles and revoke or
+        restore their tokens, which ``post_save`` does for ``save()``.
+        """
+        # users.roles imports the user model, which imports this module.
+        from .roles import users_changed
+
+        user_ids = list(self.values_list('pk', flat=True))
+        updated = super().update(**kwargs)
+        users_changed(user_ids)
+        return updated
+
+
+class CustomUserManager(BaseUserManager.from_queryset(CustomUserQuerySet)):
     """
     Custom user model manager where email is the unique identifiers
     for authentication instead of usernames.
@@ -0,0 +1,18 @@
+from rest_framework.permissions import SAFE_METHODS, BasePermission
+
+
+class IsTeacherOrAdmin(BasePermission):
+    """Allow teachers and staff users."""
+
+    def has_permission(self, request, view):
+        user = request.user
+        return bool(
+            user and user.is_authenticated and (user.is_staff or user.is_teacher)
+        )
+
+
+class IsTeacherOrAdminOrReadOnly(IsTeacherOrAdmin):
+    """Allow anyone to read, and teachers and staff users to write."""
+
+    def has_permission(self, request, view):
+        return request.method in SAFE_METHODS or super().has_permission(request, view)
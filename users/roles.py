@@ -0,0 +1,182 @@
+"""
+A user's roles, resolved once and carried in their tokens.
+
+``user_claims`` describes a user with what the frontend needs right after
+login: names, the role flags and the id of their teacher, accountant or
+parent profile, plus their group names. The login endpoint puts these in
+the JWT and returns them as a slim profile; the full profile is fetched
+separately from ``users/me/`` when it is actually needed.
+
+The profile ids and groups come from one query over the user's reverse
+one-to-one relations and groups, cached per user under a version counter
+that is bumped whenever the user, one of their profiles or their group
+memberships change. Tokens carry the version they were minted at, so
+``users.authentication`` can tell when their claims went stale. Disabled
+and deleted users are also put on a revocation list, including users
+changed with ``QuerySet.update()`` (see ``users.managers``).
+"""
+
+from django.core.cache import cache
+from django.db.models.signals import post_delete
+from rest_framework_simplejwt.settings import api_settings
+
+from administration.cache import bump_version, get_version
+from .models import CustomUser
+
+VERSION_KEY = "users:{user_id}:version"
+ROLES_KEY = "users:{user_id}:roles:{version}"
+USER_KEY = "users:{user_id}:user:{version}"
+REVOKED_KEY = "users:{user_id}:revoked"
+CACHE_TIMEOUT = 60 * 60 * 24
+# Users are re-read at least this often on write requests.
+USER_CACHE_TIMEOUT = 60
+# The claim holding the user's version when the token was minted.
+VERSION_CLAIM = "ver"
+
+
+def invalidate_user(user_id):
+    """Drop everything cached about one user."""
+    if user_id is not None:
+        bump_version(VERSION_KEY.format(user_id=user_id))
+
+
+def user_version(user_id):
+    return get_version(VERSION_KEY.format(user_id=user_id))
+
+
+def revoke_user(user_id):
+    """
+    Reject the tokens of a disabled or deleted user without reading them
+    from the database. Entries outlive every access token issued before.
+    """
+    cache.set(
+        REVOKED_KEY.format(user_id=user_id),
+        True,
+        timeout=int(api_settings.ACCESS_TOKEN_LIFETIME.total_seconds()),
+    )
+
+
+def restore_user(user_id):
+    cache.delete(REVOKED_KEY.format(user_id=user_id))
+
+
+def _user_changed(sender, instance, **kwargs):
+    invalidate_user(instance.pk)
+    if kwargs.get("signal") is post_delete or not instance.is_active:
+        revoke_user(instance.pk)
+    else:
+        restore_user(instance.pk)
+
+
+def users_changed(user_ids):
+    """What ``_user_changed`` does, for users changed without signals."""
+    active = dict(
+        CustomUser.objects.filter(pk__in=user_ids).values_list("pk", "is_active")
+    )
+    for user_id in user_ids:
+        invalidate_user(user_id)
+        if active.get(user_id):
+            restore_user(user_id)
+        else:
+            revoke_user(user_id)
+
+
+def _profile_changed(sender, instance, **kwargs):
+    invalidate_user(instance.user_id)
+
+
+def _groups_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    if not reverse:
+        if action.startswith("post_"):
+            invalidate_user(instance.pk)
+    elif action == "pre_clear":
+        for user_id in instance.user_set.values_list("id", flat=True):
+            invalidate_user(user_id)
+    elif action in ("post_add", "post_remove"):
+        for user_id in pk_set:
+            invalidate_user(user_id)
+
+
+def resolve_roles(user_id):
+    """The user's profile ids and group names, in a single query."""
+    rows = CustomUser.objects.filter(pk=user_id).values_list(
+        "teacher__id", "accountant__id", "parent__id", "groups__name"
+    )
+    roles = {"teacher_id": None, "accountant_id": None, "parent_id": None}
+    groups = set()
+    for teacher_id, accountant_id, parent_id, group in rows:
+        roles.update(
+            teacher_id=teacher_id, accountant_id=accountant_id, parent_id=parent_id
+        )
+        if group:
+            groups.add(group)
+    roles["groups"] = sorted(groups)
+    return roles
+
+
+def get_roles(user_id):
+    """Return ``resolve_roles(user_id)``, cached until the user changes."""
+    key = ROLES_KEY.format(user_id=user_id, version=user_version(user_id))
+    roles = cache.get(key)
+    if roles is None:
+        roles = resolve_roles(user_id)
+        cache.set(key, roles, timeout=CACHE_TIMEOUT)
+    return roles
+
+
+def token_state(user_id):
+    """
+    Return ``(version, revoked)`` for a user in one cache round trip; the
+    version is ``None`` when it is not cached.
+    """
+    version_key = VERSION_KEY.format(user_id=user_id)
+    revoked_key = REVOKED_KEY.format(user_id=user_id)
+    values = cache.get_many([version_key, revoked_key])
+    return values.get(version_key), values.get(revoked_key, False)
+
+
+def get_cached_user(user_id):
+    """
+    Return the user ``user_id`` (or ``None``), read from the database at
+    most once a minute and again as soon as the user changes.
+    """
+    key = USER_KEY.format(user_id=user_id, version=user_version(user_id))
+    user = cache.get(key)
+    if user is None:
+        user = CustomUser.objects.filter(pk=user_id).first()
+        if user is None:
+            return None
+        cache.set(key, user, timeout=USER_CACHE_TIMEOUT)
+    return user
+
+
+def display_name(user):
+    if user.first_name and user.last_name:
+        return f"{user.first_name} {user.last_name}"
+    return user.email or "Unknown User"
+
+
+def user_claims(user):
+    """The token claims describing ``user``."""
+    return {
+        "email": user.email,
+        "name": display_name(user),
+        "first_name": user.first_name,
+        "middle_name": user.middle_name,
+        "last_name": user.last_name,
+        "is_staff": user.is_staff,
+        "is_superuser": user.is_superuser,
+        "is_teacher": user.is_teacher,
+        "is_accountant": user.is_accountant,
+        "is_parent": user.is_parent,
+        **get_roles(user.pk),
+        VERSION_CLAIM: user_version(user.pk),
+    }
+
+
+def in_group(user, name):
+    """Whether ``user`` belongs to the group ``name``, from claims or cache."""
+    names = vars(user).get("group_names")
+    if names is None:
+        names = get_roles(user.pk)["groups"]
+    return name in names
@@ -3,6 +3,7 @@ from django.contrib.auth.models import Group
 from rest_framework import serializers
 from rest_framework_simplejwt.tokens import RefreshToken
 from academic.models import Teacher, Subject, Parent
+from api.rows import Computed, RowSerializer
 from .models import CustomUser, Accountant
 
 
@@ -146,6 +147,7 @@ class TeacherSerializer(serializers.ModelSerializer):
         many=True, source="subject_specialization", read_only=True
     )
     payments = serializers.SerializerMethodField()
+    thumbnail_url = serializers.ImageField(source="image_thumbnail", read_only=True)
 
     class Meta:
         model = Teacher
@@ -169,6 +171,7 @@ class TeacherSerializer(serializers.ModelSerializer):
             "date_of_birth",
             "salary",
             "unpaid_salary",
+            "thumbnail_url",
             "payments",
         ]
 
@@ -234,6 +237,7 @@ class TeacherSerializer(serializers.ModelSerializer):
 
 class ParentSerializer(serializers.ModelSerializer):
     children_details = serializers.SerializerMethodField()
+    thumbnail_url = serializers.ImageField(source="image_thumbnail", read_only=True)
 
     class Meta:
         model = Parent
@@ -247,6 +251,7 @@ class ParentSerializer(serializers.ModelSerializer):
             "address",
             "gender",
             "date_of_birth",
+            "thumbnail_url",
             "children_details",
         ]
 
@@ -332,3 +337,69 @@ class ParentSerializer(serializers.ModelSerializer):
             user.save()
 
         return parent
+
+
+def _display_name(first_name, last_name, email):
+    # Matches UserSerializer.get_username.
+    if first_name and last_name:
+        return f"{first_name} {last_name}"
+    return email or "Unknown User"
+
+
+class UserRowSerializer(RowSerializer):
+    """``UserSerializer`` without the nested accountant/teacher/parent details."""
+
+    model = CustomUser
+    fields = {
+        "id": "id",
+        "email": "email",
+        "username": Computed(_display_name, "first_name", "last_name", "email"),
+        "first_name": "first_name",
+        "middle_name": "middle_name",
+        "last_name": "last_name",
+        "isAdmin": "is_staff",
+        "isAccountant": "is_accountant",
+        "isTeacher": "is_teacher",
+        "isParent": "is_parent",
+    }
+
+
+class TeacherRowSerializer(RowSerializer):
+    """``TeacherSerializer`` without the nested payments."""
+
+    model = Teacher
+    fields = {
+        "id": "id",
+        "username": "username",
+        "first_name": "first_name",
+        "middle_name": "middle_name",
+        "last_name": "last_name",
+        "email": "email",
+        "phone_number": "phone_number",
+        "empId": "empId",
+        "short_name": "short_name",
+        "subject_specialization_display": None,
+        "address": "address",
+        "gender": "gender",
+        "national_id": "national_id",
+        "nssf_number": "nssf_number",
+        "tin_number": "tin_number",
+        "date_of_birth": "date_of_birth",
+        "salary": "salary",
+        "unpaid_salary": "unpaid_salary",
+        "thumbnail_url": "image_thumbnail",
+    }
+
+    def add_related(self, rows):
+        subjects = {row["id"]: [] for row in rows}
+        links = (
+            Teacher.subject_specialization.through.objects.filter(
+                teacher_id__in=subjects
+            )
+            .order_by(*[f"subject__{field}" for field in Subject._meta.ordering])
+            .values_list("teacher_id", "subject__name")
+        )
+        for teacher_id, subject_name in links:
+            subjects[teacher_id].append(subject_name)
+        for row in rows:
+            row["subject_specialization_display"] = subjects[row["id"]]
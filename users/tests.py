@@ -1,3 +1,164 @@
+import pickle
+import tempfile
+
+from django.core.cache import cache
 from django.test import TestCase
+from rest_framework.permissions import IsAdminUser
+from rest_framework.test import APIRequestFactory
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+
+from .authentication import ClaimsJWTAuthentication, ClaimsUser
+from .models import CustomUser
+from .permissions import IsTeacherOrAdmin
+from .views import MyTokenObtainPairSerializer
+
+
+class TokenTestCase(TestCase):
+    def setUp(self):
+        self.factory = APIRequestFactory()
+        self.user = CustomUser.objects.create_user(
+            "teacher@school.test", "secret", first_name="Amina", is_teacher=True
+        )
+
+    def token(self, user=None):
+        token = MyTokenObtainPairSerializer.get_token(user or self.user)
+        return str(token.access_token)
+
+    def authenticate(self, token, method="get"):
+        request = getattr(self.factory, method)(
+            "/api/users/me/", HTTP_AUTHORIZATION=f"Bearer {token}"
+        )
+        return ClaimsJWTAuthentication().authenticate(request)[0]
+
+
+class SharedCacheTestCase(TokenTestCase):
+    """Runs with a file cache, which every worker process would share."""
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        shared_cache = self.settings(
+            CACHES={
+                "default": {
+                    "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+                    "LOCATION": directory.name,
+                }
+            }
+        )
+        shared_cache.enable()
+        self.addCleanup(shared_cache.disable)
+        super().setUp()
+
+
+class ClaimsAuthenticationTests(SharedCacheTestCase):
+    def test_read_request_is_authenticated_from_claims(self):
+        token = self.token()
+        with self.assertNumQueries(0):
+            user = self.authenticate(token)
+        self.assertIs(type(user), ClaimsUser)
+        self.assertEqual(user.pk, self.user.pk)
+        self.assertEqual(user.email, "teacher@school.test")
+        self.assertTrue(user.is_teacher)
+        self.assertFalse(user.is_staff)
+
+    def test_write_request_gets_the_model_user(self):
+        user = self.authenticate(self.token(), method="post")
+        self.assertIs(type(user), CustomUser)
+        self.assertEqual(user, self.user)
+
+    def test_claims_match_the_database(self):
+        claims_user = self.authenticate(self.token())
+        model_user = self.authenticate(self.token(), method="post")
+        for field in ("email", "first_name", "is_staff", "is_teacher", "is_parent"):
+            self.assertEqual(getattr(claims_user, field), getattr(model_user, field))
+
+    def test_stale_claims_are_read_from_the_database(self):
+        token = self.token()
+        self.user.first_name = "Neema"
+        self.user.save()
+        user = self.authenticate(token)
+        self.assertIs(type(user), CustomUser)
+        self.assertEqual(user.first_name, "Neema")
+
+    def test_claims_user_is_not_a_model_user(self):
+        user = self.authenticate(self.token())
+        self.assertNotIsInstance(user, CustomUser)
+        self.assertEqual(user, self.user)
+        self.assertEqual(hash(user), hash(self.user.pk))
+        self.assertEqual(pickle.loads(pickle.dumps(user)), user)
+
+    def test_permissions_accept_claims_users(self):
+        admin = CustomUser.objects.create_user(
+            "admin@school.test", "secret", is_staff=True
+        )
+        parent = CustomUser.objects.create_user(
+            "parent@school.test", "secret", is_parent=True
+        )
+        teacher = self.authenticate(self.token())
+        admin = self.authenticate(self.token(admin))
+        parent = self.authenticate(self.token(parent))
+        request = self.factory.get("/")
+
+        for user, is_admin, is_teacher_or_admin in (
+            (teacher, False, True),
+            (admin, True, True),
+            (parent, False, False),
+        ):
+            self.assertIs(type(user), ClaimsUser)
+            request.user = user
+            self.assertEqual(
+                IsAdminUser().has_permission(request, None), is_admin, user
+            )
+            self.assertEqual(
+                IsTeacherOrAdmin().has_permission(request, None),
+                is_teacher_or_admin,
+                user,
+            )
+
+
+class RevocationTests(SharedCacheTestCase):
+    def assertRejected(self, token):
+        for method in ("get", "post"):
+            with self.assertRaises(AuthenticationFailed):
+                self.authenticate(token, method=method)
+
+    def test_deactivated_user_is_rejected(self):
+        token = self.token()
+        self.user.is_active = False
+        self.user.save()
+        self.assertRejected(token)
+
+    def test_user_deactivated_with_update_is_rejected(self):
+        token = self.token()
+        CustomUser.objects.filter(pk=self.user.pk).update(is_active=False)
+        self.assertRejected(token)
+
+    def test_reactivated_user_is_accepted_again(self):
+        token = self.token()
+        CustomUser.objects.filter(pk=self.user.pk).update(is_active=False)
+        CustomUser.objects.filter(pk=self.user.pk).update(is_active=True)
+        self.assertEqual(self.authenticate(token), self.user)
+
+    def test_deleted_user_is_rejected(self):
+        token = self.token()
+        self.user.delete()
+        self.assertRejected(token)
+
+
+class LocalCacheTests(TokenTestCase):
+    """With a per-process cache, users are read from the database."""
+
+    def test_read_request_reads_the_user_from_the_database(self):
+        token = self.token()
+        with self.assertNumQueries(1):
+            user = self.authenticate(token)
+        self.assertIs(type(user), CustomUser)
 
-# Create your tests here.
+    def test_user_deactivated_elsewhere_is_rejected(self):
+        token = self.token()
+        self.authenticate(token)
+        CustomUser.objects.filter(pk=self.user.pk).update(is_active=False)
+        # Another worker's cache never saw the revocation.
+        cache.clear()
+        with self.assertRaises(AuthenticationFailed):
+            self.authenticate(token)
@@ -13,22 +13,63 @@ from rest_framework_simplejwt.views import TokenObtainPairView
 from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
 
 from academic.models import Teacher, Subject, Parent
+from administration.access_log import LOGIN_USAGE, log_access
+from administration.cache import reference_cache
+from api.rows import query_flag, row_list_response
+from .authentication import ClaimsUser, load_user
 from .models import CustomUser as User, Accountant
+from .roles import user_claims
 from .serializers import (
     UserSerializer,
-    UserSerializerWithToken,
     AccountantSerializer,
     TeacherSerializer,
     ParentSerializer,
+    UserRowSerializer,
+    TeacherRowSerializer,
 )
 
 
 # Custom Token View
 class MyTokenObtainPairSerializer(TokenObtainPairSerializer):
+    """
+    Log in with the user's profile embedded in the tokens as claims.
+
+    The response is the same slim profile (names, role flags and role
+    profile ids); clients fetch the full one from ``users/me/`` when needed.
+    """
+
+    @classmethod
+    def get_token(cls, user):
+        token = super().get_token(user)
+        for claim, value in user_claims(user).items():
+            token[claim] = value
+        return token
+
     def validate(self, attrs):
         data = super().validate(attrs)
-        user_data = UserSerializerWithToken(self.user).data
-        data.update(user_data)
+        # Resolved while minting the tokens, so this is a cache hit.
+        claims = user_claims(self.user)
+        data.update(
+            {
+                "id": self.user.pk,
+                "email": claims["email"],
+                "username": claims["name"],
+                "first_name": claims["first_name"],
+                "middle_name": claims["middle_name"],
+                "last_name": claims["last_name"],
+                "isAdmin": claims["is_staff"],
+                "isAccountant": claims["is_accountant"],
+                "isTeacher": claims["is_teacher"],
+                "isParent": claims["is_parent"],
+                "teacher_id": claims["teacher_id"],
+                "accountant_id": claims["accountant_id"],
+                "parent_id": claims["parent_id"],
+                "groups": claims["groups"],
+                # Kept for clients that read the access token from ``token``.
+                "token": data["access"],
+            }
+        )
+        log_access(self.context["request"], LOGIN_USAGE, self.user)
         return data
 
 
@@ -36,6 +77,18 @@ class MyTokenObtainPairView(TokenObtainPairView):
     serializer_class = MyTokenObtainPairSerializer
 
 
+class CurrentUserView(APIView):
+    """The full profile of the logged-in user, with their role details."""
+
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, format=None):
+        user = request.user
+        if isinstance(user, ClaimsUser):
+            user = load_user(user.pk)
+        return Response(UserSerializer(user).data)
+
+
 class UserListView(APIView):
     """
     API View for handling single and listing users with pagination and flexible search.
@@ -46,6 +99,8 @@ class UserListView(APIView):
         page_size_query_param = "page_size"  # Allow clients to specify page size
         max_page_size = 100  # Maximum allowed page size
 
+    row_serializer = UserRowSerializer()
+
     def get(self, request, format=None):
         # Retrieve search query parameters
         first_name_query = request.query_params.get("first_name", "")
@@ -75,7 +130,11 @@ class UserListView(APIView):
         serializer = UserSerializer(paginated_users, many=True)
         return paginator.get_paginated_response(serializer.data)
         '''
-        
+
+        # ?compact=1 skips the nested profile details
+        if query_flag(request, "compact"):
+            return row_list_response(request, self.row_serializer, users)
+
         serializer = UserSerializer(users, many=True)
         return Response(serializer.data, status=status.HTTP_200_OK)
 
@@ -271,6 +330,8 @@ class TeacherListView(APIView):
         page_size_query_param = "page_size"  # Allow clients to specify page size
         max_page_size = 100  # Maximum allowed page size
 
+    row_serializer = TeacherRowSerializer()
+
     def get(self, request, format=None):
         first_name_query = request.query_params.get("first_name", "")
         last_name_query = request.query_params.get("last_name", "")
@@ -288,6 +349,10 @@ class TeacherListView(APIView):
         if filters:
             teachers = teachers.filter(filters)
 
+        # ?compact=1 skips the nested payments
+        if query_flag(request, "compact"):
+            return row_list_response(request, self.row_serializer, teachers)
+
         serializer = TeacherSerializer(teachers, many=True)
         return Response(serializer.data, status=status.HTTP_200_OK)
 
@@ -411,13 +476,14 @@ class BulkUploadTeachersView(APIView):
                         else []
                     )
                     for subject_name in subject_names:
-                        try:
-                            subject = Subject.objects.get(name=subject_name.strip())
-                            subjects.append(subject)
-                        except Subject.DoesNotExist:
+                        subject = reference_cache.get_by_name(
+                            Subject, subject_name.strip()
+                        )
+                        if subject is None:
                             raise ValueError(
                                 f"Subject '{subject_name.strip()}' does not exist."
                             )
+                        subjects.append(subject)
 
                     # Create Teacher object
                     teacher = Teacher(